@@ -1,5 +1,11 @@
 from .core import AnalysisEngine, AnalysisType
-from .parser import ASTParser, find_nodes_by_type, find_nodes_by_text
+from .parser import (
+    ASTParser,
+    iter_nodes_by_type,
+    find_nodes_by_type,
+    find_nodes_by_text,
+    find_nodes_by_text_batch,
+)
 from .rules import (
     Rule,
     PatternRule,
@@ -9,14 +15,16 @@ from .rules import (
     RuleCategory,
     create_default_rules,
 )
-from .aggregator import ResultAggregator, ResultType, ResultPriority
+from .aggregator import Result, ResultAggregator, ResultType, ResultPriority
 
 __all__ = [
     "AnalysisEngine",
     "AnalysisType",
     "ASTParser",
+    "iter_nodes_by_type",
     "find_nodes_by_type",
     "find_nodes_by_text",
+    "find_nodes_by_text_batch",
     "Rule",
     "PatternRule",
     "FunctionRule",
@@ -24,6 +32,7 @@ __all__ = [
     "RuleSeverity",
     "RuleCategory",
     "create_default_rules",
+    "Result",
     "ResultAggregator",
     "ResultType",
     "ResultPriority",
@@ -1,13 +1,124 @@
+import heapq
+import io
+import itertools
 import logging
+import sys
 import time
+from collections.abc import MutableMapping
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Any, Optional, Union
+from typing import IO, Dict, FrozenSet, Iterable, List, Any, Optional, Tuple, Union
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+
+    _STREAM_DECODE_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _STREAM_DECODE_ERRORS = (json.JSONDecodeError,)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
 logger = logging.getLogger(__name__)
 
 
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson if available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize an object to a compact JSON string, using orjson if available."""
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, default=_encode_default, option=options).decode("utf-8")
+    return json.dumps(obj, default=_encode_default)
+
+
+def _encode_default(obj: Any) -> Any:
+    """Serialize values the JSON/MessagePack encoders do not handle natively."""
+    if isinstance(obj, LazyDataDict):
+        return obj._load()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _lazy_data(raw: bytes) -> Any:
+    """Wrap a raw JSON data payload for decoding on first access.
+
+    Only JSON objects are deferred; any other payload (null, a list, a
+    scalar) is decoded right away, so it keeps its own type after import.
+    """
+    if raw[:1] == b"{" or raw.lstrip()[:1] == b"{":
+        return LazyDataDict(raw)
+    return _loads(raw)
+
+
+class LazyDataDict(MutableMapping):
+    """Result data that is decoded from raw JSON on first access.
+
+    Imported results keep their ``data`` payload as raw bytes until something
+    reads or modifies it, so importing a large export does not pay to decode
+    payloads that are never looked at.
+    """
+
+    __slots__ = ("_raw", "_data")
+
+    def __init__(self, raw: bytes):
+        self._raw: Optional[bytes] = raw
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = _loads(self._raw)
+            self._raw = None
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"LazyDataDict(<{len(self._raw)} raw bytes>)"
+        return f"LazyDataDict({self._data!r})"
+
+
 class ResultType(Enum):
     """Types of results that can be aggregated."""
 
@@ -29,6 +140,105 @@ class ResultPriority(Enum):
     INFO = "info"
 
 
+# Sort rank of each priority, most urgent first
+_PRIORITY_RANK = {priority.value: rank for rank, priority in enumerate(ResultPriority)}
+
+
+@dataclass(slots=True)
+class Result:
+    """A single aggregated result."""
+
+    id: str
+    type: str
+    source: str
+    data: MutableMapping[str, Any]
+    file_path: Optional[str]
+    priority: str
+    tags: FrozenSet[str]
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a plain dictionary for serialization.
+
+        Returns:
+            Dictionary with one key per field
+        """
+        return {
+            "id": self.id,
+            "type": self.type,
+            "source": self.source,
+            "data": self.data,
+            "file_path": self.file_path,
+            "priority": self.priority,
+            "tags": sorted(self.tags),
+            "timestamp": self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "Result":
+        """Create a result from a dictionary produced by to_dict.
+
+        The type, source, priority and tag strings are interned so imported
+        results share string objects with results added locally.
+
+        Args:
+            entry: Result dictionary
+
+        Returns:
+            Result instance
+        """
+        return cls(
+            id=entry["id"],
+            type=sys.intern(entry["type"]),
+            source=sys.intern(entry["source"]),
+            data=entry["data"] if entry.get("data") is not None else {},
+            file_path=entry.get("file_path"),
+            priority=sys.intern(entry.get("priority") or ResultPriority.MEDIUM.value),
+            tags=frozenset(sys.intern(tag) for tag in entry.get("tags") or ()),
+            timestamp=entry.get("timestamp", 0.0),
+        )
+
+
+def _priority_key(result: Result) -> Tuple[int, float, int, str]:
+    """Sort key ordering results by priority, then oldest first.
+
+    Results sharing a timestamp, such as the results of one bulk add, are
+    ordered by their numeric ID, which follows insertion order; IDs that are
+    not numbers sort after them.
+    """
+    result_id = result.id
+    return (
+        _PRIORITY_RANK.get(result.priority, len(_PRIORITY_RANK)),
+        result.timestamp,
+        int(result_id) if result_id.isdigit() else sys.maxsize,
+        result_id,
+    )
+
+
+if msgspec is not None:
+
+    class _ImportedResult(msgspec.Struct):
+        """Result record as decoded by import_results, with data left raw."""
+
+        id: str
+        type: str
+        source: str
+        data: msgspec.Raw = msgspec.Raw(b"{}")
+        file_path: Optional[str] = None
+        priority: str = ResultPriority.MEDIUM.value
+        tags: List[str] = []
+        timestamp: float = 0.0
+
+    class _ImportedDocument(msgspec.Struct):
+        """Top-level export document; the summary is recomputed, not read."""
+
+        results: List[_ImportedResult] = []
+
+    _DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
+else:
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+
 class ResultAggregator:
     """Aggregates and manages results from various analysis sources.
 
@@ -43,11 +253,24 @@ class ResultAggregator:
             workspace_path: Path to the workspace directory
         """
         self.workspace_path = Path(workspace_path)
-        self.results: Dict[str, Dict[str, Any]] = {}
-        self.result_index: Dict[str, List[str]] = {}
+        self.results: Dict[str, Result] = {}
+        # Per-type shards (result ID -> result, in insertion order)
+        self.result_index: Dict[str, Dict[str, Result]] = {}
         self.result_count = 0
+        self._id_counter = itertools.count()
         self.last_updated = time.time()
 
+        # Secondary indexes mapping a field value to the results carrying it
+        # (result ID -> result, in insertion order) for O(1) filter lookups
+        self._by_source: Dict[str, Dict[str, Result]] = {}
+        self._by_file: Dict[str, Dict[str, Result]] = {}
+        self._by_priority: Dict[str, Dict[str, Result]] = {}
+        self._by_tag: Dict[str, Dict[str, Result]] = {}
+
+        # Results ordered by priority for top-k queries, when sortedcontainers
+        # is available; otherwise top_k_by_priority falls back to a heap scan
+        self._priority_order = SortedList() if SortedList is not None else None
+
     def add_result(
         self,
         result_type: Union[ResultType, str],
@@ -67,6 +290,60 @@ class ResultAggregator:
             priority: Priority of the result
             tags: Tags for categorizing the result
 
+        Returns:
+            Result ID
+
+        Raises:
+            ValueError: If priority is not a ResultPriority value
+        """
+        now = time.time()
+        result_id = self._store_result(
+            result_type, source, data, file_path, priority, tags, timestamp=now
+        )
+        self.last_updated = now
+
+        return result_id
+
+    def add_results_bulk(self, specs: Iterable[Tuple[Any, ...]]) -> List[str]:
+        """Add many results at once, reading the clock a single time.
+
+        All results in the batch share the same timestamp.
+
+        Args:
+            specs: Tuples of add_result arguments, in positional order:
+                (result_type, source, data[, file_path[, priority[, tags]]])
+
+        Returns:
+            List of result IDs, in input order
+        """
+        now = time.time()
+        result_ids = [self._store_result(*spec, timestamp=now) for spec in specs]
+        self.last_updated = now
+
+        return result_ids
+
+    def _store_result(
+        self,
+        result_type: Union[ResultType, str],
+        source: str,
+        data: Dict[str, Any],
+        file_path: Optional[Union[str, Path]] = None,
+        priority: Optional[Union[ResultPriority, str]] = None,
+        tags: Optional[List[str]] = None,
+        *,
+        timestamp: float,
+    ) -> str:
+        """Create, store and index a result entry.
+
+        Args:
+            result_type: Type of the result
+            source: Source of the result
+            data: Result data
+            file_path: Path to the file associated with the result
+            priority: Priority of the result
+            tags: Tags for categorizing the result
+            timestamp: Timestamp to record on the result
+
         Returns:
             Result ID
         """
@@ -78,48 +355,90 @@ class ResultAggregator:
             priority = priority.value
         elif priority is None:
             priority = ResultPriority.MEDIUM.value
+        elif priority not in _PRIORITY_RANK:
+            raise ValueError(f"Invalid result priority: {priority}")
+
+        # Intern the small-vocabulary fields so every result shares one string
+        # object per value, which also makes index and filter compares cheaper
+        result_type = sys.intern(result_type)
+        source = sys.intern(source)
+        priority = sys.intern(priority)
+        tags = frozenset(sys.intern(tag) for tag in tags) if tags else frozenset()
 
-        # Generate a unique result ID
-        result_id = f"{result_type}_{source}_{self.result_count}"
-        self.result_count += 1
+        # Generate a unique result ID; type and source live on the record only
+        sequence = next(self._id_counter)
+        result_id = str(sequence)
+        self.result_count = sequence + 1
 
         # Create the result entry
-        result = {
-            "id": result_id,
-            "type": result_type,
-            "source": source,
-            "data": data,
-            "file_path": str(file_path) if file_path else None,
-            "priority": priority,
-            "tags": tags or [],
-            "timestamp": time.time(),
-        }
+        result = Result(
+            id=result_id,
+            type=result_type,
+            source=source,
+            data=data,
+            file_path=str(file_path) if file_path else None,
+            priority=priority,
+            tags=tags,
+            timestamp=timestamp,
+        )
 
         # Store the result
         self.results[result_id] = result
 
         # Update indexes for faster lookup
-        if result_type not in self.result_index:
-            self.result_index[result_type] = []
-        self.result_index[result_type].append(result_id)
+        shard = self.result_index.get(result_type)
+        if shard is None:
+            shard = self.result_index[result_type] = {}
+        shard[result_id] = result
+        self._index_result(result)
 
-        self.last_updated = time.time()
         logger.debug(f"Added result {result_id} of type {result_type} from {source}")
 
         return result_id
 
-    def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
+    def _index_result(self, result: Result) -> None:
+        """Add a result to the secondary indexes.
+
+        Args:
+            result: The stored result
+        """
+        result_id = result.id
+        self._by_source.setdefault(result.source, {})[result_id] = result
+        if result.file_path is not None:
+            self._by_file.setdefault(result.file_path, {})[result_id] = result
+        self._by_priority.setdefault(result.priority, {})[result_id] = result
+        for tag in result.tags:
+            self._by_tag.setdefault(tag, {})[result_id] = result
+        if self._priority_order is not None:
+            self._priority_order.add(_priority_key(result))
+
+    def _unindex_result(self, result: Result) -> None:
+        """Remove a result from the secondary indexes.
+
+        Args:
+            result: The stored result
+        """
+        result_id = result.id
+        self._by_source.get(result.source, {}).pop(result_id, None)
+        self._by_file.get(result.file_path, {}).pop(result_id, None)
+        self._by_priority.get(result.priority, {}).pop(result_id, None)
+        for tag in result.tags:
+            self._by_tag.get(tag, {}).pop(result_id, None)
+        if self._priority_order is not None:
+            self._priority_order.discard(_priority_key(result))
+
+    def get_result(self, result_id: str) -> Optional[Result]:
         """Get a specific result by ID.
 
         Args:
             result_id: ID of the result to retrieve
 
         Returns:
-            Result data or None if not found
+            The result or None if not found
         """
         return self.results.get(result_id)
 
-    def get_results_by_type(self, result_type: Union[ResultType, str]) -> List[Dict[str, Any]]:
+    def get_results_by_type(self, result_type: Union[ResultType, str]) -> List[Result]:
         """Get all results of a specific type.
 
         Args:
@@ -131,10 +450,9 @@ class ResultAggregator:
         if isinstance(result_type, ResultType):
             result_type = result_type.value
 
-        result_ids = self.result_index.get(result_type, [])
-        return [self.results[result_id] for result_id in result_ids]
+        return list(self.result_index.get(result_type, {}).values())
 
-    def get_results_by_file(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    def get_results_by_file(self, file_path: Union[str, Path]) -> List[Result]:
         """Get all results for a specific file.
 
         Args:
@@ -144,9 +462,9 @@ class ResultAggregator:
             List of results
         """
         file_path_str = str(file_path)
-        return [result for result in self.results.values() if result["file_path"] == file_path_str]
+        return list(self._by_file.get(file_path_str, {}).values())
 
-    def get_results_by_priority(self, priority: Union[ResultPriority, str]) -> List[Dict[str, Any]]:
+    def get_results_by_priority(self, priority: Union[ResultPriority, str]) -> List[Result]:
         """Get all results with a specific priority.
 
         Args:
@@ -158,9 +476,9 @@ class ResultAggregator:
         if isinstance(priority, ResultPriority):
             priority = priority.value
 
-        return [result for result in self.results.values() if result["priority"] == priority]
+        return list(self._by_priority.get(priority, {}).values())
 
-    def get_results_by_source(self, source: str) -> List[Dict[str, Any]]:
+    def get_results_by_source(self, source: str) -> List[Result]:
         """Get all results from a specific source.
 
         Args:
@@ -169,9 +487,9 @@ class ResultAggregator:
         Returns:
             List of results
         """
-        return [result for result in self.results.values() if result["source"] == source]
+        return list(self._by_source.get(source, {}).values())
 
-    def get_results_by_tags(self, tags: List[str], match_all: bool = False) -> List[Dict[str, Any]]:
+    def get_results_by_tags(self, tags: List[str], match_all: bool = False) -> List[Result]:
         """Get all results with specific tags.
 
         Args:
@@ -181,18 +499,41 @@ class ResultAggregator:
         Returns:
             List of results
         """
+        if not tags:
+            return list(self.results.values()) if match_all else []
+
         if match_all:
+            # Intersect the tag buckets, driven by the smallest one
+            buckets = sorted((self._by_tag.get(tag, {}) for tag in dict.fromkeys(tags)), key=len)
+            smallest, rest = buckets[0], buckets[1:]
             return [
                 result
-                for result in self.results.values()
-                if all(tag in result["tags"] for tag in tags)
+                for result_id, result in smallest.items()
+                if all(result_id in bucket for bucket in rest)
             ]
         else:
-            return [
-                result
-                for result in self.results.values()
-                if any(tag in result["tags"] for tag in tags)
-            ]
+            matches: Dict[str, Result] = {}
+            for tag in tags:
+                matches.update(self._by_tag.get(tag, {}))
+            return list(matches.values())
+
+    def top_k_by_priority(self, k: int) -> List[Result]:
+        """Get the k most urgent results, critical first.
+
+        Results with the same priority are returned oldest first.
+
+        Args:
+            k: Maximum number of results to return
+
+        Returns:
+            List of up to k results
+        """
+        if k <= 0:
+            return []
+
+        if self._priority_order is not None:
+            return [self.results[key[-1]] for key in self._priority_order.islice(0, k)]
+        return heapq.nsmallest(k, self.results.values(), key=_priority_key)
 
     def update_result(self, result_id: str, data: Dict[str, Any]) -> bool:
         """Update an existing result.
@@ -209,10 +550,18 @@ class ResultAggregator:
             return False
 
         # Update the result data
-        self.results[result_id]["data"].update(data)
-        self.results[result_id]["timestamp"] = time.time()
+        result = self.results[result_id]
+        result.data.update(data)
+        now = time.time()
+        if self._priority_order is not None:
+            # The timestamp is part of the priority sort key
+            self._priority_order.discard(_priority_key(result))
+            result.timestamp = now
+            self._priority_order.add(_priority_key(result))
+        else:
+            result.timestamp = now
 
-        self.last_updated = time.time()
+        self.last_updated = now
         logger.debug(f"Updated result {result_id}")
 
         return True
@@ -230,15 +579,10 @@ class ResultAggregator:
             logger.warning(f"Cannot remove non-existent result: {result_id}")
             return False
 
-        # Get the result type for index cleanup
-        result_type = self.results[result_id]["type"]
-
-        # Remove from index
-        if result_type in self.result_index and result_id in self.result_index[result_type]:
-            self.result_index[result_type].remove(result_id)
-
-        # Remove the result
-        del self.results[result_id]
+        # Remove the result and drop it from its type shard and the indexes
+        result = self.results.pop(result_id)
+        self.result_index.get(result.type, {}).pop(result_id, None)
+        self._unindex_result(result)
 
         self.last_updated = time.time()
         logger.debug(f"Removed result {result_id}")
@@ -256,9 +600,17 @@ class ResultAggregator:
         """
         if result_type is None:
             # Clear all results
+            # Clear in place so the containers (and any outside references to
+            # results/result_index) are reused rather than reallocated
             count = len(self.results)
-            self.results = {}
-            self.result_index = {}
+            self.results.clear()
+            self.result_index.clear()
+            self._by_source.clear()
+            self._by_file.clear()
+            self._by_priority.clear()
+            self._by_tag.clear()
+            if self._priority_order is not None:
+                self._priority_order.clear()
             self.last_updated = time.time()
             logger.info(f"Cleared all {count} results")
             return count
@@ -267,17 +619,17 @@ class ResultAggregator:
         if isinstance(result_type, ResultType):
             result_type = result_type.value
 
-        # Get result IDs of the specified type
-        result_ids = self.result_index.get(result_type, [])
-        count = len(result_ids)
+        # Get the shard holding results of the specified type
+        shard = self.result_index.setdefault(result_type, {})
+        count = len(shard)
 
         # Remove each result
-        for result_id in result_ids:
-            if result_id in self.results:
-                del self.results[result_id]
+        for result_id, result in shard.items():
+            del self.results[result_id]
+            self._unindex_result(result)
 
-        # Clear the index for this type
-        self.result_index[result_type] = []
+        # Clear the shard for this type
+        shard.clear()
 
         self.last_updated = time.time()
         logger.info(f"Cleared {count} results of type {result_type}")
@@ -292,15 +644,14 @@ class ResultAggregator:
         """
         # Count results by type
         type_counts = {}
-        for result_type, result_ids in self.result_index.items():
-            type_counts[result_type] = len(result_ids)
+        for result_type, shard in self.result_index.items():
+            type_counts[result_type] = len(shard)
 
-        # Count results by priority
-        priority_counts = {priority.value: 0 for priority in ResultPriority}
-        for result in self.results.values():
-            priority = result["priority"]
-            if priority in priority_counts:
-                priority_counts[priority] += 1
+        # Count results by priority from the priority index
+        priority_counts = {
+            priority.value: len(self._by_priority.get(priority.value, {}))
+            for priority in ResultPriority
+        }
 
         return {
             "total_results": len(self.results),
@@ -309,62 +660,230 @@ class ResultAggregator:
             "last_updated": self.last_updated,
         }
 
-    def export_results(self, format_type: str = "json") -> str:
+    def export_results(self, format_type: str = "json") -> Union[str, bytes]:
         """Export results in the specified format.
 
         Args:
-            format_type: Format to export (currently only 'json' is supported)
+            format_type: Format to export: 'json', 'msgpack' (requires msgpack)
+                or 'arrow' (Arrow IPC stream, requires pyarrow)
 
         Returns:
-            Exported results as a string
+            Exported results as a string for JSON, or bytes for the binary
+            formats; an empty string if the format is unsupported
         """
-        if format_type.lower() == "json":
-            return json.dumps(
-                {"results": list(self.results.values()), "summary": self.get_summary()}, indent=2
+        format_type = format_type.lower()
+        if format_type == "json":
+            buffer = io.StringIO()
+            self.export_results_stream(buffer)
+            return buffer.getvalue()
+        elif format_type == "msgpack" and msgpack is not None:
+            return msgpack.packb(
+                {
+                    "results": [result.to_dict() for result in self.results.values()],
+                    "summary": self.get_summary(),
+                },
+                use_bin_type=True,
+                default=_encode_default,
             )
+        elif format_type == "arrow" and pa is not None:
+            return self._export_arrow()
         else:
             logger.warning(f"Unsupported export format: {format_type}")
             return ""
 
-    def import_results(self, data: str, format_type: str = "json") -> int:
+    def _export_arrow(self) -> bytes:
+        """Export results as an Arrow IPC stream.
+
+        Each result field becomes a typed column; the low-cardinality type,
+        source and priority columns are dictionary-encoded, and the data
+        payloads are stored as JSON strings.
+
+        Returns:
+            The serialized Arrow stream
+        """
+        results = list(self.results.values())
+        table = pa.table(
+            {
+                "id": pa.array([result.id for result in results], pa.string()),
+                "type": pa.array(
+                    [result.type for result in results], pa.string()
+                ).dictionary_encode(),
+                "source": pa.array(
+                    [result.source for result in results], pa.string()
+                ).dictionary_encode(),
+                "data": pa.array([_dumps(result.data) for result in results], pa.string()),
+                "file_path": pa.array([result.file_path for result in results], pa.string()),
+                "priority": pa.array(
+                    [result.priority for result in results], pa.string()
+                ).dictionary_encode(),
+                "tags": pa.array(
+                    [sorted(result.tags) for result in results], pa.list_(pa.string())
+                ),
+                "timestamp": pa.array([result.timestamp for result in results], pa.float64()),
+            }
+        )
+        table = table.replace_schema_metadata({"summary": _dumps(self.get_summary())})
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def export_results_stream(self, fp: IO[str]) -> int:
+        """Export results as JSON to a file-like object, one record at a time.
+
+        Only a single record is serialized in memory at once, so this is the
+        preferred export path for large aggregators (more than ~10k results).
+
+        Args:
+            fp: Text file-like object to write to
+
+        Returns:
+            Number of results written
+        """
+        fp.write('{"results": [')
+        count = 0
+        for result in self.results.values():
+            if count:
+                fp.write(", ")
+            fp.write(_dumps(result.to_dict()))
+            count += 1
+        fp.write('], "summary": ')
+        fp.write(_dumps(self.get_summary()))
+        fp.write("}")
+        return count
+
+    def import_results(self, data: Union[str, bytes], format_type: str = "json") -> int:
         """Import results from the specified format.
 
         Args:
             data: Data to import
-            format_type: Format of the data (currently only 'json' is supported)
+            format_type: Format of the data: 'json', 'msgpack' or 'arrow'
 
         Returns:
             Number of results imported
         """
-        if format_type.lower() == "json":
+        format_type = format_type.lower()
+        if format_type == "msgpack" and msgpack is not None:
             try:
-                imported_data = json.loads(data)
-                imported_results = imported_data.get("results", [])
-
-                # Clear existing results first
-                self.clear_results()
+                document = msgpack.unpackb(data, raw=False)
+            except (ValueError, TypeError, msgpack.UnpackException) as e:
+                logger.error(f"Failed to parse MessagePack data: {e}")
+                return 0
+            return self._load_results(document.get("results", []))
+        elif format_type == "arrow" and pa is not None:
+            try:
+                table = pa.ipc.open_stream(data).read_all()
+            except (pa.ArrowException, TypeError) as e:
+                logger.error(f"Failed to read Arrow data: {e}")
+                return 0
+            imported_results = table.to_pylist()
+            for entry in imported_results:
+                # Payloads were stored as JSON text; decode them on first access
+                entry["data"] = _lazy_data(entry["data"].encode("utf-8"))
+            return self._load_results(imported_results)
+        elif format_type == "json":
+            try:
+                if msgspec is not None:
+                    # Decode the record envelopes only; data payloads stay raw
+                    document = msgspec.json.decode(data, type=_ImportedDocument)
+                    imported_results = [
+                        {
+                            "id": record.id,
+                            "type": record.type,
+                            "source": record.source,
+                            "data": _lazy_data(bytes(record.data)),
+                            "file_path": record.file_path,
+                            "priority": record.priority,
+                            "tags": record.tags,
+                            "timestamp": record.timestamp,
+                        }
+                        for record in document.results
+                    ]
+                else:
+                    imported_results = _loads(data).get("results", [])
+            except _DECODE_ERRORS as e:
+                logger.error(f"Failed to parse JSON data: {e}")
+                return 0
 
-                # Import each result
-                for result in imported_results:
-                    result_id = result["id"]
-                    self.results[result_id] = result
+            return self._load_results(imported_results)
+        else:
+            logger.warning(f"Unsupported import format: {format_type}")
+            return 0
 
-                    # Update index
-                    result_type = result["type"]
-                    if result_type not in self.result_index:
-                        self.result_index[result_type] = []
-                    self.result_index[result_type].append(result_id)
+    def import_results_stream(self, fp: IO) -> int:
+        """Import JSON results from a file-like object.
 
-                # Update counter to avoid ID conflicts
-                self.result_count = len(self.results)
-                self.last_updated = time.time()
+        When ijson is installed, records are parsed incrementally so the full
+        document is never held in memory; otherwise the file is loaded whole.
+        Existing results are cleared before the first record is read, so a
+        malformed document may leave a partial import behind.
 
-                logger.info(f"Imported {len(imported_results)} results")
-                return len(imported_results)
+        Args:
+            fp: Binary file-like object holding a document written by
+                export_results_stream
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON data: {e}")
-                return 0
-        else:
-            logger.warning(f"Unsupported import format: {format_type}")
+        Returns:
+            Number of results imported
+        """
+        try:
+            if ijson is not None:
+                return self._load_results(ijson.items(fp, "results.item", use_float=True))
+            return self._load_results(json.load(fp).get("results", []))
+        except _STREAM_DECODE_ERRORS as e:
+            logger.error(f"Failed to parse JSON data: {e}")
             return 0
+
+    def _load_results(self, imported_results: Iterable[Dict[str, Any]]) -> int:
+        """Replace the current results with already-decoded result records.
+
+        Args:
+            imported_results: Iterable of result dictionaries
+
+        Returns:
+            Number of results imported
+        """
+        # Clear existing results first
+        self.clear_results()
+
+        # Decode all records, then build the store and every index in a single
+        # pass instead of growing them one add at a time. A record reusing an
+        # earlier record's ID replaces it, so every index holds the same results.
+        results: Dict[str, Result] = {}
+        for entry in imported_results:
+            result = Result.from_dict(entry)
+            if result.priority not in _PRIORITY_RANK:
+                logger.warning(
+                    f"Skipping imported result {result.id} with invalid priority: "
+                    f"{result.priority}"
+                )
+                continue
+            results[result.id] = result
+        count = len(results)
+        self.results.update(results)
+
+        # Fill the (cleared) containers in place so outside references stay valid
+        by_type = self.result_index
+        by_source = self._by_source
+        by_file = self._by_file
+        by_priority = self._by_priority
+        by_tag = self._by_tag
+        for result_id, result in results.items():
+            by_type.setdefault(result.type, {})[result_id] = result
+            by_source.setdefault(result.source, {})[result_id] = result
+            if result.file_path is not None:
+                by_file.setdefault(result.file_path, {})[result_id] = result
+            by_priority.setdefault(result.priority, {})[result_id] = result
+            for tag in result.tags:
+                by_tag.setdefault(tag, {})[result_id] = result
+        if self._priority_order is not None:
+            self._priority_order.update(map(_priority_key, results.values()))
+
+        # Continue numbering after the highest imported ID to avoid conflicts
+        next_sequence = max((int(rid) for rid in self.results if rid.isdigit()), default=-1) + 1
+        self.result_count = max(next_sequence, len(self.results))
+        self._id_counter = itertools.count(self.result_count)
+        self.last_updated = time.time()
+
+        logger.info(f"Imported {count} results")
+        return count
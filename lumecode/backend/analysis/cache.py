@@ -0,0 +1,367 @@
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+import hashlib
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class FileHashCache:
+    """
+    Persistent cache of parse results, rule issues and analysis results keyed by file content.
+
+    Each entry is stored in its own JSON file named after the BLAKE2b hash of
+    the file content, so only the entries of the files being analyzed are
+    read. Rule issues and analysis results are kept apart from the (much
+    larger) parse results, so reusing them does not load the AST. A stat
+    index maps file paths to (mtime_ns, size, hash) and lets unchanged files
+    skip hashing altogether.
+
+    Reading an entry marks it as recently used; when a maximum size is set,
+    save() evicts the least recently used entries beyond it. The stat index
+    drops files that were deleted and content whose entries were evicted.
+
+    Attributes:
+        cache_dir: Directory where cache entries are stored
+        version: Parser/engine version; entries written by another version are ignored
+        max_size: Maximum total size of the entries in bytes, or None for no bound
+        hits: Number of cache hits
+        misses: Number of cache misses
+    """
+
+    # Kinds of entries, each stored in its own subdirectory
+    KINDS = ("ast", "issues", "results")
+
+    def __init__(self, cache_dir: str, version: str, max_size: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored
+            version: Parser/engine version the cached results belong to
+            max_size: Maximum total size of the entries in bytes, or None for no bound
+        """
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.max_size = max_size
+        self.index_file = self.cache_dir / "index.json"
+        self.hits = 0
+        self.misses = 0
+        # Whether entries were written since the last prune
+        self._entries_written = False
+        self._stat_index: Dict[str, List[Any]] = self._load_index()
+        self._index_dirty = False
+        # Stat index entries added since the last take_index_updates call
+        self._index_updates: Dict[str, List[Any]] = {}
+
+    def _load_index(self) -> Dict[str, List[Any]]:
+        """Load the stat index, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if index.get("version") != self.version:
+            return {}
+        return index.get("files", {})
+
+    def _entry_path(self, digest: str, kind: str = "ast") -> Path:
+        """Get the path of the entry file of a kind for a content hash"""
+        return self.cache_dir / kind / digest[:2] / f"{digest}.json"
+
+    def _read_entry(self, digest: str, kind: str = "ast") -> Optional[Dict[str, Any]]:
+        """Read the entry of a kind for a content hash, or None if there is no valid entry"""
+        entry_path = self._entry_path(digest, kind)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("version") != self.version:
+            return None
+        if self.max_size is not None:
+            # Mark the entry as recently used so prune keeps it
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+        return entry
+
+    def _write_entry(self, digest: str, entry: Dict[str, Any], kind: str = "ast") -> None:
+        """Atomically write the entry of a kind for a content hash"""
+        entry_path = self._entry_path(digest, kind)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+            self._entries_written = True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write cache entry {digest}: {e}")
+
+    def file_digest(self, file_path: str) -> str:
+        """
+        Get the content hash of a file.
+
+        The file is only read and hashed if its mtime or size changed since it
+        was last hashed.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex digest of the file content
+        """
+        return self.scan_file(file_path)[0]
+
+    def scan_file(
+        self, file_path: str, pattern: Optional[Pattern[bytes]] = None
+    ) -> Tuple[str, Optional[bool]]:
+        """
+        Get the content hash of a file, and whether its content matches a pattern.
+
+        Like file_digest, the file is only read if its mtime or size changed
+        since it was last hashed. When it is read, the pattern is searched in
+        the same buffer that is hashed, so screening costs no extra read.
+
+        Args:
+            file_path: Path to the file
+            pattern: Compiled bytes pattern to search the content for, if any
+
+        Returns:
+            Tuple of the hex digest of the file content, and whether the content
+            matches the pattern (None if the file was not read or there is no pattern)
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        cached = self._stat_index.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], None
+
+        # Hash a memory map of the file rather than a copy of its content
+        matched = None
+        with open(file_path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                    if pattern is not None:
+                        matched = pattern.search(content) is not None
+            except ValueError:
+                # Empty files cannot be mapped
+                content = f.read()
+                digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                if pattern is not None:
+                    matched = pattern.search(content) is not None
+
+        entry = [stat.st_mtime_ns, stat.st_size, digest]
+        self._stat_index[file_path] = entry
+        self._index_updates[file_path] = entry
+        self._index_dirty = True
+        return digest, matched
+
+    def take_index_updates(self) -> Dict[str, List[Any]]:
+        """
+        Get the stat index entries added since the last call.
+
+        Pool workers hash files with their own cache instance; their new
+        entries are handed to the parent with merge_index, which saves the
+        index once instead of every worker writing it.
+
+        Returns:
+            New (mtime_ns, size, hash) entries by absolute file path
+        """
+        updates = self._index_updates
+        self._index_updates = {}
+        return updates
+
+    def merge_index(self, updates: Dict[str, List[Any]]) -> None:
+        """
+        Add stat index entries computed by another cache instance.
+
+        Args:
+            updates: Entries returned by take_index_updates
+        """
+        if updates:
+            self._stat_index.update(updates)
+            self._index_dirty = True
+
+    def get_ast(self, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached parse result for a content hash.
+
+        Args:
+            digest: Content hash of the file
+
+        Returns:
+            The cached parse result, or None on a miss
+        """
+        entry = self._read_entry(digest)
+        if entry is None or "ast_result" not in entry:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["ast_result"]
+
+    def set_ast(self, digest: str, ast_result: Dict[str, Any]) -> None:
+        """
+        Cache the parse result for a content hash.
+
+        Args:
+            digest: Content hash of the file
+            ast_result: Parse result to cache
+        """
+        self._write_entry(digest, {"version": self.version, "ast_result": ast_result})
+
+    def get_issues(self, digest: str, rules_version: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached rule issues for a content hash and rule set.
+
+        Args:
+            digest: Content hash of the file
+            rules_version: Version of the rule set that produced the issues
+
+        Returns:
+            The cached issues, or None on a miss
+        """
+        entry = self._read_entry(digest, "issues")
+        if entry is None:
+            return None
+        return entry.get("issues", {}).get(rules_version)
+
+    def set_issues(self, digest: str, rules_version: str, issues: List[Dict[str, Any]]) -> None:
+        """
+        Cache the rule issues for a content hash and rule set.
+
+        Args:
+            digest: Content hash of the file
+            rules_version: Version of the rule set that produced the issues
+            issues: Issues to cache
+        """
+        entry = self._read_entry(digest, "issues") or {"version": self.version, "issues": {}}
+        entry.setdefault("issues", {})[rules_version] = issues
+        self._write_entry(digest, entry, "issues")
+
+    def get_results(self, digest: str, key: str) -> Optional[Any]:
+        """
+        Get the cached analysis results for a content hash.
+
+        Args:
+            digest: Content hash of the file
+            key: Key of the analysis, including the versions its results depend on
+
+        Returns:
+            The cached results, or None on a miss
+        """
+        entry = self._read_entry(digest, "results")
+        if entry is None:
+            return None
+        return entry.get("results", {}).get(key)
+
+    def set_results(self, digest: str, key: str, results: Any) -> None:
+        """
+        Cache the analysis results for a content hash.
+
+        Args:
+            digest: Content hash of the file
+            key: Key of the analysis, including the versions its results depend on
+            results: Results to cache
+        """
+        entry = self._read_entry(digest, "results") or {"version": self.version, "results": {}}
+        entry.setdefault("results", {})[key] = results
+        self._write_entry(digest, entry, "results")
+
+    def prune(self, max_size: int) -> int:
+        """
+        Evict the least recently used entries until the entries fit in a size.
+
+        Stat index entries whose content no longer has any cached entry are
+        dropped along with them.
+
+        Args:
+            max_size: Maximum total size of the entries in bytes
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        total = 0
+        for kind in self.KINDS:
+            for entry_path in (self.cache_dir / kind).glob("*/*.json"):
+                try:
+                    stat = entry_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+                total += stat.st_size
+
+        evicted = 0
+        if total > max_size:
+            entries.sort(key=lambda entry: entry[0])
+            evicted_digests = set()
+            kept_digests = set()
+            for _, size, entry_path in entries:
+                if total <= max_size:
+                    kept_digests.add(entry_path.stem)
+                    continue
+                try:
+                    entry_path.unlink()
+                except OSError:
+                    kept_digests.add(entry_path.stem)
+                    continue
+                total -= size
+                evicted += 1
+                evicted_digests.add(entry_path.stem)
+            logger.debug("Evicted %d cache entries from %s", evicted, self.cache_dir)
+
+            evicted_digests -= kept_digests
+            if evicted_digests:
+                self._drop_index_entries(
+                    path
+                    for path, cached in self._stat_index.items()
+                    if cached[2] in evicted_digests
+                )
+        return evicted
+
+    def _drop_index_entries(self, file_paths: Iterable[str]) -> None:
+        """Remove files from the stat index"""
+        for file_path in list(file_paths):
+            del self._stat_index[file_path]
+            self._index_updates.pop(file_path, None)
+            self._index_dirty = True
+
+    def save(self) -> None:
+        """
+        Persist the stat index if it changed, and evict entries beyond the maximum size.
+
+        Files that no longer exist are dropped from the index before it is written.
+        """
+        # Pool workers write entries with their own instances, and the stat index
+        # changes whenever they hash new content
+        if self.max_size is not None and (self._entries_written or self._index_dirty):
+            self.prune(self.max_size)
+            self._entries_written = False
+
+        if not self._index_dirty:
+            return
+
+        # The index is rewritten whole, so leave out the files that were deleted
+        # or renamed since they were hashed instead of carrying them forever
+        self._drop_index_entries(
+            file_path for file_path in self._stat_index if not os.path.exists(file_path)
+        )
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "files": self._stat_index}, f)
+            self._index_dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save cache index: {e}")
@@ -1,18 +1,879 @@
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Any, Optional, Tuple
+import asyncio
+import hashlib
 import os
 import logging
+import re
 import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from enum import Enum
-from pathlib import Path
+from functools import lru_cache, partial
+from itertools import accumulate
 
 # Import the AST parser and helper functions
-from .parser import ASTParser, find_nodes_by_type, find_nodes_by_text, find_nodes_by_property
+from .cache import FileHashCache
+from .parser import (
+    EXTENSION_LANGUAGES,
+    NODE_COUNT_TYPES,
+    SUPPORTED_LANGUAGES,
+    ASTParser,
+    _read_file,
+    iter_nodes_by_type,
+    find_nodes_by_text_batch,
+)
 from .rules import RuleEngine, create_default_rules, RuleSeverity, RuleCategory
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENGINE_VERSION = "0.1.0"
+
+# Version of cached parse and analysis results; bump the suffix when the parse result
+# format or the results of the AST checks change
+_AST_CACHE_VERSION = f"{ENGINE_VERSION}.6"
+
+# Default bound on the size of the AST cache in bytes
+_DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+
+def _default_cache_dir() -> str:
+    """
+    Get the default AST cache directory of the current user.
+
+    The cache lives under $XDG_CACHE_HOME, or ~/.cache when it is not set,
+    rather than in the working directory or the installation.
+
+    Returns:
+        Path of the default cache directory
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "lumecode", "ast")
+
+# Node types matched during analysis, as frozensets for O(1) membership tests
+_FUNC_TYPES = NODE_COUNT_TYPES["functions"]
+_CLASS_TYPES = NODE_COUNT_TYPES["classes"]
+_BRANCH_TYPES = NODE_COUNT_TYPES["branches"]
+_STRING_TYPES = frozenset({"string_literal", "template_string"})
+_LOOP_TYPES = frozenset({"for_statement", "while_statement"})
+_QUERY_LOOP_TYPES = _LOOP_TYPES | {"do_statement"}
+# Call expressions of the languages checked for database calls inside loops
+_CALL_TYPES = frozenset(
+    {
+        "call",
+        "call_expression",
+        "function_call_expression",
+        "member_call_expression",
+        "nullsafe_member_call_expression",
+        "scoped_call_expression",
+    }
+)
+
+# Keywords of the security and performance checks, each matched with one
+# case-insensitive regex scan instead of a substring test per keyword
+_SQL_KEYWORD_RE = re.compile(r"(?:select|insert|update|delete|drop) ", re.IGNORECASE)
+_DB_CALL_KEYWORD_RE = re.compile(r"query|find|get|fetch|select|execute|raw", re.IGNORECASE)
+
+# Keywords every loop the performance AST checks look at starts with. Files without
+# any of them cannot have performance hotspots, so their raw bytes are screened
+# with this regex before paying for a parse.
+_LOOP_KEYWORD_RE = re.compile(rb"\b(?:for|while|do)\b")
+
+# Default (row, column) position for nodes without one
+_NO_POSITION: Tuple[int, int] = (0, 0)
+
+# Rule severities mapped to the high/medium/low levels used for security
+# severity and performance impact; any other severity is "low"
+_SEVERITY_LEVELS = {"critical": "high", "error": "medium"}
+
+# Performance categories and the issue type keywords mapping to them, in priority order
+_PERFORMANCE_CATEGORY_KEYWORDS = (
+    ("database", ("db", "database", "query", "sql")),
+    ("algorithm", ("algo", "algorithm", "complexity")),
+    ("memory", ("memory", "gc", "garbage", "leak")),
+    ("concurrency", ("thread", "concurrency", "parallel", "async")),
+    ("io", ("io", "file", "disk")),
+    ("network", ("network", "http", "request", "response")),
+    ("rendering", ("render", "ui", "dom", "reflow")),
+)
+
+# Parse results shared within an analysis session: the parse result and content
+# hash (None without an AST cache) of each file path, see _parse_file_cached
+SessionCache = Dict[str, Tuple[Dict[str, Any], Optional[str]]]
+
+# Per-process parser and rule engine used by pool workers. Tree-sitter languages
+# and function rules cannot be pickled, so each worker rebuilds them once in
+# _init_worker instead of receiving them with every file.
+_worker_parser: Optional[ASTParser] = None
+_worker_rule_engine: Optional[RuleEngine] = None
+_worker_cache: Optional[FileHashCache] = None
+
+
+def _init_worker(languages_dir: Optional[str], cache_dir: Optional[str]) -> None:
+    """
+    Build the parser, rule engine and cache of a pool worker process.
+
+    Args:
+        languages_dir: Directory containing the tree-sitter language libraries
+        cache_dir: Directory of the AST cache, or None to disable caching
+    """
+    global _worker_parser, _worker_rule_engine, _worker_cache
+
+    try:
+        _worker_parser = ASTParser(languages_dir)
+    except Exception as e:
+        logger.error(f"Failed to initialize AST parser in worker: {e}")
+        _worker_parser = None
+
+    _worker_rule_engine = RuleEngine()
+    _worker_rule_engine.add_rules(create_default_rules())
+    _worker_cache = FileHashCache(cache_dir, _AST_CACHE_VERSION) if cache_dir else None
+
+
+@lru_cache(maxsize=1)
+def _default_rules_version() -> str:
+    """Get the version of the default rule set, which is the one pool workers evaluate"""
+    rule_engine = RuleEngine()
+    rule_engine.add_rules(create_default_rules())
+    return rule_engine.version
+
+
+def _parse_file_cached(
+    file_path: str,
+    ast_parser: ASTParser,
+    ast_cache: Optional[FileHashCache],
+    session_cache: Optional[SessionCache] = None,
+    content: Optional[bytes] = None,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Parse a file, reusing the cached result if neither its content nor the
+    library of its language has changed.
+
+    Args:
+        file_path: Path to the file to parse
+        ast_parser: Parser to use on a cache miss
+        ast_cache: Cache to consult, or None to always parse
+        session_cache: Parse results of the current analysis session, consulted
+            before the AST cache and filled with the result, if any
+        content: Content of the file, if the caller already read it
+
+    Returns:
+        Tuple of the parse result and the content hash (None if caching is disabled)
+    """
+    if session_cache is not None:
+        cached = session_cache.get(file_path)
+        if cached is None:
+            cached = session_cache[file_path] = _parse_file_cached(
+                file_path, ast_parser, ast_cache, content=content
+            )
+        return cached
+
+    if ast_cache is None:
+        return ast_parser.parse_file(file_path, content), None
+
+    digest = ast_cache.file_digest(file_path)
+    ast_result = ast_cache.get_ast(digest)
+    if ast_result is not None and ast_result.get("metadata", {}).get(
+        "grammar_version", ""
+    ) != ast_parser.grammar_version(ast_result.get("language")):
+        # The language library was rebuilt or upgraded since the file was parsed
+        ast_result = None
+
+    if ast_result is None:
+        ast_result = ast_parser.parse_file(file_path, content)
+        ast_cache.set_ast(digest, ast_result)
+    else:
+        # Identical content may have been cached under another path
+        file_path = os.path.abspath(file_path)
+        ast_result["file_path"] = file_path
+        ast_result.get("metadata", {})["file_path"] = file_path
+
+    return ast_result, digest
+
+
+def _evaluate_rules_cached(
+    rule_engine: RuleEngine,
+    root: Dict[str, Any],
+    context: Dict[str, Any],
+    ast_cache: Optional[FileHashCache],
+    digest: Optional[str],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate the rules against an AST, reusing cached issues for unchanged content.
+
+    Args:
+        rule_engine: Rule engine to evaluate
+        root: Root node of the AST
+        context: Rule evaluation context
+        ast_cache: Cache to consult, or None to always evaluate
+        digest: Content hash of the parsed file
+
+    Returns:
+        List of issues found
+    """
+    # Skip the AST walk entirely if no rules apply to the language
+    if not rule_engine.rules_for_language(context["language"]):
+        return []
+
+    if ast_cache is None or digest is None:
+        return rule_engine.evaluate(root, context)
+
+    rules_version = rule_engine.version
+    issues = ast_cache.get_issues(digest, rules_version)
+    if issues is None:
+        issues = rule_engine.evaluate(root, context)
+        ast_cache.set_issues(digest, rules_version, issues)
+    else:
+        for issue in issues:
+            issue["file"] = context.get("file_path", "unknown")
+
+    return issues
+
+
+def _analyze_file_batch(
+    analyze_fns: Tuple[Callable[..., Optional[Dict[str, Any]]], ...], file_paths: List[str]
+) -> Tuple[List[Tuple[Optional[Dict[str, Any]], ...]], Dict[str, List[Any]]]:
+    """
+    Run per-file analysis functions over a batch of files in a pool worker.
+
+    All the functions run on a file before moving on to the next file, so
+    they share a single parse of it.
+
+    Args:
+        analyze_fns: Module-level functions taking (file_path, ast_parser,
+            rule_engine, ast_cache, session_cache)
+        file_paths: Files to analyze
+
+    Returns:
+        Tuple of the results of each function (None where a file could not be
+        analyzed) for each file, in input order, and the stat index entries the
+        worker's cache added, for the parent to save
+    """
+    results = []
+    for file_path in file_paths:
+        session_cache = {} if len(analyze_fns) > 1 else None
+        results.append(
+            tuple(
+                analyze_fn(
+                    file_path, _worker_parser, _worker_rule_engine, _worker_cache, session_cache
+                )
+                for analyze_fn in analyze_fns
+            )
+        )
+
+    index_updates = _worker_cache.take_index_updates() if _worker_cache is not None else {}
+    return results, index_updates
+
+
+def _node_span(node: Dict[str, Any]) -> Tuple[int, int, int]:
+    """
+    Get the position of an AST node.
+
+    Args:
+        node: AST node
+
+    Returns:
+        Tuple of the start row, start column and end row, 0 where missing
+    """
+    start = node.get("start_pos") or _NO_POSITION
+    end = node.get("end_pos") or _NO_POSITION
+    return start[0], start[1], end[0]
+
+
+def _project_relpath(project_path: str) -> Callable[[str], str]:
+    """
+    Build a function that makes file paths relative to a project directory.
+
+    Paths found by walking the project start with the same prefix, so the
+    prefix is computed once and sliced off instead of calling os.path.relpath,
+    which resolves and splits both paths, for every file.
+
+    Args:
+        project_path: Path to the project directory
+
+    Returns:
+        Function mapping a file path to its path relative to the project
+    """
+    prefix = os.path.join(os.path.normpath(project_path), "")
+    prefix_len = len(prefix)
+
+    def relpath(file_path: str) -> str:
+        if file_path.startswith(prefix):
+            return file_path[prefix_len:]
+        return os.path.relpath(file_path, project_path)
+
+    return relpath
+
+
+def _inline_code_path(code: str, language: str) -> str:
+    """
+    Build a placeholder file path for a code snippet.
+
+    The path is derived from a BLAKE2b hash of the code, so it is the same
+    across interpreter runs, unlike the salted builtin hash().
+
+    Args:
+        code: Code snippet
+        language: Programming language of the code
+
+    Returns:
+        Placeholder path with the language's file extension
+    """
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=8).hexdigest()
+    extension = SUPPORTED_LANGUAGES.get(language, f".{language}")
+    return f"<inline_code>/{digest}{extension}"
+
+
+def _tally_issues(issues: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Count issues by rule severity and by rule category.
+
+    Args:
+        issues: Issues reported by the rule engine
+
+    Returns:
+        Tuple of the counts per severity and per category; every severity and
+        category is present, and values outside the enums are not counted
+    """
+    severities = Counter(issue.get("severity") for issue in issues)
+    categories = Counter(issue.get("category") for issue in issues)
+
+    severity_counts = {severity.value: severities[severity.value] for severity in RuleSeverity}
+    category_counts = {category.value: categories[category.value] for category in RuleCategory}
+    return severity_counts, category_counts
+
+
+def _collect_ast_counts(root: Dict[str, Any]) -> Tuple[int, int, int]:
+    """
+    Count the function, class and branch nodes of an AST in a single walk.
+
+    Args:
+        root: Root node of the AST
+
+    Returns:
+        Tuple of the number of function, class and branch nodes
+    """
+    functions = classes = branches = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node_type = node["type"]
+        if node_type in _FUNC_TYPES:
+            functions += 1
+        elif node_type in _CLASS_TYPES:
+            classes += 1
+        elif node_type in _BRANCH_TYPES:
+            branches += 1
+        stack.extend(node.get("children", ()))
+
+    return functions, classes, branches
+
+
+def _analyze_quality_file(
+    file_path: str,
+    ast_parser: Optional[ASTParser],
+    rule_engine: Optional[RuleEngine],
+    ast_cache: Optional[FileHashCache],
+    session_cache: Optional[SessionCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a file and collect its code quality metrics and rule issues.
+
+    Args:
+        file_path: Path to the file to analyze
+        ast_parser: Parser to use
+        rule_engine: Rule engine to evaluate, if any
+        ast_cache: AST cache to use, if any
+        session_cache: Parse results of the current analysis session, if any
+
+    Returns:
+        Dictionary of per-file metrics and issues, or None if the file could not be analyzed
+    """
+    if not ast_parser:
+        return None
+
+    try:
+        ast_result, digest = _parse_file_cached(file_path, ast_parser, ast_cache, session_cache)
+        language = ast_result.get("language", "unknown")
+        root = ast_result.get("ast", {})
+
+        result = {
+            "file_path": file_path,
+            # Lines are counted by the parser from the bytes it already read
+            "lines": ast_result.get("metadata", {}).get("line_count", 0),
+            "functions": 0,
+            "classes": 0,
+            "complexity": 0,
+            "issues": [],
+        }
+
+        # Calculate more sophisticated complexity metrics
+        if root:
+            # Count function and class definitions, and branches and loops for complexity.
+            # The parser counts them with a native query; walk the AST only as a fallback.
+            node_counts = ast_result.get("metadata", {}).get("node_counts")
+            if node_counts:
+                functions = node_counts["functions"]
+                classes = node_counts["classes"]
+                branches = node_counts["branches"]
+            else:
+                functions, classes, branches = _collect_ast_counts(root)
+            result["functions"] = functions
+            result["classes"] = classes
+
+            # More accurate cyclomatic complexity
+            result["complexity"] = branches + 1  # Base complexity is 1
+
+            # Apply rules to the AST
+            if rule_engine:
+                result["issues"] = _evaluate_rules_cached(
+                    rule_engine,
+                    root,
+                    {"file_path": file_path, "language": language},
+                    ast_cache,
+                    digest,
+                )
+
+        return result
+    except Exception as e:
+        logger.error("Error analyzing file %s: %s", file_path, e)
+        return None
+
+
+def _perform_security_ast_analysis(
+    ast_root: Dict[str, Any], rel_path: str, language: str
+) -> List[Dict[str, Any]]:
+    """
+    Perform additional security-specific AST analysis beyond the rule engine.
+
+    Args:
+        ast_root: Root node of the AST
+        rel_path: Path to report the findings under
+        language: Programming language
+
+    Returns:
+        List of security findings
+    """
+    findings = []
+
+    # Example: Look for potential SQL injection patterns
+    if language in ["python", "javascript", "php"]:
+        # Search for string concatenation in SQL queries
+        # This is a simplified example - real detection would be more sophisticated
+        for string_node in iter_nodes_by_type(ast_root, _STRING_TYPES):
+            if _SQL_KEYWORD_RE.search(string_node.get("text", "")):
+                line, column, _ = _node_span(string_node)
+                # Check if this string is part of a potential SQL query
+                # In a real implementation, we would check the context more thoroughly
+                findings.append(
+                    {
+                        "type": "sql_injection",
+                        "file_path": rel_path,
+                        "line": line,
+                        "column": column,
+                        "message": "Potential SQL injection vulnerability detected in string containing SQL keywords",
+                        "severity": "error",
+                        "category": "security",
+                        "security_severity": "medium",
+                        "cwe": "CWE-89",
+                        "recommendation": "Use parameterized queries or prepared statements instead of string concatenation",
+                    }
+                )
+
+    # Example: Look for potential hardcoded credentials
+    # This complements the existing rule but adds more context
+    credential_patterns = [
+        "password=",
+        "secret=",
+        "api_key=",
+        "token=",
+        "auth=",
+        "pwd=",
+        "key=",
+        "private_key",
+        "client_secret",
+    ]
+
+    # Search for all the patterns in a single traversal
+    credential_nodes = find_nodes_by_text_batch(ast_root, credential_patterns, case_sensitive=False)
+
+    for pattern, pattern_nodes in credential_nodes.items():
+        for node in pattern_nodes:
+            line, column, _ = _node_span(node)
+            findings.append(
+                {
+                    "type": "hardcoded_credential",
+                    "file_path": rel_path,
+                    "line": line,
+                    "column": column,
+                    "message": f"Potential hardcoded credential detected near '{pattern}'",
+                    "severity": "critical",
+                    "category": "security",
+                    "security_severity": "high",
+                    "cwe": "CWE-259",
+                    "recommendation": "Store credentials in environment variables or secure secret management systems",
+                }
+            )
+
+    return findings
+
+
+def _analyze_security_file(
+    file_path: str,
+    ast_parser: Optional[ASTParser],
+    rule_engine: Optional[RuleEngine],
+    ast_cache: Optional[FileHashCache],
+    session_cache: Optional[SessionCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a file and collect its security rule issues and AST findings.
+
+    Args:
+        file_path: Path to the file to analyze
+        ast_parser: Parser to use
+        rule_engine: Rule engine to evaluate, if any
+        ast_cache: AST cache to use, if any
+        session_cache: Parse results of the current analysis session, if any
+
+    Returns:
+        Dictionary of security issues and findings, or None if the file could not be analyzed
+    """
+    if not ast_parser:
+        return None
+
+    try:
+        ast_result, digest = _parse_file_cached(file_path, ast_parser, ast_cache, session_cache)
+        language = ast_result.get("language", "unknown")
+        root = ast_result.get("ast", {})
+
+        result = {"file_path": file_path, "issues": [], "findings": []}
+
+        # Apply security-focused AST analysis
+        if root:
+            # Use our rule engine for security rules
+            if rule_engine:
+                issues = _evaluate_rules_cached(
+                    rule_engine,
+                    root,
+                    {"file_path": file_path, "language": language},
+                    ast_cache,
+                    digest,
+                )
+
+                # Filter for security-related issues
+                result["issues"] = [
+                    issue for issue in issues if issue.get("category") == "security"
+                ]
+
+            # Perform additional security-specific AST analysis
+            result["findings"] = _perform_security_ast_analysis(root, file_path, language)
+
+        return result
+    except Exception as e:
+        logger.error("Error analyzing file %s: %s", file_path, e)
+        return None
+
+
+@lru_cache(maxsize=256)
+def _map_performance_type_to_category(issue_type: str) -> str:
+    """
+    Map performance issue types to broader categories.
+
+    There are only a handful of distinct issue types, so the mapping is
+    memoized per type instead of scanning the keywords for every finding.
+    """
+    issue_type_lower = issue_type.lower()
+
+    for category, keywords in _PERFORMANCE_CATEGORY_KEYWORDS:
+        if any(keyword in issue_type_lower for keyword in keywords):
+            return category
+    return "general_performance"
+
+
+def _detect_n_plus_one_queries(
+    ast_root: Dict[str, Any],
+    rel_path: str,
+    query_loop_spans: List[Tuple[int, int, int, int, int]],
+    loop_spans: List[Tuple[int, int, int]],
+) -> List[Dict[str, Any]]:
+    """Report loops containing what looks like a database call (potential N+1 queries)"""
+    # This is a simplified example - real detection would be more sophisticated
+    # Search for loops that might contain database queries. The byte ranges of the
+    # calls that look like common database method calls are collected in one AST
+    # walk, so each loop only bisects them instead of walking the AST itself.
+    query_calls = sorted(
+        (node.get("start_byte", 0), node.get("end_byte", 0))
+        for node in iter_nodes_by_type(ast_root, _CALL_TYPES)
+        if _DB_CALL_KEYWORD_RE.search(node.get("text") or "")
+    )
+    call_starts = [start for start, _ in query_calls]
+
+    hotspots = []
+    for loop_start, loop_column, _, loop_start_byte, loop_end_byte in query_loop_spans:
+        # Search for database calls within the loop's byte range
+        index = bisect_left(call_starts, loop_start_byte)
+        if index < len(query_calls) and query_calls[index][1] <= loop_end_byte:
+            # In a real implementation, we would check the context more thoroughly
+            hotspots.append(
+                {
+                    "type": "n_plus_one_query",
+                    "file_path": rel_path,
+                    "line": loop_start,
+                    "column": loop_column,
+                    "message": "Potential N+1 database query detected inside loop",
+                    "severity": "error",
+                    "category": "performance",
+                    "performance_category": "database",
+                    "performance_impact": "medium",
+                    "recommendation": "Use eager loading or batch fetching to reduce the number of database queries",
+                }
+            )
+
+    return hotspots
+
+
+def _detect_nested_loops(
+    ast_root: Dict[str, Any],
+    rel_path: str,
+    query_loop_spans: List[Tuple[int, int, int, int, int]],
+    loop_spans: List[Tuple[int, int, int]],
+) -> List[Dict[str, Any]]:
+    """Report loops containing other loops (potential O(n^2) time complexity)"""
+    # A loop is nested in an outer loop if it starts strictly between the outer
+    # loop's start and end rows, so one bisection of the sorted start rows tells
+    # whether an outer loop has any.
+    loop_starts = sorted(span[0] for span in loop_spans)
+
+    hotspots = []
+    for outer_start, outer_column, outer_end in loop_spans:
+        first_inner = bisect_right(loop_starts, outer_start)
+        if first_inner < len(loop_starts) and loop_starts[first_inner] < outer_end:
+            # Report each outer loop once, however many loops it contains
+            hotspots.append(
+                {
+                    "type": "nested_loops",
+                    "file_path": rel_path,
+                    "line": outer_start,
+                    "column": outer_column,
+                    "message": "Nested loops detected (potential O(n^2) time complexity)",
+                    "severity": "warning",
+                    "category": "performance",
+                    "performance_category": "algorithm",
+                    "performance_impact": "medium",
+                    "recommendation": "Consider using more efficient algorithms or data structures to reduce time complexity",
+                }
+            )
+
+    return hotspots
+
+
+def _detect_string_concatenation_in_loops(
+    ast_root: Dict[str, Any],
+    rel_path: str,
+    query_loop_spans: List[Tuple[int, int, int, int, int]],
+    loop_spans: List[Tuple[int, int, int]],
+) -> List[Dict[str, Any]]:
+    """Report string literal concatenations inside loops (potential memory issue)"""
+    # Loop row ranges sorted by start row, with the furthest end row reached so
+    # far, so finding whether a row is inside any loop takes one bisection
+    loop_ranges = sorted((start, end) for start, _, end in loop_spans)
+    range_starts = [start for start, _ in loop_ranges]
+    max_range_ends = list(accumulate((end for _, end in loop_ranges), max))
+
+    hotspots = []
+    # Check for repeated string concatenation in loops
+    for node in iter_nodes_by_type(ast_root, "binary_expression"):
+        if node.get("operator") == "+" and node.get("left", {}).get("type") == "string_literal":
+            # Check if this is inside a loop
+            node_line, node_column, _ = _node_span(node)
+
+            index = bisect_right(range_starts, node_line) - 1
+            if index >= 0 and max_range_ends[index] >= node_line:
+                hotspots.append(
+                    {
+                        "type": "string_concatenation_in_loop",
+                        "file_path": rel_path,
+                        "line": node_line,
+                        "column": node_column,
+                        "message": "Repeated string concatenation detected inside loop (potential memory issue)",
+                        "severity": "warning",
+                        "category": "performance",
+                        "performance_category": "memory",
+                        "performance_impact": "low",
+                        "recommendation": "Use StringBuilder or array.join() for more efficient string construction",
+                    }
+                )
+
+    return hotspots
+
+
+# Performance AST checks run for each language, in report order. Languages that
+# are not listed only get the language-independent checks.
+_DEFAULT_PERFORMANCE_DETECTORS = (_detect_nested_loops,)
+_PERFORMANCE_DETECTORS = {
+    "python": (_detect_n_plus_one_queries, _detect_nested_loops),
+    "javascript": (
+        _detect_n_plus_one_queries,
+        _detect_nested_loops,
+        _detect_string_concatenation_in_loops,
+    ),
+    "php": (_detect_n_plus_one_queries, _detect_nested_loops),
+}
+
+
+def _perform_performance_ast_analysis(
+    ast_root: Dict[str, Any], rel_path: str, language: str
+) -> List[Dict[str, Any]]:
+    """
+    Perform additional performance-specific AST analysis beyond the rule engine.
+
+    Args:
+        ast_root: Root node of the AST
+        rel_path: Path to report the hotspots under
+        language: Programming language
+
+    Returns:
+        List of performance hotspots
+    """
+    hotspots = []
+
+    # Collect the loops and their positions in a single traversal shared by all
+    # the checks, so each loop's position is only looked up once
+    query_loop_spans = []
+    loop_spans = []
+    for node in iter_nodes_by_type(ast_root, _QUERY_LOOP_TYPES):
+        span = _node_span(node)
+        query_loop_spans.append(span + (node.get("start_byte", 0), node.get("end_byte", 0)))
+        if node["type"] in _LOOP_TYPES:
+            loop_spans.append(span)
+
+    for detect in _PERFORMANCE_DETECTORS.get(language, _DEFAULT_PERFORMANCE_DETECTORS):
+        hotspots.extend(detect(ast_root, rel_path, query_loop_spans, loop_spans))
+
+    return hotspots
+
+
+def _has_performance_rules(rule_engine: Optional[RuleEngine]) -> bool:
+    """Check whether a rule engine has enabled performance rules to evaluate"""
+    return rule_engine is not None and any(
+        rule.enabled and rule.category == RuleCategory.PERFORMANCE for rule in rule_engine.rules
+    )
+
+
+def _analyze_performance_file(
+    file_path: str,
+    ast_parser: Optional[ASTParser],
+    rule_engine: Optional[RuleEngine],
+    ast_cache: Optional[FileHashCache],
+    session_cache: Optional[SessionCache] = None,
+    skip_loopless: Optional[bool] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a file and collect its performance rule issues and AST hotspots.
+
+    The result of an unchanged file is reused from the cache, skipping both
+    parsing and rule evaluation. Files without any loop keyword are not parsed
+    unless there are performance rules to evaluate, provided their language
+    can be parsed. The keywords are searched in the content read for hashing,
+    or else in the content read for parsing.
+
+    Args:
+        file_path: Path to the file to analyze
+        ast_parser: Parser to use
+        rule_engine: Rule engine to evaluate, if any
+        ast_cache: AST cache to use, if any
+        session_cache: Parse results of the current analysis session, if any
+        skip_loopless: Whether files without loop keywords can skip parsing, which
+            holds without performance rules; computed from rule_engine if None.
+            Callers analyzing many files compute it once and bind it with partial.
+
+    Returns:
+        Dictionary of performance issues and hotspots, or None if the file could not be analyzed
+    """
+    if not ast_parser:
+        return None
+
+    try:
+        language = EXTENSION_LANGUAGES.get(os.path.splitext(file_path)[1].lower())
+        results_key = (
+            f"performance:{rule_engine.version if rule_engine else ''}:"
+            f"{ast_parser.grammar_version(language) if language else ''}"
+        )
+        if skip_loopless is None:
+            skip_loopless = not _has_performance_rules(rule_engine)
+        # Files that cannot be parsed are not analyzed, with or without loop keywords
+        skip_loopless = skip_loopless and language is not None and ast_parser.has_language(language)
+
+        # Whether the content has a loop keyword, None until it is read
+        has_loop_keyword = None
+        content = None
+        if ast_cache is not None:
+            if skip_loopless:
+                digest, has_loop_keyword = ast_cache.scan_file(file_path, _LOOP_KEYWORD_RE)
+            else:
+                digest = ast_cache.file_digest(file_path)
+            result = ast_cache.get_results(digest, results_key)
+            if result is not None:
+                # Identical content may have been cached under another path
+                result["file_path"] = file_path
+                for issue in result["issues"]:
+                    issue["file"] = file_path
+                for hotspot in result["hotspots"]:
+                    hotspot["file_path"] = file_path
+                return result
+
+        # Without performance rules to evaluate, only the AST checks can report
+        # anything, and they need a loop: skip parsing files without loop keywords
+        if skip_loopless:
+            if has_loop_keyword is None:
+                # The content was not hashed; read it once for the screen and the parse
+                content = _read_file(file_path)
+                has_loop_keyword = _LOOP_KEYWORD_RE.search(content) is not None
+            if not has_loop_keyword:
+                result = {"file_path": file_path, "issues": [], "hotspots": []}
+                if ast_cache is not None:
+                    ast_cache.set_results(digest, results_key, result)
+                return result
+
+        ast_result, digest = _parse_file_cached(
+            file_path, ast_parser, ast_cache, session_cache, content
+        )
+        language = ast_result.get("language", "unknown")
+        root = ast_result.get("ast", {})
+
+        result = {"file_path": file_path, "issues": [], "hotspots": []}
+
+        # Apply performance-focused AST analysis
+        if root:
+            # Use our rule engine for performance rules
+            if rule_engine:
+                issues = _evaluate_rules_cached(
+                    rule_engine,
+                    root,
+                    {"file_path": file_path, "language": language},
+                    ast_cache,
+                    digest,
+                )
+
+                # Filter for performance-related issues
+                result["issues"] = [
+                    issue for issue in issues if issue.get("category") == "performance"
+                ]
+
+            # Perform additional performance-specific AST analysis
+            result["hotspots"] = _perform_performance_ast_analysis(root, file_path, language)
+
+        if digest is not None:
+            ast_cache.set_results(digest, results_key, result)
+        return result
+    except Exception as e:
+        logger.error("Error analyzing file %s: %s", file_path, e)
+        return None
+
 
 class AnalysisType(str, Enum):
     CODE_QUALITY = "code_quality"
@@ -22,11 +883,24 @@ class AnalysisType(str, Enum):
     DEPENDENCY = "dependency"
 
 
+# Per-file analysis functions of the analysis types that run through _run_file_analysis,
+# see AnalysisEngine._file_analyzer
+_FILE_ANALYZERS = {
+    AnalysisType.CODE_QUALITY: _analyze_quality_file,
+    AnalysisType.SECURITY: _analyze_security_file,
+    AnalysisType.PERFORMANCE: _analyze_performance_file,
+}
+
+
 class AnalysisEngine:
     """
     Core analysis engine for Lumecode.
     Handles code parsing, analysis, and result generation.
 
+    The engine's parser and worker pool keep the language libraries they
+    loaded; create a new engine (or restart) after rebuilding a grammar so
+    cached results are keyed by the new library.
+
     Attributes:
         ast_parser: AST parser instance for parsing code files
         rule_engine: Rule engine for applying analysis rules
@@ -40,9 +914,20 @@ class AnalysisEngine:
             "timeout": 300,
             "exclude_patterns": ["__pycache__", ".git", "node_modules"],
             "languages_dir": None,
+            "cache_dir": _default_cache_dir(),
+            "cache_max_size": _DEFAULT_CACHE_MAX_SIZE,
         }
         logger.info("Initializing Analysis Engine")
 
+        self.max_files = self.config.get("max_files", 100)
+        self.timeout = self.config.get("timeout", 300)
+        self.exclude_patterns = self.config.get("exclude_patterns", [])
+
+        # All exclude patterns are matched as substrings with a single regex scan
+        self._exclude_re = None
+        if self.exclude_patterns:
+            self._exclude_re = re.compile("|".join(map(re.escape, self.exclude_patterns)))
+
         # Initialize the AST parser
         try:
             languages_dir = self.config.get("languages_dir")
@@ -52,6 +937,13 @@ class AnalysisEngine:
             logger.error(f"Failed to initialize AST parser: {e}")
             self.ast_parser = None
 
+        # Supported file extensions, looked up for every file during project discovery
+        self._supported_ext_set = (
+            frozenset(self.ast_parser.SUPPORTED_LANGUAGES.values())
+            if self.ast_parser
+            else frozenset()
+        )
+
         # Initialize rule engine
         try:
             self.rule_engine = RuleEngine()
@@ -63,6 +955,66 @@ class AnalysisEngine:
             logger.error(f"Failed to initialize rule engine: {e}")
             self.rule_engine = None
 
+        # Initialize the AST cache
+        cache_dir = self.config.get("cache_dir")
+        self.ast_cache = (
+            FileHashCache(
+                cache_dir,
+                _AST_CACHE_VERSION,
+                self.config.get("cache_max_size", _DEFAULT_CACHE_MAX_SIZE),
+            )
+            if cache_dir
+            else None
+        )
+
+        # Parse results of the current analysis session, keyed by file path
+        self._session_ast_cache: Optional[SessionCache] = None
+        # Per-file analysis functions of the analysis types the session runs, and the
+        # results pool workers already computed for them, keyed by function and file path
+        self._session_analyzers: Dict[AnalysisType, Callable[..., Optional[Dict[str, Any]]]] = {}
+        self._session_results: Optional[Dict[Callable, Dict[str, Optional[Dict[str, Any]]]]] = None
+
+        # Worker pool, created on the first pooled analysis and kept until close(), so the
+        # parsers, trees and caches of the workers carry over from one analysis to the next
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+
+    def close(self) -> None:
+        """Shut down the worker pool, cancelling the batches it has not started"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # Wait for the pool's management thread, which otherwise outlives the pool
+            # and fails on its closed pipes at interpreter exit
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __del__(self):
+        # Engines are rarely closed explicitly; do not leave the workers running.
+        # Closed engines have nothing left to shut down during finalization.
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Get the worker pool, creating it on first use or when the number of workers changes.
+
+        Args:
+            workers: Number of worker processes
+
+        Returns:
+            Process pool whose workers were set up by _init_worker
+        """
+        if self._executor is None or self._executor_workers != workers:
+            self.close()
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.config.get("languages_dir"), self.config.get("cache_dir")),
+            )
+            self._executor_workers = workers
+        return self._executor
+
     async def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
         Parse a file using the AST parser.
@@ -80,31 +1032,36 @@ class AnalysisEngine:
         try:
             # Ensure the file exists
             if not os.path.exists(file_path):
-                logger.error(f"File not found: {file_path}")
+                logger.error("File not found: %s", file_path)
                 return {"error": f"File not found: {file_path}"}
 
             # Check if file is excluded based on patterns
-            for pattern in self.config.get("exclude_patterns", []):
-                if pattern in file_path:
-                    logger.info(f"File excluded: {file_path}")
-                    return {"excluded": True, "reason": f"Matches exclude pattern: {pattern}"}
-
-            # Parse the file using the enhanced ASTParser
-            start_time = time.time()
-            ast_result = self.ast_parser.parse_file(file_path)
-            parse_time = time.time() - start_time
+            match = self._exclude_re.search(file_path) if self._exclude_re else None
+            if match:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("File excluded: %s", file_path)
+                return {"excluded": True, "reason": f"Matches exclude pattern: {match.group(0)}"}
+
+            # Parse the file using the enhanced ASTParser, unless it is unchanged since it
+            # was cached or was already parsed in the current session
+            start_time = time.perf_counter()
+            ast_result, _ = _parse_file_cached(
+                file_path, self.ast_parser, self.ast_cache, self._session_ast_cache
+            )
+            parse_time = time.perf_counter() - start_time
 
             # Add analysis engine metadata
             ast_result["analysis_metadata"] = {
-                "engine_version": "0.1.0",
+                "engine_version": ENGINE_VERSION,
                 "parse_time": parse_time,
                 "timestamp": time.time(),
             }
 
-            logger.info(f"Successfully parsed file: {file_path} (took {parse_time:.2f}s)")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Successfully parsed file: %s (took %.2fs)", file_path, parse_time)
             return ast_result
         except Exception as e:
-            logger.error(f"Failed to parse file {file_path}: {e}")
+            logger.error("Failed to parse file %s: %s", file_path, e)
             return {"error": str(e), "file_path": file_path}
 
     async def parse_code(self, code: str, language: str) -> Dict[str, Any]:
@@ -141,18 +1098,19 @@ class AnalysisEngine:
                 }
 
             # Parse the code using the enhanced ASTParser
-            start_time = time.time()
+            start_time = time.perf_counter()
             ast_result = self.ast_parser.parse_code(code, language)
-            parse_time = time.time() - start_time
+            parse_time = time.perf_counter() - start_time
 
             # Add analysis engine metadata
             ast_result["analysis_metadata"] = {
-                "engine_version": "0.1.0",
+                "engine_version": ENGINE_VERSION,
                 "parse_time": parse_time,
                 "timestamp": time.time(),
             }
 
-            logger.info(f"Successfully parsed {language} code (took {parse_time:.2f}s)")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Successfully parsed %s code (took %.2fs)", language, parse_time)
             return ast_result
         except Exception as e:
             logger.error(f"Failed to parse {language} code: {e}")
@@ -183,9 +1141,9 @@ class AnalysisEngine:
         }
 
         # Parse the file
-        start_time = time.time()
+        start_time = time.perf_counter()
         ast_result = await self.parse_file(file_path)
-        results["parse_time"] = time.time() - start_time
+        results["parse_time"] = time.perf_counter() - start_time
 
         # Check if parsing failed or file was excluded
         if "error" in ast_result:
@@ -198,7 +1156,7 @@ class AnalysisEngine:
             return results
 
         # Extract the AST from the result
-        ast = ast_result.get("ast", {})
+        root = ast_result.get("ast")
         language = ast_result.get("language", "unknown")
 
         # Add file metadata
@@ -211,22 +1169,15 @@ class AnalysisEngine:
         )
 
         # Apply rule engine if available
-        if self.rule_engine and "root" in ast:
-            rule_start_time = time.time()
-            issues = self.rule_engine.evaluate(ast["root"], file_path, language)
+        if self.rule_engine and root and self.rule_engine.rules_for_language(language):
+            rule_start_time = time.perf_counter()
+            issues = self.rule_engine.evaluate(root, {"file_path": file_path, "language": language})
             results["issues"] = issues
-            results["rule_evaluation_time"] = time.time() - rule_start_time
+            results["rule_evaluation_time"] = time.perf_counter() - rule_start_time
             results["metrics"]["issues_count"] = len(issues)
 
             # Calculate metrics based on issues
-            severity_counts = {severity.value: 0 for severity in RuleSeverity}
-            category_counts = {category.value: 0 for category in RuleCategory}
-
-            for issue in issues:
-                if issue.get("severity") in severity_counts:
-                    severity_counts[issue["severity"]] += 1
-                if issue.get("category") in category_counts:
-                    category_counts[issue["category"]] += 1
+            severity_counts, category_counts = _tally_issues(issues)
 
             results["metrics"]["severity_counts"] = severity_counts
             results["metrics"]["category_counts"] = category_counts
@@ -251,7 +1202,7 @@ class AnalysisEngine:
             results["error"] = f"Unsupported analysis type: {analysis_type}"
 
         # Calculate total analysis time
-        results["total_analysis_time"] = time.time() - start_time
+        results["total_analysis_time"] = time.perf_counter() - start_time
 
         logger.info(
             f"Completed analysis of {file_path} (type: {analysis_type.value}, issues: {len(results['issues'])}, time: {results['total_analysis_time']:.2f}s)"
@@ -285,9 +1236,9 @@ class AnalysisEngine:
         }
 
         # Parse the code
-        start_time = time.time()
+        start_time = time.perf_counter()
         ast_result = await self.parse_code(code, language)
-        results["parse_time"] = time.time() - start_time
+        results["parse_time"] = time.perf_counter() - start_time
 
         # Check if parsing failed
         if "error" in ast_result:
@@ -295,7 +1246,7 @@ class AnalysisEngine:
             return results
 
         # Extract the AST from the result
-        ast = ast_result.get("ast", {})
+        root = ast_result.get("ast")
 
         # Add code metadata
         results["metadata"].update(
@@ -303,24 +1254,19 @@ class AnalysisEngine:
         )
 
         # Apply rule engine if available
-        if self.rule_engine and "root" in ast:
-            rule_start_time = time.time()
+        if self.rule_engine and root and self.rule_engine.rules_for_language(language):
+            rule_start_time = time.perf_counter()
             # Use a placeholder file path for rule evaluation
-            placeholder_path = f"<inline_code>{hash(code)}.{self.ast_parser.SUPPORTED_LANGUAGES.get(language, language)}"
-            issues = self.rule_engine.evaluate(ast["root"], placeholder_path, language)
+            placeholder_path = _inline_code_path(code, language)
+            issues = self.rule_engine.evaluate(
+                root, {"file_path": placeholder_path, "language": language}
+            )
             results["issues"] = issues
-            results["rule_evaluation_time"] = time.time() - rule_start_time
+            results["rule_evaluation_time"] = time.perf_counter() - rule_start_time
             results["metrics"]["issues_count"] = len(issues)
 
             # Calculate metrics based on issues
-            severity_counts = {severity.value: 0 for severity in RuleSeverity}
-            category_counts = {category.value: 0 for category in RuleCategory}
-
-            for issue in issues:
-                if issue.get("severity") in severity_counts:
-                    severity_counts[issue["severity"]] += 1
-                if issue.get("category") in category_counts:
-                    category_counts[issue["category"]] += 1
+            severity_counts, category_counts = _tally_issues(issues)
 
             results["metrics"]["severity_counts"] = severity_counts
             results["metrics"]["category_counts"] = category_counts
@@ -330,7 +1276,7 @@ class AnalysisEngine:
         results["metrics"]["chars_count"] = len(code)
 
         # Calculate total analysis time
-        results["total_analysis_time"] = time.time() - start_time
+        results["total_analysis_time"] = time.perf_counter() - start_time
 
         logger.info(
             f"Completed analysis of code snippet (language: {language}, type: {analysis_type.value}, issues: {len(results['issues'])}, time: {results['total_analysis_time']:.2f}s)"
@@ -359,19 +1305,82 @@ class AnalysisEngine:
 
         options = options or {}
 
-        # Dispatch to specific analysis method based on type
-        if analysis_type == AnalysisType.CODE_QUALITY:
-            return await self._analyze_code_quality(project_path, options)
-        elif analysis_type == AnalysisType.SECURITY:
-            return await self._analyze_security(project_path, options)
-        elif analysis_type == AnalysisType.PERFORMANCE:
-            return await self._analyze_performance(project_path, options)
-        elif analysis_type == AnalysisType.ARCHITECTURE:
-            return await self._analyze_architecture(project_path, options)
-        elif analysis_type == AnalysisType.DEPENDENCY:
-            return await self._analyze_dependencies(project_path, options)
-        else:
-            raise ValueError(f"Unsupported analysis type: {analysis_type}")
+        with self.analysis_session((analysis_type,)):
+            # Dispatch to specific analysis method based on type
+            if analysis_type == AnalysisType.CODE_QUALITY:
+                return await self._analyze_code_quality(project_path, options)
+            elif analysis_type == AnalysisType.SECURITY:
+                return await self._analyze_security(project_path, options)
+            elif analysis_type == AnalysisType.PERFORMANCE:
+                return await self._analyze_performance(project_path, options)
+            elif analysis_type == AnalysisType.ARCHITECTURE:
+                return await self._analyze_architecture(project_path, options)
+            elif analysis_type == AnalysisType.DEPENDENCY:
+                return await self._analyze_dependencies(project_path, options)
+            else:
+                raise ValueError(f"Unsupported analysis type: {analysis_type}")
+
+    @contextmanager
+    def analysis_session(self, analysis_types: Iterable[AnalysisType] = ()) -> Iterator[None]:
+        """
+        Share parse results between all the analyses run within the block.
+
+        Every analyze_project call runs in its own session. Callers running
+        several analysis types over the same project can wrap them in one
+        session so each file is parsed only once: files analyzed in-process
+        share their parse results, and pool workers run every listed analysis
+        type on a file in one pass, keeping the results of the other types
+        until they are requested. Sessions nest: only the outermost one
+        creates and discards the caches, so results never outlive it.
+
+        Args:
+            analysis_types: Analysis types the session will run
+        """
+        if self._session_ast_cache is not None:
+            yield
+            return
+
+        self._session_ast_cache = {}
+        self._session_analyzers = {
+            analysis_type: self._file_analyzer(analysis_type)
+            for analysis_type in analysis_types
+            if analysis_type in _FILE_ANALYZERS
+        }
+        self._session_results = {}
+        try:
+            yield
+        finally:
+            self._session_ast_cache = None
+            self._session_analyzers = {}
+            self._session_results = None
+
+    def _file_analyzer(
+        self, analysis_type: AnalysisType
+    ) -> Callable[..., Optional[Dict[str, Any]]]:
+        """
+        Get the per-file analysis function of an analysis type for this run.
+
+        Settings that depend only on the engine are computed here once and
+        bound to the function, instead of being recomputed for every file.
+        Within a session, the same function is returned for the whole session.
+
+        Args:
+            analysis_type: Analysis type with a per-file analysis function
+
+        Returns:
+            Picklable function taking (file_path, ast_parser, rule_engine, ast_cache,
+            session_cache)
+        """
+        analyze_fn = self._session_analyzers.get(analysis_type)
+        if analyze_fn is not None:
+            return analyze_fn
+
+        analyze_fn = _FILE_ANALYZERS[analysis_type]
+        if analysis_type == AnalysisType.PERFORMANCE:
+            analyze_fn = partial(
+                analyze_fn, skip_loopless=not _has_performance_rules(self.rule_engine)
+            )
+        return analyze_fn
 
     async def _analyze_code_quality(
         self, project_path: str, options: Dict[str, Any]
@@ -382,123 +1391,46 @@ class AnalysisEngine:
         logger.info("Performing code quality analysis")
 
         options = options or {}
-        start_time = time.time()
-
-        # Get supported file extensions from the AST parser
-        supported_extensions = []
-        if self.ast_parser:
-            supported_extensions = list(self.ast_parser.SUPPORTED_LANGUAGES.values())
+        start_time = time.perf_counter()
 
         # Find all supported files in the project
-        files_to_analyze = []
-        for root, _, files in os.walk(project_path):
-            # Skip excluded directories
-            rel_root = os.path.relpath(root, project_path)
-            if any(pattern in rel_root for pattern in self.exclude_patterns):
-                continue
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1].lower()
-
-                # Skip excluded files
-                rel_path = os.path.relpath(file_path, project_path)
-                if any(pattern in rel_path for pattern in self.exclude_patterns):
-                    continue
-
-                if ext in supported_extensions:
-                    # Apply file limit if specified
-                    max_files = options.get("max_files", self.max_files)
-                    if max_files > 0 and len(files_to_analyze) >= max_files:
-                        logger.warning(f"Reached maximum file limit of {max_files} for analysis")
-                        break
-
-                    files_to_analyze.append(file_path)
-
+        files_to_analyze = self._find_files_to_analyze(project_path, options)
         logger.info(f"Found {len(files_to_analyze)} files to analyze")
 
         # Analyze each file
         all_issues = []
         total_complexity = 0
         total_files = len(files_to_analyze)
-        files_analyzed = 0
         total_lines = 0
         total_functions = 0
         total_classes = 0
 
-        for file_path in files_to_analyze:
-            try:
-                # Skip analysis if we've exceeded the timeout
-                if self.timeout > 0 and (time.time() - start_time) > self.timeout:
-                    logger.warning(f"Analysis timeout reached after {self.timeout} seconds")
-                    break
+        file_results = await self._run_file_analysis(
+            self._file_analyzer(AnalysisType.CODE_QUALITY), files_to_analyze, options, start_time
+        )
+        files_analyzed = len(file_results)
+        analyzed_files = [None] * files_analyzed
+        extend_issues = all_issues.extend
+        relpath = _project_relpath(project_path)
 
-                # Parse the file if AST parser is available
-                if self.ast_parser:
-                    ast_result = await self.parse_file(file_path)
-
-                    # Skip if file was excluded or parsing failed
-                    if "excluded" in ast_result or "error" in ast_result:
-                        continue
-
-                    rel_path = os.path.relpath(file_path, project_path)
-                    language = ast_result.get("language", "unknown")
-                    ast = ast_result.get("ast", {})
-
-                    # Count lines of code
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            lines = len(f.readlines())
-                            total_lines += lines
-                    except Exception:
-                        lines = 0
-
-                    # Calculate more sophisticated complexity metrics
-                    if "root" in ast:
-                        # Count function and class definitions
-                        functions = find_nodes_by_type(
-                            ast["root"], ["function_definition", "method_definition"]
-                        )
-                        classes = find_nodes_by_type(ast["root"], ["class_definition"])
-                        total_functions += len(functions)
-                        total_classes += len(classes)
-
-                        # Calculate complexity based on branches and loops
-                        branch_nodes = find_nodes_by_type(
-                            ast["root"],
-                            [
-                                "if_statement",
-                                "for_statement",
-                                "while_statement",
-                                "switch_statement",
-                                "case_statement",
-                                "try_statement",
-                            ],
-                        )
-
-                        # More accurate cyclomatic complexity
-                        complexity = len(branch_nodes) + 1  # Base complexity is 1
-                        total_complexity += complexity
-
-                        # Apply rules to the AST
-                        if self.rule_engine:
-                            # Evaluate rules
-                            rule_issues = self.rule_engine.evaluate(
-                                ast["root"], file_path, language
-                            )
-
-                            # Add file path to issues
-                            for issue in rule_issues:
-                                issue["file_path"] = rel_path
-
-                            all_issues.extend(rule_issues)
-
-                            if rule_issues:
-                                logger.info(f"Found {len(rule_issues)} issues in {rel_path}")
-
-                    files_analyzed += 1
-            except Exception as e:
-                logger.error(f"Error analyzing file {file_path}: {e}")
+        for index, file_result in enumerate(file_results):
+            rel_path = relpath(file_result["file_path"])
+            analyzed_files[index] = rel_path
+
+            total_lines += file_result["lines"]
+            total_functions += file_result["functions"]
+            total_classes += file_result["classes"]
+            total_complexity += file_result["complexity"]
+
+            # Add file path to issues
+            rule_issues = file_result["issues"]
+            for issue in rule_issues:
+                issue["file_path"] = rel_path
+
+            extend_issues(rule_issues)
+
+            if rule_issues and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %d issues in %s", len(rule_issues), rel_path)
 
         # Calculate metrics
         avg_complexity = total_complexity / files_analyzed if files_analyzed > 0 else 0
@@ -506,14 +1438,7 @@ class AnalysisEngine:
         avg_lines_per_file = total_lines / files_analyzed if files_analyzed > 0 else 0
 
         # Group issues by category and severity using our enums
-        issues_by_category = {category.value: 0 for category in RuleCategory}
-        issues_by_severity = {severity.value: 0 for severity in RuleSeverity}
-
-        for issue in all_issues:
-            if issue.get("category") in issues_by_category:
-                issues_by_category[issue["category"]] += 1
-            if issue.get("severity") in issues_by_severity:
-                issues_by_severity[issue["severity"]] += 1
+        issues_by_severity, issues_by_category = _tally_issues(all_issues)
 
         # Calculate maintainability index (simplified version based on multiple factors)
         # Lower complexity and fewer issues lead to higher maintainability
@@ -546,14 +1471,223 @@ class AnalysisEngine:
                 "avg_functions_per_file": round(avg_functions_per_file, 2),
                 "issues_by_severity": issues_by_severity,
                 "issues_by_category": issues_by_category,
-                "analysis_time": round(time.time() - start_time, 2),
+                "analysis_time": round(time.perf_counter() - start_time, 2),
             },
             "issues": all_issues,
-            "files_analyzed_list": [
-                os.path.relpath(f, project_path) for f in files_to_analyze[:files_analyzed]
-            ],
+            "files_analyzed_list": analyzed_files,
         }
 
+    def _find_files_to_analyze(self, project_path: str, options: Dict[str, Any]) -> List[str]:
+        """
+        Find the files in a project that the AST parser supports.
+
+        Args:
+            project_path: Path to the project directory
+            options: Analysis options
+
+        Returns:
+            Paths of the files to analyze
+        """
+        # Apply file limit if specified; read once for the whole walk
+        max_files = options.get("max_files", self.max_files) or 0
+
+        files_to_analyze = []
+        for file_path in self._iter_source_files(project_path, self._supported_ext_set):
+            if max_files > 0 and len(files_to_analyze) >= max_files:
+                logger.warning(f"Reached maximum file limit of {max_files} for analysis")
+                break
+
+            files_to_analyze.append(file_path)
+
+        return files_to_analyze
+
+    def _iter_source_files(
+        self, project_path: str, supported_extensions: FrozenSet[str]
+    ) -> Iterator[str]:
+        """
+        Walk a project and yield the files with a supported extension.
+
+        Uses os.scandir, whose entries already know whether they are
+        directories, so no extra stat is needed per entry. Relative paths are
+        sliced off the full path instead of recomputed with os.path.relpath.
+
+        Args:
+            project_path: Path to the project directory
+            supported_extensions: File extensions to yield, including the dot
+
+        Yields:
+            Paths of the files that are not excluded
+        """
+        project_path = os.path.normpath(project_path)
+        prefix_len = len(os.path.join(project_path, ""))
+        # Bound once for the walk; relative paths are only sliced if there are patterns
+        exclude_search = self._exclude_re.search if self._exclude_re else None
+
+        stack = [project_path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        # Skip excluded files and prune excluded directories
+                        if exclude_search and exclude_search(entry.path[prefix_len:]):
+                            continue
+
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+
+                        dot = name.rfind(".")
+                        if dot > 0 and name[dot:].lower() in supported_extensions:
+                            yield entry.path
+            except OSError as e:
+                logger.warning(f"Failed to scan directory: {e}")
+
+    async def _run_file_analysis(
+        self,
+        analyze_fn: Callable[..., Optional[Dict[str, Any]]],
+        files: List[str],
+        options: Dict[str, Any],
+        start_time: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a per-file analysis function over files, sharding them across worker processes.
+
+        Tree-sitter parsing holds the GIL, so files are split into batches that
+        run in the engine's ProcessPoolExecutor, which is kept between analyses.
+        With a single worker (the "workers" option or one CPU), or with rules
+        the workers do not have, the files are analyzed in-process instead,
+        sharing the parse results of the current session. Within a session, the workers also run the per-file analyses
+        of the session's other analysis types, whose results are kept for when
+        they are requested.
+
+        Args:
+            analyze_fn: Module-level function taking (file_path, ast_parser, rule_engine,
+                ast_cache, session_cache)
+            files: Files to analyze
+            options: Analysis options
+            start_time: time.perf_counter() at the start of the analysis, used for the timeout
+
+        Returns:
+            Results for the files that were analyzed, in the order of files. If the
+            timeout is reached, only the results completed so far are returned.
+        """
+        workers = options.get("workers") or os.cpu_count() or 1
+        deadline = start_time + self.timeout
+
+        if workers > 1 and len(files) > 1 and not self._workers_share_rules():
+            logger.info(
+                "Analyzing files in-process: the rule set differs from the default rules "
+                "the worker processes evaluate"
+            )
+            workers = 1
+
+        if workers <= 1 or len(files) <= 1:
+            results = []
+            for file_path in files:
+                # Skip analysis if we've exceeded the timeout
+                if self.timeout > 0 and time.perf_counter() > deadline:
+                    logger.warning(f"Analysis timeout reached after {self.timeout} seconds")
+                    break
+
+                result = analyze_fn(
+                    file_path,
+                    self.ast_parser,
+                    self.rule_engine,
+                    self.ast_cache,
+                    self._session_ast_cache,
+                )
+                if result is not None:
+                    results.append(result)
+
+            if self.ast_cache:
+                self.ast_cache.save()
+            return results
+
+        # Reuse the results the workers computed for this function earlier in the session;
+        # they are handed out once, so the session does not hold on to them
+        analyze_fns = (analyze_fn,)
+        session_results = self._session_results
+        if session_results is not None:
+            known_results = session_results.pop(analyze_fn, {})
+            if all(file_path in known_results for file_path in files):
+                return [result for result in map(known_results.get, files) if result is not None]
+            session_analyzers = tuple(self._session_analyzers.values())
+            if analyze_fn in session_analyzers:
+                analyze_fns = session_analyzers
+
+        # A few batches per worker keeps the workers busy while amortizing the IPC per file
+        batch_size = max(1, len(files) // (4 * workers))
+        batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+        batch_results: List[List[Tuple[Optional[Dict[str, Any]], ...]]] = [[] for _ in batches]
+
+        timeout = None
+        if self.timeout > 0:
+            timeout = max(0, deadline - time.perf_counter())
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(workers)
+        futures = {
+            loop.run_in_executor(executor, _analyze_file_batch, analyze_fns, batch): index
+            for index, batch in enumerate(batches)
+        }
+        try:
+            done, pending = await asyncio.wait(futures, timeout=timeout)
+        finally:
+            # Batches that have not started are dropped from the shared pool
+            for future in futures:
+                future.cancel()
+        if pending:
+            logger.warning(f"Analysis timeout reached after {self.timeout} seconds")
+
+        for future in done:
+            try:
+                batch_results[futures[future]], index_updates = future.result()
+            except BrokenProcessPool as e:
+                # A worker died; start a new pool on the next analysis
+                logger.error(f"Error analyzing files {batches[futures[future]]}: {e}")
+                if self._executor is executor:
+                    self.close()
+                continue
+            except Exception as e:
+                logger.error(f"Error analyzing files {batches[futures[future]]}: {e}")
+                continue
+            if self.ast_cache:
+                self.ast_cache.merge_index(index_updates)
+
+        # Save the content hashes the workers computed, so the next run can skip hashing
+        if self.ast_cache:
+            self.ast_cache.save()
+
+        # Keep the results of the session's other analyses until they are requested
+        if session_results is not None and len(analyze_fns) > 1:
+            for batch, file_results in zip(batches, batch_results):
+                for file_path, results in zip(batch, file_results):
+                    for fn, result in zip(analyze_fns, results):
+                        if fn is not analyze_fn:
+                            session_results.setdefault(fn, {})[file_path] = result
+
+        index = analyze_fns.index(analyze_fn)
+        return [
+            results[index]
+            for batch in batch_results
+            for results in batch
+            if results[index] is not None
+        ]
+
+    def _workers_share_rules(self) -> bool:
+        """
+        Check whether pool workers would evaluate the same rules as this engine.
+
+        Rules cannot be pickled, so each worker builds the default rule set in
+        _init_worker. Analyzing with any other rule set (or none) in the pool
+        would silently report different issues than analyzing in-process.
+
+        Returns:
+            True if the engine's rule set is the default one
+        """
+        return self.rule_engine is not None and self.rule_engine.version == _default_rules_version()
+
     def _count_nodes(self, ast_node: Dict[str, Any]) -> int:
         """
         Count the number of nodes in an AST.
@@ -564,11 +1698,13 @@ class AnalysisEngine:
         Returns:
             Number of nodes
         """
-        count = 1  # Count this node
-
-        if "children" in ast_node:
-            for child in ast_node["children"]:
-                count += self._count_nodes(child)
+        # Walk with an explicit stack so deeply nested ASTs cannot hit the recursion limit
+        count = 0
+        stack = [ast_node]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.get("children", ()))
 
         return count
 
@@ -579,45 +1715,15 @@ class AnalysisEngine:
         logger.info("Performing security analysis")
 
         options = options or {}
-        start_time = time.time()
-
-        # Get supported file extensions from the AST parser
-        supported_extensions = []
-        if self.ast_parser:
-            supported_extensions = list(self.ast_parser.SUPPORTED_LANGUAGES.values())
+        start_time = time.perf_counter()
 
         # Find all supported files in the project
-        files_to_analyze = []
-        for root, _, files in os.walk(project_path):
-            # Skip excluded directories
-            rel_root = os.path.relpath(root, project_path)
-            if any(pattern in rel_root for pattern in self.exclude_patterns):
-                continue
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1].lower()
-
-                # Skip excluded files
-                rel_path = os.path.relpath(file_path, project_path)
-                if any(pattern in rel_path for pattern in self.exclude_patterns):
-                    continue
-
-                if ext in supported_extensions:
-                    # Apply file limit if specified
-                    max_files = options.get("max_files", self.max_files)
-                    if max_files > 0 and len(files_to_analyze) >= max_files:
-                        logger.warning(f"Reached maximum file limit of {max_files} for analysis")
-                        break
-
-                    files_to_analyze.append(file_path)
-
+        files_to_analyze = self._find_files_to_analyze(project_path, options)
         logger.info(f"Found {len(files_to_analyze)} files to analyze")
 
         # Analyze each file for security vulnerabilities
         vulnerabilities = []
         total_files = len(files_to_analyze)
-        files_analyzed = 0
 
         # CWE (Common Weakness Enumeration) mapping for common vulnerabilities
         cwe_mapping = {
@@ -631,95 +1737,55 @@ class AnalysisEngine:
             "path_traversal": "CWE-22",
         }
 
-        for file_path in files_to_analyze:
-            try:
-                # Skip analysis if we've exceeded the timeout
-                if self.timeout > 0 and (time.time() - start_time) > self.timeout:
-                    logger.warning(f"Analysis timeout reached after {self.timeout} seconds")
-                    break
-
-                # Parse the file if AST parser is available
-                if self.ast_parser:
-                    ast_result = await self.parse_file(file_path)
-
-                    # Skip if file was excluded or parsing failed
-                    if "excluded" in ast_result or "error" in ast_result:
-                        continue
-
-                    rel_path = os.path.relpath(file_path, project_path)
-                    language = ast_result.get("language", "unknown")
-                    ast = ast_result.get("ast", {})
-
-                    # Apply security-focused AST analysis
-                    if "root" in ast:
-                        # Use our rule engine for security rules
-                        if self.rule_engine:
-                            # Evaluate rules
-                            security_issues = self.rule_engine.evaluate(
-                                ast["root"], file_path, language
-                            )
-
-                            # Filter for security-related issues
-                            security_vulnerabilities = [
-                                issue
-                                for issue in security_issues
-                                if issue.get("category") == "security"
-                            ]
-
-                            # Add file path and CWE information to vulnerabilities
-                            for vuln in security_vulnerabilities:
-                                vuln["file_path"] = rel_path
-                                vuln_type = vuln.get("type", "unknown").lower()
-
-                                # Add CWE if known
-                                if vuln_type in cwe_mapping:
-                                    vuln["cwe"] = cwe_mapping[vuln_type]
-
-                                # Map our severity to standard security severity levels
-                                if vuln.get("severity") == "critical":
-                                    vuln["security_severity"] = "high"
-                                elif vuln.get("severity") == "error":
-                                    vuln["security_severity"] = "medium"
-                                else:
-                                    vuln["security_severity"] = "low"
-
-                            vulnerabilities.extend(security_vulnerabilities)
-
-                            if security_vulnerabilities:
-                                logger.info(
-                                    f"Found {len(security_vulnerabilities)} security vulnerabilities in {rel_path}"
-                                )
-
-                        # Perform additional security-specific AST analysis
-                        security_findings = await self._perform_security_ast_analysis(
-                            ast["root"], file_path, language, options
-                        )
-                        vulnerabilities.extend(security_findings)
-
-                    files_analyzed += 1
-            except Exception as e:
-                logger.error(f"Error analyzing file {file_path}: {e}")
+        file_results = await self._run_file_analysis(
+            self._file_analyzer(AnalysisType.SECURITY), files_to_analyze, options, start_time
+        )
+        files_analyzed = len(file_results)
+        analyzed_files = [None] * files_analyzed
+        extend_vulnerabilities = vulnerabilities.extend
+        relpath = _project_relpath(project_path)
 
-        # Calculate metrics
+        # Metrics, counted as the vulnerabilities are collected
         severity_counts = {"high": 0, "medium": 0, "low": 0}
+        vuln_types = Counter()
+        cwe_counts = Counter()
+
+        for index, file_result in enumerate(file_results):
+            rel_path = relpath(file_result["file_path"])
+            analyzed_files[index] = rel_path
+
+            # Add file path and CWE information to vulnerabilities
+            security_vulnerabilities = file_result["issues"]
+            for vuln in security_vulnerabilities:
+                vuln_type = vuln.get("type", "unknown").lower()
+
+                # Add CWE if known
+                if vuln_type in cwe_mapping:
+                    vuln["cwe"] = cwe_mapping[vuln_type]
+
+                # Map our severity to standard security severity levels
+                vuln["security_severity"] = _SEVERITY_LEVELS.get(vuln.get("severity"), "low")
+
+            if security_vulnerabilities and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Found %d security vulnerabilities in %s",
+                    len(security_vulnerabilities),
+                    rel_path,
+                )
 
-        for vuln in vulnerabilities:
-            severity = vuln.get("security_severity", "low")
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+            security_vulnerabilities.extend(file_result["findings"])
+            for vuln in security_vulnerabilities:
+                # The workers report full paths; make them relative to the project
+                vuln["file_path"] = rel_path
+                severity = vuln.get("security_severity", "low")
+                if severity in severity_counts:
+                    severity_counts[severity] += 1
 
-        # Count vulnerabilities by type
-        vuln_types = {}
-        for vuln in vulnerabilities:
-            vuln_type = vuln.get("type", "unknown")
-            vuln_types[vuln_type] = vuln_types.get(vuln_type, 0) + 1
+                vuln_types[vuln.get("type", "unknown")] += 1
+                if "cwe" in vuln:
+                    cwe_counts[vuln["cwe"]] += 1
 
-        # Count by CWE
-        cwe_counts = {}
-        for vuln in vulnerabilities:
-            if "cwe" in vuln:
-                cwe = vuln["cwe"]
-                cwe_counts[cwe] = cwe_counts.get(cwe, 0) + 1
+            extend_vulnerabilities(security_vulnerabilities)
 
         return {
             "type": "security",
@@ -733,97 +1799,13 @@ class AnalysisEngine:
                 "total_vulnerabilities": len(vulnerabilities),
                 "files_analyzed": files_analyzed,
                 "total_files": total_files,
-                "vulnerabilities_by_type": vuln_types,
-                "vulnerabilities_by_cwe": cwe_counts,
-                "analysis_time": round(time.time() - start_time, 2),
+                "vulnerabilities_by_type": dict(vuln_types),
+                "vulnerabilities_by_cwe": dict(cwe_counts),
+                "analysis_time": round(time.perf_counter() - start_time, 2),
             },
-            "files_analyzed_list": [
-                os.path.relpath(f, project_path) for f in files_to_analyze[:files_analyzed]
-            ],
+            "files_analyzed_list": analyzed_files,
         }
 
-    async def _perform_security_ast_analysis(
-        self, ast_root: Dict[str, Any], file_path: str, language: str, options: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """
-        Perform additional security-specific AST analysis beyond the rule engine.
-
-        Args:
-            ast_root: Root node of the AST
-            file_path: Path to the analyzed file
-            language: Programming language
-            options: Additional analysis options
-
-        Returns:
-            List of security findings
-        """
-        findings = []
-        rel_path = os.path.relpath(file_path)
-
-        # Example: Look for potential SQL injection patterns
-        if language in ["python", "javascript", "php"]:
-            # Search for string concatenation in SQL queries
-            # This is a simplified example - real detection would be more sophisticated
-            string_nodes = find_nodes_by_type(ast_root, ["string_literal", "template_string"])
-
-            for string_node in string_nodes:
-                text = string_node.get("text", "").lower()
-                if any(
-                    keyword in text
-                    for keyword in ["select ", "insert ", "update ", "delete ", "drop "]
-                ):
-                    # Check if this string is part of a potential SQL query
-                    # In a real implementation, we would check the context more thoroughly
-                    findings.append(
-                        {
-                            "type": "sql_injection",
-                            "file_path": rel_path,
-                            "line": string_node.get("start_pos", {}).get("row", 0),
-                            "column": string_node.get("start_pos", {}).get("column", 0),
-                            "message": "Potential SQL injection vulnerability detected in string containing SQL keywords",
-                            "severity": "error",
-                            "category": "security",
-                            "security_severity": "medium",
-                            "cwe": "CWE-89",
-                            "recommendation": "Use parameterized queries or prepared statements instead of string concatenation",
-                        }
-                    )
-
-        # Example: Look for potential hardcoded credentials
-        # This complements the existing rule but adds more context
-        credential_patterns = [
-            "password=",
-            "secret=",
-            "api_key=",
-            "token=",
-            "auth=",
-            "pwd=",
-            "key=",
-            "private_key",
-            "client_secret",
-        ]
-
-        for pattern in credential_patterns:
-            pattern_nodes = find_nodes_by_text(ast_root, pattern, case_sensitive=False)
-
-            for node in pattern_nodes:
-                findings.append(
-                    {
-                        "type": "hardcoded_credential",
-                        "file_path": rel_path,
-                        "line": node.get("start_pos", {}).get("row", 0),
-                        "column": node.get("start_pos", {}).get("column", 0),
-                        "message": f"Potential hardcoded credential detected near '{pattern}'",
-                        "severity": "critical",
-                        "category": "security",
-                        "security_severity": "high",
-                        "cwe": "CWE-259",
-                        "recommendation": "Store credentials in environment variables or secure secret management systems",
-                    }
-                )
-
-        return findings
-
     async def _analyze_performance(
         self, project_path: str, options: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -833,45 +1815,15 @@ class AnalysisEngine:
         logger.info("Performing performance analysis")
 
         options = options or {}
-        start_time = time.time()
-
-        # Get supported file extensions from the AST parser
-        supported_extensions = []
-        if self.ast_parser:
-            supported_extensions = list(self.ast_parser.SUPPORTED_LANGUAGES.values())
+        start_time = time.perf_counter()
 
         # Find all supported files in the project
-        files_to_analyze = []
-        for root, _, files in os.walk(project_path):
-            # Skip excluded directories
-            rel_root = os.path.relpath(root, project_path)
-            if any(pattern in rel_root for pattern in self.exclude_patterns):
-                continue
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1].lower()
-
-                # Skip excluded files
-                rel_path = os.path.relpath(file_path, project_path)
-                if any(pattern in rel_path for pattern in self.exclude_patterns):
-                    continue
-
-                if ext in supported_extensions:
-                    # Apply file limit if specified
-                    max_files = options.get("max_files", self.max_files)
-                    if max_files > 0 and len(files_to_analyze) >= max_files:
-                        logger.warning(f"Reached maximum file limit of {max_files} for analysis")
-                        break
-
-                    files_to_analyze.append(file_path)
-
+        files_to_analyze = self._find_files_to_analyze(project_path, options)
         logger.info(f"Found {len(files_to_analyze)} files to analyze")
 
         # Analyze each file for performance issues
         performance_hotspots = []
         total_files = len(files_to_analyze)
-        files_analyzed = 0
 
         # Categories of performance issues we look for
         performance_categories = {
@@ -884,95 +1836,51 @@ class AnalysisEngine:
             "rendering": 0,
         }
 
-        for file_path in files_to_analyze:
-            try:
-                # Skip analysis if we've exceeded the timeout
-                if self.timeout > 0 and (time.time() - start_time) > self.timeout:
-                    logger.warning(f"Analysis timeout reached after {self.timeout} seconds")
-                    break
-
-                # Parse the file if AST parser is available
-                if self.ast_parser:
-                    ast_result = await self.parse_file(file_path)
-
-                    # Skip if file was excluded or parsing failed
-                    if "excluded" in ast_result or "error" in ast_result:
-                        continue
-
-                    rel_path = os.path.relpath(file_path, project_path)
-                    language = ast_result.get("language", "unknown")
-                    ast = ast_result.get("ast", {})
-
-                    # Apply performance-focused AST analysis
-                    if "root" in ast:
-                        # Use our rule engine for performance rules
-                        if self.rule_engine:
-                            # Evaluate rules
-                            performance_issues = self.rule_engine.evaluate(
-                                ast["root"], file_path, language
-                            )
-
-                            # Filter for performance-related issues
-                            performance_findings = [
-                                issue
-                                for issue in performance_issues
-                                if issue.get("category") == "performance"
-                            ]
-
-                            # Add file path and categorize findings
-                            for finding in performance_findings:
-                                finding["file_path"] = rel_path
-                                finding["type"] = finding.get("type", "general_performance")
-
-                                # Map to performance category
-                                category = self._map_performance_type_to_category(finding["type"])
-                                finding["performance_category"] = category
-                                if category in performance_categories:
-                                    performance_categories[category] += 1
-
-                            performance_hotspots.extend(performance_findings)
-
-                            if performance_findings:
-                                logger.info(
-                                    f"Found {len(performance_findings)} performance issues in {rel_path}"
-                                )
-
-                        # Perform additional performance-specific AST analysis
-                        additional_hotspots = await self._perform_performance_ast_analysis(
-                            ast["root"], file_path, language, options
-                        )
-                        performance_hotspots.extend(additional_hotspots)
-
-                        # Increment category counts for additional hotspots
-                        for hotspot in additional_hotspots:
-                            category = hotspot.get("performance_category", "general_performance")
-                            if category in performance_categories:
-                                performance_categories[category] += 1
-
-                    files_analyzed += 1
-            except Exception as e:
-                logger.error(f"Error analyzing file {file_path}: {e}")
+        file_results = await self._run_file_analysis(
+            self._file_analyzer(AnalysisType.PERFORMANCE), files_to_analyze, options, start_time
+        )
+        files_analyzed = len(file_results)
+        analyzed_files = [None] * files_analyzed
+        relpath = _project_relpath(project_path)
 
-        # Calculate metrics
+        # Metrics, counted as the hotspots are collected
         severity_counts = {"high": 0, "medium": 0, "low": 0}
+        issue_types = Counter()
 
-        for hotspot in performance_hotspots:
-            # Map our severity to performance impact levels
-            if hotspot.get("severity") == "critical":
-                impact = "high"
-            elif hotspot.get("severity") == "error":
-                impact = "medium"
-            else:
-                impact = "low"
+        for index, file_result in enumerate(file_results):
+            rel_path = relpath(file_result["file_path"])
+            analyzed_files[index] = rel_path
+
+            # Add file path and categorize findings
+            performance_findings = file_result["issues"]
+            for finding in performance_findings:
+                finding["type"] = finding.get("type", "general_performance")
+
+                # Map to performance category
+                finding["performance_category"] = _map_performance_type_to_category(finding["type"])
+
+            if performance_findings and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Found %d performance issues in %s", len(performance_findings), rel_path
+                )
 
-            severity_counts[impact] += 1
-            hotspot["performance_impact"] = impact
+            # Count the rule findings and the additional hotspots in one pass
+            performance_findings.extend(file_result["hotspots"])
+            for hotspot in performance_findings:
+                # The workers report full paths; make them relative to the project
+                hotspot["file_path"] = rel_path
+                category = hotspot.get("performance_category", "general_performance")
+                if category in performance_categories:
+                    performance_categories[category] += 1
 
-        # Count issues by type
-        issue_types = {}
-        for hotspot in performance_hotspots:
-            issue_type = hotspot.get("type", "unknown")
-            issue_types[issue_type] = issue_types.get(issue_type, 0) + 1
+                # Map our severity to performance impact levels
+                impact = _SEVERITY_LEVELS.get(hotspot.get("severity"), "low")
+                hotspot["performance_impact"] = impact
+                severity_counts[impact] += 1
+
+                issue_types[hotspot.get("type", "unknown")] += 1
+
+            performance_hotspots.extend(performance_findings)
 
         return {
             "type": "performance",
@@ -986,166 +1894,13 @@ class AnalysisEngine:
                 "total_hotspots": len(performance_hotspots),
                 "files_analyzed": files_analyzed,
                 "total_files": total_files,
-                "hotspots_by_type": issue_types,
+                "hotspots_by_type": dict(issue_types),
                 "hotspots_by_category": {k: v for k, v in performance_categories.items() if v > 0},
-                "analysis_time": round(time.time() - start_time, 2),
+                "analysis_time": round(time.perf_counter() - start_time, 2),
             },
-            "files_analyzed_list": [
-                os.path.relpath(f, project_path) for f in files_to_analyze[:files_analyzed]
-            ],
+            "files_analyzed_list": analyzed_files,
         }
 
-    def _map_performance_type_to_category(self, issue_type: str) -> str:
-        """
-        Map performance issue types to broader categories.
-        """
-        issue_type_lower = issue_type.lower()
-
-        if any(keyword in issue_type_lower for keyword in ["db", "database", "query", "sql"]):
-            return "database"
-        elif any(keyword in issue_type_lower for keyword in ["algo", "algorithm", "complexity"]):
-            return "algorithm"
-        elif any(keyword in issue_type_lower for keyword in ["memory", "gc", "garbage", "leak"]):
-            return "memory"
-        elif any(
-            keyword in issue_type_lower
-            for keyword in ["thread", "concurrency", "parallel", "async"]
-        ):
-            return "concurrency"
-        elif any(keyword in issue_type_lower for keyword in ["io", "file", "disk"]):
-            return "io"
-        elif any(
-            keyword in issue_type_lower for keyword in ["network", "http", "request", "response"]
-        ):
-            return "network"
-        elif any(keyword in issue_type_lower for keyword in ["render", "ui", "dom", "reflow"]):
-            return "rendering"
-        else:
-            return "general_performance"
-
-    async def _perform_performance_ast_analysis(
-        self, ast_root: Dict[str, Any], file_path: str, language: str, options: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """
-        Perform additional performance-specific AST analysis beyond the rule engine.
-
-        Args:
-            ast_root: Root node of the AST
-            file_path: Path to the analyzed file
-            language: Programming language
-            options: Additional analysis options
-
-        Returns:
-            List of performance hotspots
-        """
-        hotspots = []
-        rel_path = os.path.relpath(file_path)
-
-        # Example: Look for potential N+1 database query patterns
-        if language in ["python", "javascript", "php"]:
-            # This is a simplified example - real detection would be more sophisticated
-            # Search for loops that might contain database queries
-            loop_nodes = find_nodes_by_type(
-                ast_root, ["for_statement", "while_statement", "do_statement"]
-            )
-
-            for loop_node in loop_nodes:
-                loop_start = loop_node.get("start_pos", {}).get("row", 0)
-                loop_end = loop_node.get("end_pos", {}).get("row", 0)
-
-                # Search for database query patterns within the loop
-                # Look for common database method calls
-                db_keywords = ["query", "find", "get", "fetch", "select", "execute", "raw"]
-
-                # Get all nodes within the loop's line range
-                potential_queries = find_nodes_by_property(
-                    ast_root, "start_pos.row", lambda x: x >= loop_start and x <= loop_end
-                )
-
-                for node in potential_queries:
-                    node_text = node.get("text", "").lower()
-                    if any(keyword in node_text for keyword in db_keywords):
-                        # In a real implementation, we would check the context more thoroughly
-                        hotspots.append(
-                            {
-                                "type": "n_plus_one_query",
-                                "file_path": rel_path,
-                                "line": loop_start,
-                                "column": loop_node.get("start_pos", {}).get("column", 0),
-                                "message": "Potential N+1 database query detected inside loop",
-                                "severity": "error",
-                                "category": "performance",
-                                "performance_category": "database",
-                                "performance_impact": "medium",
-                                "recommendation": "Use eager loading or batch fetching to reduce the number of database queries",
-                            }
-                        )
-                        break  # Only report once per loop
-
-        # Example: Look for inefficient algorithm patterns
-        # Search for nested loops (O(n^2) complexity)
-        nested_loops = []
-        loops = find_nodes_by_type(ast_root, ["for_statement", "while_statement"])
-
-        for outer_loop in loops:
-            outer_start = outer_loop.get("start_pos", {}).get("row", 0)
-            outer_end = outer_loop.get("end_pos", {}).get("row", 0)
-
-            for inner_loop in loops:
-                inner_start = inner_loop.get("start_pos", {}).get("row", 0)
-                if inner_start > outer_start and inner_start < outer_end:
-                    # This inner loop is inside the outer loop
-                    hotspots.append(
-                        {
-                            "type": "nested_loops",
-                            "file_path": rel_path,
-                            "line": outer_start,
-                            "column": outer_loop.get("start_pos", {}).get("column", 0),
-                            "message": "Nested loops detected (potential O(n^2) time complexity)",
-                            "severity": "warning",
-                            "category": "performance",
-                            "performance_category": "algorithm",
-                            "performance_impact": "medium",
-                            "recommendation": "Consider using more efficient algorithms or data structures to reduce time complexity",
-                        }
-                    )
-
-        # Example: Look for potential memory issues
-        # Search for large array initializations or repeated string concatenation
-        if language == "javascript":
-            # Check for repeated string concatenation in loops
-            string_concat_patterns = find_nodes_by_type(ast_root, ["binary_expression"])
-            for node in string_concat_patterns:
-                if (
-                    node.get("operator") == "+"
-                    and node.get("left", {}).get("type") == "string_literal"
-                ):
-                    # Check if this is inside a loop
-                    node_line = node.get("start_pos", {}).get("row", 0)
-
-                    for loop in loops:
-                        loop_start = loop.get("start_pos", {}).get("row", 0)
-                        loop_end = loop.get("end_pos", {}).get("row", 0)
-
-                        if node_line >= loop_start and node_line <= loop_end:
-                            hotspots.append(
-                                {
-                                    "type": "string_concatenation_in_loop",
-                                    "file_path": rel_path,
-                                    "line": node_line,
-                                    "column": node.get("start_pos", {}).get("column", 0),
-                                    "message": "Repeated string concatenation detected inside loop (potential memory issue)",
-                                    "severity": "warning",
-                                    "category": "performance",
-                                    "performance_category": "memory",
-                                    "performance_impact": "low",
-                                    "recommendation": "Use StringBuilder or array.join() for more efficient string construction",
-                                }
-                            )
-                            break
-
-        return hotspots
-
     async def _analyze_architecture(
         self, project_path: str, options: Dict[str, Any]
     ) -> Dict[str, Any]:
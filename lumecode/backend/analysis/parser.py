@@ -1,9 +1,16 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Container, Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import logging
 import os
 import re
 import tempfile
 import subprocess
+import sys
+import threading
 import time
 from pathlib import Path
 
@@ -16,8 +23,6 @@ except ImportError:
         "Install it with: pip install tree-sitter"
     )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Define supported languages
@@ -30,76 +35,211 @@ SUPPORTED_LANGUAGES = {
     "rust": ".rs",
 }
 
+# Language of each supported file extension
+EXTENSION_LANGUAGES = {ext: lang for lang, ext in SUPPORTED_LANGUAGES.items()}
+
+# Number of parse_code results kept per parser; the LUMECODE_PARSE_CACHE
+# environment variable overrides it, and 0 disables the cache
+PARSE_CODE_CACHE_SIZE = 1024
+
+# Number of files whose last tree is kept per parser for incremental re-parsing
+TREE_CACHE_SIZE = 64
+
+# Size of the blocks compared at once when looking for the edited region of a file
+_COMPARE_BLOCK_SIZE = 4096
+
+# Node types counted with a compiled tree-sitter query while parsing, by capture name
+NODE_COUNT_TYPES = {
+    "functions": frozenset({"function_definition", "method_definition"}),
+    "classes": frozenset({"class_definition"}),
+    "branches": frozenset(
+        {
+            "if_statement",
+            "for_statement",
+            "while_statement",
+            "switch_statement",
+            "case_statement",
+            "try_statement",
+        }
+    ),
+}
+
 
 class ASTParser:
     """
     A parser for generating ASTs using Tree-sitter.
 
+    A language library is loaded once and kept for the parser's lifetime, so a
+    grammar rebuilt on disk only takes effect in a new parser: long-running
+    processes must create a new parser (or AnalysisEngine), or restart, after
+    rebuilding a grammar outside of _build_language.
+
     Attributes:
-        parser: Tree-sitter parser instance
-        languages: Dictionary of loaded languages
+        parser: Tree-sitter parser instance of the calling thread
+        languages: Dictionary of the languages loaded so far; libraries are loaded on first use
         languages_dir: Directory where language libraries are stored
         logger: Logger instance
     """
 
+    SUPPORTED_LANGUAGES = SUPPORTED_LANGUAGES
+
     def __init__(self, languages_dir: Optional[str] = None):
         """
         Initialize the AST parser.
 
         Args:
             languages_dir: Directory to store language libraries
+        """
+        logger.info("Initializing AST parser")
+
+        # Set up languages directory
+        self.languages_dir = languages_dir or os.path.join(os.path.dirname(__file__), "languages")
+        os.makedirs(self.languages_dir, exist_ok=True)
+
+        # Tree-sitter parsers are created per thread on first use, see _get_parser
+        self._tls = threading.local()
+
+        # Languages are loaded on first use, see _load_language
+        self.languages: Dict[str, Language] = {}
+        self._unavailable_languages: Dict[str, str] = {}
+
+        # Node counting queries, compiled once per language
+        self._count_queries: Dict[str, Any] = {}
+
+        # Versions of the language libraries, see grammar_version
+        self._grammar_versions: Dict[str, str] = {}
+
+        # Least recently used parse_code results, keyed by (language, code).
+        # Shared by all threads, so it is only accessed while holding the lock.
+        self._code_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._code_cache_lock = threading.Lock()
+        self._code_cache_size = _parse_cache_size()
+
+        # Least recently parsed files, with the language version, content, tree
+        # and result of their last parse, so edited files are re-parsed incrementally.
+        # Shared by all threads, so it is only accessed while holding the lock.
+        self._tree_cache: "OrderedDict[str, Tuple[str, bytes, Any, Dict[str, Any]]]" = OrderedDict()
+        self._tree_cache_lock = threading.Lock()
+
+        logger.info(f"Initialized ASTParser with languages dir: {self.languages_dir}")
+
+    def _load_language(self, language: str) -> Language:
+        """
+        Get a Tree-sitter language, loading its library on first use.
+
+        Only the libraries of the languages that are actually parsed get loaded.
+        A library that is missing or fails to load is remembered, so it is not
+        looked up again for every file.
+
+        Args:
+            language: The language to load
+
+        Returns:
+            The loaded language
 
         Raises:
-            ImportError: If Tree-sitter is not installed
+            ValueError: If the language library could not be loaded
         """
+        lang = self.languages.get(language)
+        if lang is not None:
+            return lang
+
+        if language in self._unavailable_languages:
+            raise ValueError(self._unavailable_languages[language])
+
+        lang_path = os.path.join(self.languages_dir, f"{language}.so")
+        if not os.path.exists(lang_path):
+            logger.warning(f"Language library for {language} not found at {lang_path}")
+            # In a real implementation, we would build the language here
+            # self._build_language(language)
+            self._unavailable_languages[language] = f"Language {language} is not loaded"
+            raise ValueError(self._unavailable_languages[language])
+
         try:
-            # Import Tree-sitter modules
-            from tree_sitter import Language, Parser
+            lang = Language(lang_path, language)
+        except Exception as e:
+            logger.error(f"Failed to load language library for {language}: {e}")
+            self._unavailable_languages[language] = f"Language {language} is not loaded: {e}"
+            raise ValueError(self._unavailable_languages[language])
 
-            self.logger = logging.getLogger(__name__)
-            self.logger.info("Initializing AST parser")
+        logger.info(f"Loaded language library for {language}")
+        self.languages[language] = lang
+        return lang
 
-            # Set up languages directory
-            self.languages_dir = languages_dir or os.path.join(
-                os.path.dirname(__file__), "languages"
-            )
-            os.makedirs(self.languages_dir, exist_ok=True)
+    def has_language(self, language: str) -> bool:
+        """
+        Check whether a language is supported and its library can be loaded.
 
-            # Initialize Tree-sitter parser
-            self.parser = Parser()
+        Args:
+            language: The language to check
 
-            # Load languages
-            self.languages: Dict[str, Language] = {}
-            self._init_languages()
+        Returns:
+            True if code in the language can be parsed
+        """
+        if language not in SUPPORTED_LANGUAGES:
+            return False
+        try:
+            self._load_language(language)
+        except ValueError:
+            return False
+        return True
+
+    @property
+    def parser(self) -> Parser:
+        """Tree-sitter parser of the calling thread"""
+        parser = getattr(self._tls, "parser", None)
+        if parser is None:
+            parser = self._tls.parser = Parser()
+            self._tls.language = None
+        return parser
+
+    def _get_parser(self, language: str, lang: Language) -> Parser:
+        """
+        Get the calling thread's tree-sitter parser, set to a language.
 
-            self.logger.info(
-                f"Initialized ASTParser with languages: {', '.join(self.languages.keys())}"
-            )
-        except ImportError as e:
-            logging.error(f"Failed to import Tree-sitter: {e}")
-            raise ImportError(
-                "Tree-sitter is not installed. Please install it with 'pip install tree_sitter'"
-            )
+        Each thread reuses its own parser for every parse, so threads never
+        share parser state. The language is only set when it differs from the
+        one the parser was last used with.
 
-    def _init_languages(self) -> None:
+        Args:
+            language: Name of the language
+            lang: The loaded language
+
+        Returns:
+            The parser, ready to parse the language
         """
-        Initialize Tree-sitter language libraries.
-        If language libraries don't exist, they will be built.
+        parser = self.parser
+        if self._tls.language != language:
+            parser.set_language(lang)
+            self._tls.language = language
+        return parser
+
+    def grammar_version(self, language: str) -> str:
         """
-        # Check for existing language libraries
-        for lang in SUPPORTED_LANGUAGES:
-            lang_path = os.path.join(self.languages_dir, f"{lang}.so")
+        Get the version of a language library.
 
-            if os.path.exists(lang_path):
-                try:
-                    self.languages[lang] = Language(lang_path, lang)
-                    logger.info(f"Loaded language library for {lang}")
-                except Exception as e:
-                    logger.error(f"Failed to load language library for {lang}: {e}")
-            else:
-                logger.warning(f"Language library for {lang} not found at {lang_path}")
-                # In a real implementation, we would build the language here
-                # self._build_language(lang)
+        The version is made of the library's modification time and size, so
+        results cached for a language are invalidated when its library is
+        rebuilt or upgraded. Each library is only looked up once per parser:
+        the version describes the library this parser loads, which it keeps
+        until it is rebuilt with _build_language, so a library replaced on
+        disk is only picked up by a new parser.
+
+        Args:
+            language: The language of the library
+
+        Returns:
+            Version of the library, or an empty string if it does not exist
+        """
+        version = self._grammar_versions.get(language)
+        if version is None:
+            try:
+                stat = os.stat(os.path.join(self.languages_dir, f"{language}.so"))
+                version = f"{stat.st_mtime_ns}-{stat.st_size}"
+            except OSError:
+                version = ""
+            self._grammar_versions[language] = version
+        return version
 
     def _build_language(self, language: str) -> None:
         """
@@ -113,6 +253,13 @@ class ASTParser:
         """
         logger.info(f"Building language library for {language}")
 
+        # Code parsed with the previous library must be parsed again
+        with self._code_cache_lock:
+            self._code_cache.clear()
+        with self._tree_cache_lock:
+            self._tree_cache.clear()
+        self._grammar_versions.pop(language, None)
+
         # Check if the language is supported
         if language not in SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {language}")
@@ -173,12 +320,18 @@ class ASTParser:
             logger.error(f"Exception during language library build: {e}")
             raise Exception(f"Failed to build language library for {language}: {e}")
 
-    def parse_file(self, file_path: str) -> Dict[str, Any]:
+    def parse_file(self, file_path: str, content: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Parse a file and return its AST.
 
+        The last tree of recently parsed files is kept. When such a file is
+        parsed again, tree-sitter re-parses it incrementally from the edited
+        region, and an unchanged file returns a copy of its previous result.
+        The AST itself is shared between the copies and must not be modified.
+
         Args:
             file_path: Path to the file to parse
+            content: Content of the file, if the caller already read it
 
         Returns:
             Dictionary containing the AST and metadata
@@ -188,7 +341,8 @@ class ASTParser:
             ValueError: If the file extension is unsupported or the language is not loaded
             Exception: If parsing fails
         """
-        logger.info(f"Parsing file: {file_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing file: %s", file_path)
 
         file_path = os.path.abspath(file_path)
 
@@ -197,57 +351,93 @@ class ASTParser:
 
         # Determine language from file extension
         ext = os.path.splitext(file_path)[1].lower()
-        language = None
-
-        for lang, lang_ext in SUPPORTED_LANGUAGES.items():
-            if ext == lang_ext:
-                language = lang
-                break
+        language = EXTENSION_LANGUAGES.get(ext)
 
         if not language:
             raise ValueError(f"Unsupported file extension: {ext}")
 
-        if language not in self.languages:
-            raise ValueError(f"Language {language} is not loaded")
+        lang = self._load_language(language)
 
         try:
-            # Set the language for the parser
-            self.parser.set_language(self.languages[language])
-
-            # Read the file content
-            with open(file_path, "rb") as f:
-                content = f.read()
-
-            # Parse the file
-            tree = self.parser.parse(content)
+            parser = self._get_parser(language, lang)
+
+            # Read the file content, unless the caller already did
+            if content is None:
+                content = _read_file(file_path)
+
+            language_version = f"{language}:{self.grammar_version(language)}"
+            with self._tree_cache_lock:
+                cached = self._tree_cache.get(file_path)
+                if cached is not None and cached[0] == language_version:
+                    if cached[1] == content:
+                        self._tree_cache.move_to_end(file_path)
+                        result = cached[3]
+                        return {**result, "metadata": dict(result["metadata"])}
+
+                    # Take the entry out, as its tree is edited in place: another
+                    # thread parsing the same file must not edit or reuse it too
+                    del self._tree_cache[file_path]
+                else:
+                    cached = None
+
+            if cached is not None:
+                # Parse the file, reusing the unchanged parts of its previous tree
+                old_tree = cached[2]
+                _edit_tree(old_tree, cached[1], content)
+                tree = parser.parse(content, old_tree)
+            else:
+                # Parse the file
+                tree = parser.parse(content)
 
             # Convert the tree to a dictionary
-            ast_dict = self._tree_to_dict(tree.root_node)
+            ast_dict = self._tree_to_dict(tree.root_node, content)
+
+            # Add metadata; the line count matches len(readlines()) on the same content
+            line_count = content.count(b"\n")
+            if content and not content.endswith(b"\n"):
+                line_count += 1
 
-            # Add metadata
             metadata = {
                 "file_path": file_path,
                 "language": language,
-                "file_size": os.path.getsize(file_path),
+                "file_size": len(content),
+                "line_count": line_count,
                 "parse_time": time.time(),
+                "grammar_version": self.grammar_version(language),
             }
 
-            return {
+            node_counts = self._count_node_types(tree, language)
+            if node_counts is not None:
+                metadata["node_counts"] = node_counts
+
+            result = {
                 "language": language,
                 "file_path": file_path,
                 "ast": ast_dict,
                 "metadata": metadata,
             }
+
+            with self._tree_cache_lock:
+                self._tree_cache[file_path] = (language_version, content, tree, result)
+                self._tree_cache.move_to_end(file_path)
+                if len(self._tree_cache) > TREE_CACHE_SIZE:
+                    self._tree_cache.popitem(last=False)
+            return {**result, "metadata": dict(metadata)}
         except Exception as e:
-            logger.error(f"Error parsing file {file_path}: {e}")
+            logger.error("Error parsing file %s: %s", file_path, e)
             raise Exception(f"Failed to parse file {file_path}: {e}")
 
-    def parse_code(self, code: str, language: str) -> Dict[str, Any]:
+    def parse_code(self, code: Union[str, bytes], language: str) -> Dict[str, Any]:
         """
         Parse a code string and return its AST.
 
+        The results of recently parsed snippets are kept, so parsing the same
+        code again returns a copy of the cached result without re-parsing it.
+        The AST itself is shared between the copies and must not be modified.
+
         Args:
-            code: The code to parse
+            code: The code to parse, either as a string or as UTF-8 encoded bytes,
+                which are parsed as they are instead of being encoded again
             language: The language of the code
 
         Returns:
@@ -257,162 +447,448 @@ class ASTParser:
             ValueError: If the language is unsupported or not loaded
             Exception: If parsing fails
         """
-        logger.info(f"Parsing code string with language: {language}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing code string with language: %s", language)
 
         if language not in SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {language}")
 
         # Load the language
-        self._load_language(language)
+        lang = self._load_language(language)
 
-        try:
-            # Ensure the language is loaded
-            if language not in self.languages:
-                raise ValueError(f"Language {language} is not loaded")
+        if isinstance(code, (bytearray, memoryview)):
+            # Cache keys must be hashable
+            code = bytes(code)
 
-            # Set the language for the parser
-            self.parser.set_language(self.languages[language])
+        cache_key = (language, code)
+        with self._code_cache_lock:
+            cached = self._code_cache.get(cache_key)
+            if cached is not None:
+                self._code_cache.move_to_end(cache_key)
+        if cached is not None:
+            return {**cached, "metadata": dict(cached["metadata"])}
 
+        try:
             # Parse the code
-            tree = self.parser.parse(bytes(code, "utf-8"))
+            content = code if isinstance(code, bytes) else code.encode("utf-8")
+            tree = self._get_parser(language, lang).parse(content)
 
             # Convert the tree to a dictionary
-            ast_dict = self._tree_to_dict(tree.root_node)
+            ast_dict = self._tree_to_dict(tree.root_node, content)
 
             # Add metadata
-            metadata = {"language": language, "code_length": len(code), "parse_time": time.time()}
+            metadata = {
+                "language": language,
+                "code_length": len(code),
+                "parse_time": time.time(),
+                "grammar_version": self.grammar_version(language),
+            }
 
-            return {"language": language, "ast": ast_dict, "metadata": metadata}
+            result = {"language": language, "ast": ast_dict, "metadata": metadata}
         except Exception as e:
-            logger.error(f"Error parsing code string: {e}")
+            logger.error("Error parsing code string: %s", e)
             raise Exception(f"Failed to parse code string: {e}")
 
-        def _load_language(self, language: str) -> None:
-            """
-            Load a Tree-sitter language if not already loaded.
+        if self._code_cache_size > 0:
+            with self._code_cache_lock:
+                self._code_cache[cache_key] = result
+                if len(self._code_cache) > self._code_cache_size:
+                    self._code_cache.popitem(last=False)
+            return {**result, "metadata": dict(metadata)}
+        return result
 
-            Args:
-                language: The language to load
-            """
-            if language not in self.languages:
-                # Try to build the language library if not available
-                self._build_language(language)
+    def parse_files(
+        self, file_paths: List[str], workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse several files, spreading them across worker processes.
 
-                # Reload languages after building
-                self._init_languages()
+        Tree-sitter parsing and the dict conversion hold the GIL, so the files
+        are parsed in a ProcessPoolExecutor where each worker keeps its own
+        parser. With a single worker or file they are parsed in-process.
 
-                if language not in self.languages:
-                    raise ValueError(f"Failed to load language: {language}")
+        Args:
+            file_paths: Paths to the files to parse
+            workers: Number of worker processes; defaults to the number of CPUs
 
-    def _tree_to_dict(self, node) -> Dict[str, Any]:
+        Returns:
+            The parse result of each file, in the order of file_paths. A file that
+            could not be parsed gets a dictionary with its "error" and "file_path".
         """
-        Convert a Tree-sitter node to a dictionary.
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(file_paths) <= 1:
+            return [_parse_file_safe(self, file_path) for file_path in file_paths]
+
+        # A few chunks per worker keeps the workers busy while amortizing the IPC per file
+        chunksize = max(1, min(32, len(file_paths) // (4 * workers)))
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            return list(
+                executor.map(
+                    _parse_worker, repeat(self.languages_dir), file_paths, chunksize=chunksize
+                )
+            )
+
+    def _get_count_query(self, language: str) -> Any:
+        """
+        Get the compiled query that captures the node types in NODE_COUNT_TYPES.
+
+        Node types that the language's grammar does not define are left out of
+        the query, since tree-sitter rejects queries with unknown node types.
 
         Args:
-            node: The Tree-sitter node to convert
+            language: The language of the query
 
         Returns:
-            The node as a dictionary with comprehensive information
+            The compiled query, or None if the grammar defines none of the node types
         """
-        result = {
-            "type": node.type,
-            "start_pos": {"row": node.start_point[0], "column": node.start_point[1]},
-            "end_pos": {"row": node.end_point[0], "column": node.end_point[1]},
-            "start_byte": node.start_byte,
-            "end_byte": node.end_byte,
-            "children": [],
-            "named": node.is_named,
-            "has_changes": node.has_changes,
-        }
+        if language in self._count_queries:
+            return self._count_queries[language]
+
+        lang = self.languages[language]
+        patterns = []
+        for capture, node_types in NODE_COUNT_TYPES.items():
+            for node_type in sorted(node_types):
+                try:
+                    lang.query(f"({node_type})")
+                except Exception:
+                    continue
+                patterns.append(f"({node_type}) @{capture}")
+
+        query = lang.query("\n".join(patterns)) if patterns else None
+        self._count_queries[language] = query
+        return query
+
+    def _count_node_types(self, tree, language: str) -> Optional[Dict[str, int]]:
+        """
+        Count the nodes of each NODE_COUNT_TYPES group with a compiled query.
 
-        # Add text content for all nodes
+        The query runs natively over the tree-sitter tree, so callers do not
+        need to walk the converted AST to count these nodes.
+
+        Args:
+            tree: The parsed tree-sitter tree
+            language: The language of the tree
+
+        Returns:
+            Node count per group, or None if the query could not be run
+        """
         try:
-            if hasattr(node, "text") and node.text:
-                result["text"] = (
-                    node.text.decode("utf-8") if isinstance(node.text, bytes) else str(node.text)
-                )
+            counts = dict.fromkeys(NODE_COUNT_TYPES, 0)
+            query = self._get_count_query(language)
+            if query is None:
+                return counts
+
+            captures = query.captures(tree.root_node)
+            if isinstance(captures, dict):
+                for capture, nodes in captures.items():
+                    counts[capture] = len(nodes)
             else:
-                result["text"] = ""
+                for _, capture in captures:
+                    counts[capture] += 1
+            return counts
         except Exception as e:
-            logger.warning(f"Error decoding node text: {e}")
-            result["text"] = ""
+            logger.warning(f"Failed to count {language} nodes with a query: {e}")
+            return None
 
-        # Add children recursively
-        if hasattr(node, "children") and node.children:
-            for child in node.children:
-                try:
-                    result["children"].append(self._tree_to_dict(child))
-                except Exception as e:
-                    logger.warning(f"Error converting child node: {e}")
-                    # Add minimal information about the child node
-                    result["children"].append(
-                        {
-                            "type": "error_node",
-                            "error_message": str(e),
-                            "start_pos": {
-                                "row": getattr(child, "start_point", (0, 0))[0],
-                                "column": getattr(child, "start_point", (0, 0))[1],
-                            },
-                            "end_pos": {
-                                "row": getattr(child, "end_point", (0, 0))[0],
-                                "column": getattr(child, "end_point", (0, 0))[1],
-                            },
-                            "start_byte": getattr(child, "start_byte", 0),
-                            "end_byte": getattr(child, "end_byte", 0),
-                            "children": [],
-                            "named": getattr(child, "is_named", False),
-                            "text": "",
-                        }
+    def _tree_to_dict(self, node, content: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        Convert a Tree-sitter node to a dictionary.
+
+        The tree is walked with a TreeCursor and an explicit stack of the
+        dictionaries being filled, so there is no Python call per node and deep
+        trees cannot hit the recursion limit.
+
+        When the source is given, node text is sliced from it instead of being
+        copied out of the tree and decoded node by node. ASCII source, where
+        byte offsets are character offsets, is decoded only once.
+
+        Node positions ("start_pos" and "end_pos") are (row, column) tuples;
+        they come back as lists from the JSON cache. Node types, grammar names
+        and field names are interned, so the few distinct names are shared by
+        all nodes and compare by identity.
+
+        Args:
+            node: The Tree-sitter node to convert
+            content: Source the node was parsed from, if available
+
+        Returns:
+            The node as a dictionary with comprehensive information
+        """
+        # The optional node attributes depend on the binding version, not the node
+        has_text = hasattr(node, "text")
+        has_grammar_name = hasattr(node, "grammar_name")
+        has_field_name = hasattr(node, "field_name")
+        source_text = content.decode("ascii") if content is not None and content.isascii() else None
+        intern = sys.intern
+
+        def convert(node) -> Dict[str, Any]:
+            try:
+                start_row, start_column = node.start_point
+                end_row, end_column = node.end_point
+                result = {
+                    "type": intern(node.type),
+                    "start_pos": (start_row, start_column),
+                    "end_pos": (end_row, end_column),
+                    "start_byte": node.start_byte,
+                    "end_byte": node.end_byte,
+                    "children": [],
+                    "named": node.is_named,
+                    "has_changes": node.has_changes,
+                }
+            except Exception as e:
+                logger.warning("Error converting child node: %s", e)
+                # Add minimal information about the child node
+                start_point = getattr(node, "start_point", (0, 0))
+                end_point = getattr(node, "end_point", (0, 0))
+                return {
+                    "type": "error_node",
+                    "error_message": str(e),
+                    "start_pos": (start_point[0], start_point[1]),
+                    "end_pos": (end_point[0], end_point[1]),
+                    "start_byte": getattr(node, "start_byte", 0),
+                    "end_byte": getattr(node, "end_byte", 0),
+                    "children": [],
+                    "named": getattr(node, "is_named", False),
+                    "text": "",
+                }
+
+            # Add text content for all nodes
+            try:
+                if source_text is not None:
+                    result["text"] = source_text[result["start_byte"] : result["end_byte"]]
+                elif content is not None:
+                    result["text"] = content[result["start_byte"] : result["end_byte"]].decode(
+                        "utf-8"
                     )
+                else:
+                    text = node.text if has_text else None
+                    if text:
+                        result["text"] = (
+                            text.decode("utf-8") if isinstance(text, bytes) else str(text)
+                        )
+                    else:
+                        result["text"] = ""
+            except Exception as e:
+                logger.warning("Error decoding node text: %s", e)
+                result["text"] = ""
+
+            # Add additional properties if available
+            if has_grammar_name:
+                result["grammar_name"] = intern(node.grammar_name)
+
+            if has_field_name:
+                field_name = node.field_name
+                result["field_name"] = intern(field_name) if field_name is not None else None
+
+            return result
+
+        root = convert(node)
+        cursor = node.walk()
+        # Dictionaries of the cursor's node and its ancestors
+        stack = [root]
+
+        while True:
+            if cursor.goto_first_child():
+                child = convert(cursor.node)
+                stack[-1]["children"].append(child)
+                stack.append(child)
+                continue
+
+            # Climb until a node has a next sibling; the cursor cannot leave the root
+            while True:
+                stack.pop()
+                if not stack:
+                    return root
+                if cursor.goto_next_sibling():
+                    sibling = convert(cursor.node)
+                    stack[-1]["children"].append(sibling)
+                    stack.append(sibling)
+                    break
+                cursor.goto_parent()
+
+
+def _parse_cache_size() -> int:
+    """Get the number of parse_code results to keep, from LUMECODE_PARSE_CACHE if set"""
+    value = os.environ.get("LUMECODE_PARSE_CACHE")
+    if value is None:
+        return PARSE_CODE_CACHE_SIZE
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid LUMECODE_PARSE_CACHE value %r, using %d",
+            value,
+            PARSE_CODE_CACHE_SIZE,
+        )
+        return PARSE_CODE_CACHE_SIZE
+
+
+def _read_file(file_path: str) -> bytes:
+    """
+    Read the whole content of a file with as few system calls as possible.
 
-        # Add additional properties if available
-        if hasattr(node, "grammar_name"):
-            result["grammar_name"] = node.grammar_name
+    The file is read from a raw file descriptor in a single read of its size,
+    without the buffering layer of open(), and the kernel is told the file will
+    be read sequentially so it can read ahead on slow filesystems.
 
-        if hasattr(node, "field_name"):
-            result["field_name"] = node.field_name
+    Args:
+        file_path: Path to the file
 
-        return result
+    Returns:
+        The file content
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        size = os.fstat(fd).st_size
+        chunks = []
+        # Reads can be short, and the file may have grown since fstat
+        while True:
+            chunk = os.read(fd, max(size, 1))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    """Get the length of the common prefix of two byte strings"""
+    limit = min(len(a), len(b))
+    start = 0
+    # Skip equal blocks with C-level comparisons before comparing byte by byte
+    while (
+        start < limit
+        and a[start : start + _COMPARE_BLOCK_SIZE] == b[start : start + _COMPARE_BLOCK_SIZE]
+    ):
+        start += _COMPARE_BLOCK_SIZE
+    start = min(start, limit)
+    end = min(start + _COMPARE_BLOCK_SIZE, limit)
+    while start < end and a[start] == b[start]:
+        start += 1
+    return start
+
+
+def _byte_point(content: bytes, offset: int) -> Tuple[int, int]:
+    """Get the (row, column) point of a byte offset, as tree-sitter counts them"""
+    row = content.count(b"\n", 0, offset)
+    return row, offset - (content.rfind(b"\n", 0, offset) + 1)
+
+
+def _edit_tree(tree: Any, old_content: bytes, new_content: bytes) -> None:
+    """
+    Record on a tree the edit that turned its content into new content.
+
+    The edit is the single region between the common prefix and the common
+    suffix of both contents, which covers any set of changes.
+
+    Args:
+        tree: Tree parsed from old_content
+        old_content: Content the tree was parsed from
+        new_content: Edited content
+    """
+    start = _common_prefix_length(old_content, new_content)
+    suffix = _common_prefix_length(old_content[start:][::-1], new_content[start:][::-1])
+    old_end = len(old_content) - suffix
+    new_end = len(new_content) - suffix
+
+    tree.edit(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_byte_point(old_content, start),
+        old_end_point=_byte_point(old_content, old_end),
+        new_end_point=_byte_point(new_content, new_end),
+    )
+
+
+@lru_cache(maxsize=None)
+def _worker_parser(languages_dir: str) -> ASTParser:
+    """Get the parser of a pool worker process, built on its first file"""
+    return ASTParser(languages_dir)
+
+
+def _parse_file_safe(parser: ASTParser, file_path: str) -> Dict[str, Any]:
+    """Parse a file, returning the error instead of raising it"""
+    try:
+        return parser.parse_file(file_path)
+    except Exception as e:
+        return {"error": str(e), "file_path": file_path}
+
+
+def _parse_worker(languages_dir: str, file_path: str) -> Dict[str, Any]:
+    """Parse a file in a pool worker process"""
+    return _parse_file_safe(_worker_parser(languages_dir), file_path)
 
 
 # Helper functions for working with ASTs
 
 
+def iter_nodes_by_type(
+    ast_dict: Dict[str, Any], node_types: Union[str, Container[str]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily iterate over the nodes of specific types in the AST.
+
+    Nodes are yielded in document order, the same order as find_nodes_by_type,
+    without building a list of them first. The AST is walked with an explicit
+    stack, so deeply nested ASTs do not hit the recursion limit.
+
+    Args:
+        ast_dict: The AST dictionary
+        node_types: The type or types of nodes to find; pass a set or frozenset
+            for constant-time membership tests on large ASTs
+
+    Yields:
+        Nodes matching the type(s)
+    """
+    # Normalize node_types to a set
+    if isinstance(node_types, str):
+        node_types = {node_types}
+
+    # Handle different AST formats
+    if isinstance(ast_dict.get("ast"), dict):
+        # For the format returned by parse_file and parse_code
+        ast_dict = ast_dict["ast"]
+
+    stack = [ast_dict]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        if node["type"] in node_types:
+            yield node
+
+        children = node.get("children")
+        if children:
+            # Reversed so the first child is visited next
+            extend(reversed(children))
+
+
 def find_nodes_by_type(
-    ast_dict: Dict[str, Any], node_types: Union[str, List[str]]
+    ast_dict: Dict[str, Any], node_types: Union[str, Container[str]]
 ) -> List[Dict[str, Any]]:
     """
     Find all nodes of specific types in the AST.
 
     Args:
         ast_dict: The AST dictionary
-        node_types: The type or types of nodes to find
+        node_types: The type or types of nodes to find; pass a set or frozenset
+            for constant-time membership tests on large ASTs
 
     Returns:
         List of nodes matching the type(s)
     """
-    result = []
+    return list(iter_nodes_by_type(ast_dict, node_types))
 
-    # Normalize node_types to a list
-    if isinstance(node_types, str):
-        node_types = [node_types]
-
-    def _find_nodes(node):
-        if node["type"] in node_types:
-            result.append(node)
-
-        for child in node.get("children", []):
-            _find_nodes(child)
-
-    # Handle different AST formats
-    if isinstance(ast_dict.get("ast"), dict):
-        # For the format returned by parse_file and parse_code
-        _find_nodes(ast_dict["ast"])
-    else:
-        # For direct AST dictionary
-        _find_nodes(ast_dict)
 
-    return result
+@lru_cache(maxsize=512)
+def _compile_text_pattern(text: str, case_sensitive: bool) -> re.Pattern:
+    """Compile a literal text pattern, reusing the regex of recently searched patterns"""
+    return re.compile(re.escape(text), 0 if case_sensitive else re.IGNORECASE)
 
 
 def find_nodes_by_text(
@@ -433,8 +909,7 @@ def find_nodes_by_text(
 
     # Compile regex if needed
     if isinstance(text_pattern, str):
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.compile(re.escape(text_pattern), flags)
+        pattern = _compile_text_pattern(text_pattern, case_sensitive)
     else:
         # Assume it's already a compiled regex pattern
         pattern = text_pattern
@@ -462,6 +937,130 @@ def find_nodes_by_text(
     return result
 
 
+def find_nodes_by_text_batch(
+    ast_dict: Dict[str, Any], text_patterns: Iterable[str], case_sensitive: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Find the nodes containing each of several literal text patterns in one pass.
+
+    When the root node carries its (ASCII) source text and byte offsets, the
+    occurrences of every pattern are found with a single scan of that text and
+    each node is matched by checking whether an occurrence falls within its
+    byte range; subtrees without any occurrence are skipped entirely.
+    Otherwise all patterns are compiled into a single regex alternation that is
+    used to reject non-matching nodes with one scan per node; only nodes that
+    contain at least one pattern are checked against the individual patterns.
+
+    Args:
+        ast_dict: The AST dictionary
+        text_patterns: The literal text patterns to search for
+        case_sensitive: Whether the search should be case-sensitive
+
+    Returns:
+        Dictionary mapping each pattern to the list of nodes containing it
+    """
+    patterns = list(dict.fromkeys(text_patterns))
+    result: Dict[str, List[Dict[str, Any]]] = {pattern: [] for pattern in patterns}
+    if not patterns:
+        return result
+
+    needles = [(pattern, pattern if case_sensitive else pattern.lower()) for pattern in patterns]
+    root = ast_dict["ast"] if isinstance(ast_dict.get("ast"), dict) else ast_dict
+
+    occurrences = _source_occurrences(root, needles, case_sensitive)
+    if occurrences is not None:
+        if not occurrences:
+            return result
+
+        # Match nodes by byte range against the occurrences in the root's source
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            start = node.get("start_byte")
+            end = node.get("end_byte")
+            if start is None or end is None:
+                text = node.get("text")
+                if text:
+                    haystack = text if case_sensitive else text.lower()
+                    for pattern, needle in needles:
+                        if needle in haystack:
+                            result[pattern].append(node)
+            else:
+                matched = False
+                for pattern, (starts, length) in occurrences.items():
+                    index = bisect_left(starts, start)
+                    if index < len(starts) and starts[index] + length <= end:
+                        result[pattern].append(node)
+                        matched = True
+                if not matched:
+                    # No occurrence falls within the node, so none falls within its descendants
+                    continue
+
+            children = node.get("children")
+            if children:
+                stack.extend(reversed(children))
+        return result
+
+    flags = 0 if case_sensitive else re.IGNORECASE
+    combined = re.compile("|".join(re.escape(pattern) for pattern in patterns), flags)
+
+    def _find_nodes(node):
+        text = node.get("text")
+        if text and combined.search(text):
+            haystack = text if case_sensitive else text.lower()
+            for pattern, needle in needles:
+                if needle in haystack:
+                    result[pattern].append(node)
+
+        for child in node.get("children", []):
+            _find_nodes(child)
+
+    _find_nodes(root)
+    return result
+
+
+def _source_occurrences(
+    root: Dict[str, Any], needles: List[Tuple[str, str]], case_sensitive: bool
+) -> Optional[Dict[str, Tuple[List[int], int]]]:
+    """
+    Find the byte offsets of the occurrences of each needle in the root's source text.
+
+    Args:
+        root: The root node of the AST
+        needles: (pattern, needle) pairs, with needles lowercased for case-insensitive searches
+        case_sensitive: Whether the search is case-sensitive
+
+    Returns:
+        Dictionary mapping each pattern that occurs to the sorted start offsets
+        of its (possibly overlapping) occurrences and its length, or None if
+        the root's text cannot be mapped to byte offsets
+    """
+    source = root.get("text")
+    base = root.get("start_byte")
+    if not source or base is None or not source.isascii():
+        return None
+    # ASCII text has one byte per character, so text offsets map to byte offsets
+    if root.get("end_byte") != base + len(source):
+        return None
+    if any(not needle for _, needle in needles):
+        return None
+
+    haystack = source if case_sensitive else source.lower()
+    occurrences = {}
+    for pattern, needle in needles:
+        if not needle.isascii():
+            # Non-ASCII needles cannot occur in ASCII text
+            continue
+        starts = []
+        index = haystack.find(needle)
+        while index != -1:
+            starts.append(base + index)
+            index = haystack.find(needle, index + 1)
+        if starts:
+            occurrences[pattern] = (starts, len(needle))
+    return occurrences
+
+
 def find_nodes_by_property(
     ast_dict: Dict[str, Any], property_name: str, property_value: Union[str, int, bool, re.Pattern]
 ) -> List[Dict[str, Any]]:
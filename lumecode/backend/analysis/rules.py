@@ -1,10 +1,92 @@
 from enum import Enum
-from typing import Dict, List, Any, Callable, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Any, Callable, Optional, Tuple, Union
+from functools import lru_cache
+from heapq import merge
+from operator import itemgetter
+import hashlib
+import inspect
 import re
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# Nodes of an AST by type, each with its position in document order
+TypeIndex = Dict[str, List[Tuple[int, Dict[str, Any]]]]
+
+
+def _build_type_index(ast_node: Dict[str, Any]) -> TypeIndex:
+    """Index the nodes of an AST by type in a single walk
+
+    Args:
+        ast_node: Root node of the AST
+
+    Returns:
+        The nodes of each type, with their position in document order
+    """
+    type_index: TypeIndex = {}
+    position = 0
+    stack = [ast_node]
+    while stack:
+        node = stack.pop()
+        bucket = type_index.get(node.get("type"))
+        if bucket is None:
+            bucket = type_index[node.get("type")] = []
+        bucket.append((position, node))
+        position += 1
+
+        children = node.get("children")
+        if children:
+            # Reversed so the first child is visited next
+            stack.extend(reversed(children))
+
+    return type_index
+
+
+def _indexed_nodes(type_index: TypeIndex, node_types: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Iterate over the indexed nodes of some types, in document order"""
+    buckets = [type_index[node_type] for node_type in node_types if node_type in type_index]
+    if len(buckets) == 1:
+        return (node for _, node in buckets[0])
+    return (node for _, node in merge(*buckets, key=itemgetter(0)))
+
+
+@lru_cache(maxsize=256)
+def _function_code_fingerprint(fn: Callable) -> str:
+    """Identify a function's code by its qualified name and source
+
+    Functions whose source is unavailable are identified by their bytecode
+    and constants instead, so editing them still changes the fingerprint.
+    """
+    name = getattr(fn, "__qualname__", type(fn).__qualname__)
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        code = getattr(fn, "__code__", None)
+        source = f"{code.co_code.hex()}:{code.co_consts!r}" if code is not None else repr(fn)
+    return f"{getattr(fn, '__module__', '')}.{name}:{source}"
+
+
+def _function_fingerprint(fn: Callable) -> str:
+    """Identify a rule's evaluation function by its code and the values it captures
+
+    Functions built from the same source by a factory or lambda differ only in
+    their closure cells and defaults, so their values are part of the fingerprint.
+    """
+    captured = []
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            captured.append(repr(cell.cell_contents))
+        except ValueError:
+            # Empty cell
+            captured.append("<empty>")
+    defaults = getattr(fn, "__defaults__", None)
+    kwdefaults = getattr(fn, "__kwdefaults__", None)
+    return (
+        f"{_function_code_fingerprint(fn)}:"
+        f"{'|'.join(captured)}:{defaults!r}:{sorted(kwdefaults.items()) if kwdefaults else ''}"
+    )
+
 
 class RuleSeverity(Enum):
     INFO = "info"
@@ -21,7 +103,14 @@ class RuleCategory(Enum):
 
 
 class Rule:
-    """Base class for all rules"""
+    """Base class for all rules
+
+    A rule applies to every language unless it is restricted to the languages
+    given in `languages`. Rules that set `uses_type_index` accept the node type
+    index the engine builds once per AST, instead of walking the AST themselves.
+    """
+
+    uses_type_index = False
 
     def __init__(
         self,
@@ -30,13 +119,29 @@ class Rule:
         description: str,
         category: RuleCategory,
         severity: RuleSeverity,
+        languages: Optional[Iterable[str]] = None,
     ):
         self.rule_id = rule_id
         self.name = name
         self.description = description
         self.category = category
         self.severity = severity
-        self.enabled = True
+        self.languages = frozenset(languages) if languages is not None else None
+        self._enabled = True
+        # Engines holding the rule, whose version changes when the rule is toggled
+        self._engines: "weakref.WeakSet[RuleEngine]" = weakref.WeakSet()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the rule is evaluated"""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        if enabled != self._enabled:
+            self._enabled = enabled
+            for engine in self._engines:
+                engine._version = None
 
     def evaluate(self, ast_node: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Evaluate the rule against an AST node
@@ -50,6 +155,18 @@ class Rule:
         """
         raise NotImplementedError("Subclasses must implement evaluate()")
 
+    def fingerprint(self) -> str:
+        """Describe everything the rule's results depend on
+
+        Returns:
+            String that changes whenever the rule could report different issues
+        """
+        languages = ",".join(sorted(self.languages)) if self.languages is not None else "*"
+        return (
+            f"{self.rule_id}:{self.name}:{self.category.value}:{self.severity.value}:{languages}:"
+            f"{_function_fingerprint(type(self).evaluate)}"
+        )
+
     def format_issue(
         self, node: Dict[str, Any], message: str, context: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -80,6 +197,73 @@ class Rule:
         }
 
 
+# Predicate over an AST node or property value
+Matcher = Callable[[Any], bool]
+
+
+def _compile_value(value: Any) -> Matcher:
+    """Compile a pattern value into a predicate over a node property value
+
+    Dicts match dict properties recursively, lists match lists of the same
+    length item by item, regexes search string properties and other values
+    are compared for equality.
+
+    Args:
+        value: The pattern value
+
+    Returns:
+        A predicate over the property value
+    """
+    if isinstance(value, dict):
+        match_dict = _compile_pattern(value)
+        return lambda item: isinstance(item, dict) and match_dict(item)
+
+    if isinstance(value, list):
+        length = len(value)
+        item_matchers = [_compile_value(item) for item in value]
+        return lambda items: (
+            isinstance(items, list)
+            and len(items) == length
+            and all(match(item) for match, item in zip(item_matchers, items))
+        )
+
+    if isinstance(value, re.Pattern):
+        search = value.search
+        return lambda item: isinstance(item, str) and search(item) is not None
+
+    return lambda item: item == value
+
+
+def _compile_pattern(pattern: Dict[str, Any]) -> Matcher:
+    """Compile a rule pattern into a predicate over AST nodes
+
+    The type dispatch over the pattern is done once here instead of at every
+    node the pattern is matched against.
+
+    Args:
+        pattern: The pattern; every key must be present in a matching node
+            with a matching value, except "type", which is compared with the
+            node's type
+
+    Returns:
+        A predicate over AST nodes
+    """
+    matchers = []
+    for key, value in pattern.items():
+        if key == "type":
+            matchers.append(lambda node, node_type=value: node.get("type") == node_type)
+            continue
+
+        match_value = _compile_value(value)
+        matchers.append(
+            lambda node, key=key, match_value=match_value: key in node and match_value(node[key])
+        )
+
+    if len(matchers) == 1:
+        return matchers[0]
+    return lambda node: all(match(node) for match in matchers)
+
+
 class PatternRule(Rule):
     """Rule that matches patterns in the AST"""
 
@@ -92,68 +276,60 @@ class PatternRule(Rule):
         severity: RuleSeverity,
         node_type: str,
         pattern: Dict[str, Any],
+        languages: Optional[Iterable[str]] = None,
     ):
-        super().__init__(rule_id, name, description, category, severity)
+        super().__init__(rule_id, name, description, category, severity, languages)
         self.node_type = node_type
         self.pattern = pattern
+        self._matcher = _compile_pattern(pattern)
+
+    uses_type_index = True
+
+    def evaluate(
+        self,
+        ast_node: Dict[str, Any],
+        context: Dict[str, Any],
+        type_index: Optional[TypeIndex] = None,
+    ) -> List[Dict[str, Any]]:
+        # Only nodes of the pattern's type can match, so look them up in the index
+        node_type = self.pattern.get("type")
+        if type_index is not None and isinstance(node_type, str):
+            message = f"{self.name}: Found pattern match"
+            return [
+                self.format_issue(node, message, context)
+                for node in _indexed_nodes(type_index, (node_type,))
+                if self._match_node(node)
+            ]
 
-    def evaluate(self, ast_node: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
         issues = []
+        self._evaluate_into(ast_node, context, issues, f"{self.name}: Found pattern match")
+        return issues
 
+    def _evaluate_into(
+        self, ast_node: Dict[str, Any], context: Dict[str, Any], issues: List, message: str
+    ) -> None:
+        """Append the issues of an AST node and its descendants to a shared list"""
         # Check if this node matches the pattern
-        if self._match_node(ast_node, self.pattern):
-            message = f"{self.name}: Found pattern match"
+        if self._match_node(ast_node):
             issues.append(self.format_issue(ast_node, message, context))
 
         # Recursively check children
-        if "children" in ast_node:
-            for child in ast_node["children"]:
-                issues.extend(self.evaluate(child, context))
+        for child in ast_node.get("children", ()):
+            self._evaluate_into(child, context, issues, message)
 
-        return issues
+    def fingerprint(self) -> str:
+        return f"{super().fingerprint()}:{self.node_type}:{self.pattern!r}"
 
-    def _match_node(self, node: Dict[str, Any], pattern: Dict[str, Any]) -> bool:
-        """Check if a node matches a pattern
+    def _match_node(self, node: Dict[str, Any]) -> bool:
+        """Check if a node matches the rule's pattern
 
         Args:
             node: The AST node to check
-            pattern: The pattern to match
 
         Returns:
             True if the node matches the pattern, False otherwise
         """
-        # Check node type
-        if "type" in pattern and node.get("type") != pattern["type"]:
-            return False
-
-        # Check other properties
-        for key, value in pattern.items():
-            if key == "type":
-                continue
-
-            if key not in node:
-                return False
-
-            if isinstance(value, dict):
-                if not isinstance(node[key], dict):
-                    return False
-                if not self._match_node(node[key], value):
-                    return False
-            elif isinstance(value, list):
-                if not isinstance(node[key], list):
-                    return False
-                if len(value) != len(node[key]):
-                    return False
-                for i, item in enumerate(value):
-                    if isinstance(item, dict):
-                        if not self._match_node(node[key][i], item):
-                            return False
-                    elif node[key][i] != item:
-                        return False
-            elif node[key] != value:
-                return False
-
-        return True
+        return self._matcher(node)
 
 
 class FunctionRule(Rule):
@@ -168,14 +344,36 @@ class FunctionRule(Rule):
         severity: RuleSeverity,
         node_types: List[str],
         evaluation_fn: Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]],
+        languages: Optional[Iterable[str]] = None,
     ):
-        super().__init__(rule_id, name, description, category, severity)
+        super().__init__(rule_id, name, description, category, severity, languages)
         self.node_types = node_types
         self.evaluation_fn = evaluation_fn
 
-    def evaluate(self, ast_node: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    uses_type_index = True
+
+    def evaluate(
+        self,
+        ast_node: Dict[str, Any],
+        context: Dict[str, Any],
+        type_index: Optional[TypeIndex] = None,
+    ) -> List[Dict[str, Any]]:
+        if type_index is not None:
+            issues = []
+            for node in _indexed_nodes(type_index, dict.fromkeys(self.node_types)):
+                message = self.evaluation_fn(node, context)
+                if message:
+                    issues.append(self.format_issue(node, message, context))
+            return issues
+
         issues = []
+        self._evaluate_into(ast_node, context, issues)
+        return issues
 
+    def _evaluate_into(
+        self, ast_node: Dict[str, Any], context: Dict[str, Any], issues: List
+    ) -> None:
+        """Append the issues of an AST node and its descendants to a shared list"""
         # Check if this node is of a type we're interested in
         if ast_node.get("type") in self.node_types:
             # Call the evaluation function
@@ -184,11 +382,12 @@ class FunctionRule(Rule):
                 issues.append(self.format_issue(ast_node, message, context))
 
         # Recursively check children
-        if "children" in ast_node:
-            for child in ast_node["children"]:
-                issues.extend(self.evaluate(child, context))
+        for child in ast_node.get("children", ()):
+            self._evaluate_into(child, context, issues)
 
-        return issues
+    def fingerprint(self) -> str:
+        node_types = ",".join(self.node_types)
+        return f"{super().fingerprint()}:{node_types}:{_function_fingerprint(self.evaluation_fn)}"
 
 
 class RuleEngine:
@@ -196,6 +395,10 @@ class RuleEngine:
 
     def __init__(self):
         self.rules = []
+        # Rules applicable to each language, built on first lookup
+        self._lang_index: Dict[str, Tuple[Rule, ...]] = {}
+        # Version of the enabled rule set, computed on first access
+        self._version: Optional[str] = None
 
     def add_rule(self, rule: Rule):
         """Add a rule to the engine
@@ -204,6 +407,9 @@ class RuleEngine:
             rule: The rule to add
         """
         self.rules.append(rule)
+        rule._engines.add(self)
+        self._lang_index.clear()
+        self._version = None
 
     def add_rules(self, rules: List[Rule]):
         """Add multiple rules to the engine
@@ -212,10 +418,51 @@ class RuleEngine:
             rules: The rules to add
         """
         self.rules.extend(rules)
+        for rule in rules:
+            rule._engines.add(self)
+        self._lang_index.clear()
+        self._version = None
+
+    def rules_for_language(self, language: str) -> Tuple[Rule, ...]:
+        """Get the rules that apply to a language
+
+        Args:
+            language: The language to look up
+
+        Returns:
+            The rules that apply to the language, in the order they were added
+        """
+        rules = self._lang_index.get(language)
+        if rules is None:
+            rules = tuple(
+                rule for rule in self.rules if rule.languages is None or language in rule.languages
+            )
+            self._lang_index[language] = rules
+        return rules
+
+    @property
+    def version(self) -> str:
+        """Identifier of the enabled rule set, used to key cached rule results
+
+        The version is computed once and recomputed after rules are added or
+        enabled or disabled.
+
+        Returns:
+            Hex digest of the fingerprints of the enabled rules, so changing a
+            rule's pattern, function, severity or languages changes it too
+        """
+        if self._version is None:
+            fingerprints = "\n".join(rule.fingerprint() for rule in self.rules if rule.enabled)
+            self._version = hashlib.blake2b(fingerprints.encode("utf-8"), digest_size=8).hexdigest()
+        return self._version
 
     def evaluate(self, ast_node: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Evaluate all rules against an AST node
 
+        When the context names a language, only the rules that apply to it are
+        evaluated. The nodes are indexed by type once, so the rules that use the
+        index only visit the nodes of their types instead of walking the AST.
+
         Args:
             ast_node: The AST node to evaluate
             context: Additional context information
@@ -225,10 +472,19 @@ class RuleEngine:
         """
         issues = []
 
-        for rule in self.rules:
+        language = context.get("language")
+        rules = self.rules_for_language(language) if language else self.rules
+
+        type_index = None
+        for rule in rules:
             if rule.enabled:
                 try:
-                    rule_issues = rule.evaluate(ast_node, context)
+                    if rule.uses_type_index:
+                        if type_index is None:
+                            type_index = _build_type_index(ast_node)
+                        rule_issues = rule.evaluate(ast_node, context, type_index)
+                    else:
+                        rule_issues = rule.evaluate(ast_node, context)
                     issues.extend(rule_issues)
                 except Exception as e:
                     logger.error(f"Error evaluating rule {rule.rule_id}: {e}")
@@ -1,15 +1,25 @@
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple, Type
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from abc import ABC, abstractmethod
+import copy
 import os
 import importlib.util
 import sys
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of threads preparing plugins in load_all_plugins
+PREPARE_WORKERS = 8
+
 
 class PluginInterface(ABC):
     """
@@ -55,6 +65,23 @@ class PluginInterface(ABC):
         pass
 
 
+def _find_plugin_class(module: Any) -> Optional[Type[PluginInterface]]:
+    """
+    Find the class implementing PluginInterface in a plugin module.
+
+    Args:
+        module: Imported plugin module
+
+    Returns:
+        The plugin class or None if the module has none
+    """
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if isinstance(attr, type) and issubclass(attr, PluginInterface) and attr != PluginInterface:
+            return attr
+    return None
+
+
 class PluginManager:
     """
     Manager for loading, registering, and executing plugins.
@@ -64,99 +91,186 @@ class PluginManager:
         self.plugin_dir = plugin_dir or os.path.join(os.path.dirname(__file__), "installed")
         self.plugins: Dict[str, PluginInterface] = {}
         self.plugin_configs: Dict[str, Dict[str, Any]] = {}
+        # Plugin names found by the last discovery, the paths of their modules, and
+        # parsed config files by path
+        self._discovery_cache: Optional[List[str]] = None
+        self._manifest: Dict[str, str] = {}
+        self._config_cache: Dict[str, Dict[str, Any]] = {}
         logger.info(f"Initialized PluginManager with plugin directory: {self.plugin_dir}")
 
-    def discover_plugins(self) -> List[str]:
+    def discover_plugins(self, refresh: bool = False) -> List[str]:
         """
         Discover available plugins in the plugin directory.
 
+        The plugin directory is only scanned on the first call; later calls
+        return the plugins found then, until the cache is invalidated. The
+        module path of each plugin is recorded, so discovered plugins can be
+        loaded on first use without looking them up again.
+
+        Args:
+            refresh: Whether to scan the plugin directory again
+
         Returns:
             List of plugin names found
         """
-        if not os.path.exists(self.plugin_dir):
-            logger.warning(f"Plugin directory does not exist: {self.plugin_dir}")
-            return []
+        if self._discovery_cache is not None and not refresh:
+            return list(self._discovery_cache)
 
         plugin_names = []
+        manifest = {}
 
-        # Look for Python modules in the plugin directory
-        for item in os.listdir(self.plugin_dir):
-            if os.path.isdir(os.path.join(self.plugin_dir, item)) and os.path.exists(
-                os.path.join(self.plugin_dir, item, "__init__.py")
-            ):
-                plugin_names.append(item)
-            elif item.endswith(".py") and item != "__init__.py":
-                plugin_names.append(item[:-3])
+        # Look for Python modules in the plugin directory; the directory entries
+        # tell whether they are directories without a stat call per entry
+        try:
+            with os.scandir(self.plugin_dir) as entries:
+                for entry in entries:
+                    item = entry.name
+                    init_path = os.path.join(entry.path, "__init__.py")
+                    if entry.is_dir() and os.path.exists(init_path):
+                        plugin_names.append(item)
+                        # A module of the same name takes precedence, as in load_plugin
+                        manifest.setdefault(item, init_path)
+                    elif item.endswith(".py") and item != "__init__.py":
+                        plugin_names.append(item[:-3])
+                        manifest[item[:-3]] = entry.path
+        except (FileNotFoundError, NotADirectoryError):
+            logger.warning(f"Plugin directory does not exist: {self.plugin_dir}")
+            return []
 
         logger.info(f"Discovered {len(plugin_names)} plugins: {', '.join(plugin_names)}")
-        return plugin_names
+        self._discovery_cache = plugin_names
+        self._manifest = manifest
+        return list(plugin_names)
 
-    def load_plugin(self, plugin_name: str) -> Optional[PluginInterface]:
+    def invalidate_cache(self) -> None:
         """
-        Load a plugin by name.
+        Forget the discovered plugins and parsed config files.
+
+        Call this after plugins are installed, removed or reconfigured.
+        """
+        self._discovery_cache = None
+        self._manifest = {}
+        self._config_cache.clear()
+
+    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        """
+        Load a plugin config file, parsing each file only once.
+
+        The parsed config is shared by every plugin of the same directory and
+        kept across reloads, so it stays internal: plugins are given a copy.
+
+        Args:
+            config_path: Path to the config file
+
+        Returns:
+            The parsed config, or an empty config if the file does not exist
+        """
+        config = self._config_cache.get(config_path)
+        if config is None:
+            if os.path.exists(config_path):
+                with open(config_path, "rb") as f:
+                    data = f.read()
+                # Parse with orjson if available
+                config = orjson.loads(data) if orjson is not None else json.loads(data)
+            else:
+                config = {}
+            self._config_cache[config_path] = config
+        return config
+
+    def _prepare_plugin(self, plugin_name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find a plugin's module and read its configuration.
+
+        This only does file I/O, so plugins can be prepared in parallel threads.
+
+        Args:
+            plugin_name: Name of the plugin to prepare
+
+        Returns:
+            Path of the plugin module and the plugin configuration, or None if
+            the plugin was not found or its configuration could not be read
+        """
+        # Determine the plugin path, unless it was found by discovery
+        plugin_path = self._manifest.get(plugin_name)
+        if plugin_path is None:
+            if os.path.exists(os.path.join(self.plugin_dir, f"{plugin_name}.py")):
+                plugin_path = os.path.join(self.plugin_dir, f"{plugin_name}.py")
+            elif os.path.exists(os.path.join(self.plugin_dir, plugin_name, "__init__.py")):
+                plugin_path = os.path.join(self.plugin_dir, plugin_name, "__init__.py")
+            else:
+                logger.error(f"Plugin {plugin_name} not found")
+                return None
+
+        try:
+            # Load plugin configuration if available
+            config_path = os.path.join(os.path.dirname(plugin_path), "config.json")
+            return plugin_path, self._load_config(config_path)
+        except Exception as e:
+            logger.error(f"Failed to load plugin {plugin_name}: {e}", exc_info=True)
+            return None
+
+    def _finalize_plugin(
+        self, plugin_name: str, prepared: Optional[Tuple[str, Dict[str, Any]]]
+    ) -> Optional[PluginInterface]:
+        """
+        Import, instantiate and initialize a prepared plugin.
+
+        Importing runs the plugin's module code, so this must not run in
+        parallel threads.
 
         Args:
             plugin_name: Name of the plugin to load
+            prepared: Result of _prepare_plugin for the plugin
 
         Returns:
             Loaded plugin instance or None if loading failed
         """
-        if plugin_name in self.plugins:
-            logger.info(f"Plugin {plugin_name} already loaded")
-            return self.plugins[plugin_name]
-
-        # Determine the plugin path
-        if os.path.exists(os.path.join(self.plugin_dir, f"{plugin_name}.py")):
-            plugin_path = os.path.join(self.plugin_dir, f"{plugin_name}.py")
-            module_name = plugin_name
-        elif os.path.exists(os.path.join(self.plugin_dir, plugin_name, "__init__.py")):
-            plugin_path = os.path.join(self.plugin_dir, plugin_name, "__init__.py")
-            module_name = plugin_name
-        else:
-            logger.error(f"Plugin {plugin_name} not found")
+        if prepared is None:
             return None
+        plugin_path, config = prepared
+        module_name = plugin_name
 
         try:
-            # Load the plugin module
-            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
-            if spec is None or spec.loader is None:
-                logger.error(f"Failed to create spec for plugin {plugin_name}")
-                return None
-
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
-            # Look for a class that implements PluginInterface
+            # Reuse the plugin module if it was already imported, by this or another
+            # manager; the path check keeps unrelated modules of the same name out,
+            # and modules without a plugin class are imported again
+            modules = sys.modules
+            module = modules.get(module_name)
             plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (
-                    isinstance(attr, type)
-                    and issubclass(attr, PluginInterface)
-                    and attr != PluginInterface
-                ):
-                    plugin_class = attr
-                    break
+            if module is not None and getattr(module, "__file__", None) == plugin_path:
+                plugin_class = _find_plugin_class(module)
+
+            if plugin_class is None:
+                # Load the plugin module
+                spec = importlib.util.spec_from_file_location(module_name, plugin_path)
+                if spec is None or spec.loader is None:
+                    logger.error(f"Failed to create spec for plugin {plugin_name}")
+                    return None
+
+                module = importlib.util.module_from_spec(spec)
+                modules[module_name] = module
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    # Do not leave the half-executed module for later loads to reuse
+                    modules.pop(module_name, None)
+                    raise
+
+                plugin_class = _find_plugin_class(module)
 
             if plugin_class is None:
                 logger.error(f"No plugin class found in {plugin_name}")
                 return None
 
-            # Instantiate the plugin
+            # Instantiate the plugin, with its own copy of the cached config, so
+            # changes it makes do not leak into other plugins or later loads
             plugin = plugin_class()
+            config = copy.deepcopy(config)
             self.plugins[plugin_name] = plugin
-
-            # Load plugin configuration if available
-            config_path = os.path.join(os.path.dirname(plugin_path), "config.json")
-            if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    self.plugin_configs[plugin_name] = json.load(f)
-            else:
-                self.plugin_configs[plugin_name] = {}
+            self.plugin_configs[plugin_name] = config
 
             # Initialize the plugin
-            plugin.initialize(self.plugin_configs[plugin_name])
+            plugin.initialize(config)
 
             logger.info(f"Successfully loaded plugin {plugin_name} v{plugin.version}")
             return plugin
@@ -165,35 +279,72 @@ class PluginManager:
             logger.error(f"Failed to load plugin {plugin_name}: {e}", exc_info=True)
             return None
 
-    def load_all_plugins(self) -> Dict[str, PluginInterface]:
+    def load_plugin(self, plugin_name: str) -> Optional[PluginInterface]:
+        """
+        Load a plugin by name.
+
+        Args:
+            plugin_name: Name of the plugin to load
+
+        Returns:
+            Loaded plugin instance or None if loading failed
+        """
+        plugin = self.plugins.get(plugin_name)
+        if plugin is not None:
+            logger.info(f"Plugin {plugin_name} already loaded")
+            return plugin
+
+        return self._finalize_plugin(plugin_name, self._prepare_plugin(plugin_name))
+
+    def load_all_plugins(self, eager: bool = True) -> Dict[str, PluginInterface]:
         """
         Load all available plugins.
 
+        The plugin files are found and their configurations read in parallel
+        threads; the plugins are then imported and initialized one at a time.
+        Without eager loading, plugins are only discovered here and get loaded
+        on their first use through get_plugin or execute_plugin.
+
+        Args:
+            eager: Whether to load the plugins now rather than on first use
+
         Returns:
             Dictionary of loaded plugins
         """
-        plugin_names = self.discover_plugins()
+        plugin_names = [name for name in self.discover_plugins() if name not in self.plugins]
+        if not eager:
+            return self.plugins
+
+        if len(plugin_names) > 1:
+            with ThreadPoolExecutor(max_workers=min(PREPARE_WORKERS, len(plugin_names))) as pool:
+                prepared = list(pool.map(self._prepare_plugin, plugin_names))
+        else:
+            prepared = [self._prepare_plugin(name) for name in plugin_names]
 
-        for name in plugin_names:
-            self.load_plugin(name)
+        for name, plugin_prepared in zip(plugin_names, prepared):
+            self._finalize_plugin(name, plugin_prepared)
 
         return self.plugins
 
     def get_plugin(self, plugin_name: str) -> Optional[PluginInterface]:
         """
-        Get a loaded plugin by name.
+        Get a plugin by name, loading discovered plugins on first use.
 
         Args:
             plugin_name: Name of the plugin to get
 
         Returns:
-            Plugin instance or None if not loaded
+            Plugin instance or None if it is not loaded and could not be loaded
         """
-        if plugin_name not in self.plugins:
-            logger.warning(f"Plugin {plugin_name} not loaded")
-            return None
+        plugin = self.plugins.get(plugin_name)
+        if plugin is not None:
+            return plugin
 
-        return self.plugins[plugin_name]
+        if plugin_name in self._manifest:
+            return self.load_plugin(plugin_name)
+
+        logger.warning(f"Plugin {plugin_name} not loaded")
+        return None
 
     async def execute_plugin(
         self, plugin_name: str, context: Dict[str, Any]
@@ -209,7 +360,7 @@ class PluginManager:
             Plugin execution results or None if execution failed
         """
         plugin = self.get_plugin(plugin_name)
-        if plugin is None:
+        if plugin is None and plugin_name not in self._manifest:
             plugin = self.load_plugin(plugin_name)
 
         if plugin is None:
@@ -1,6 +1,6 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from itertools import chain
 import logging
-import re
 
 from ..base import PluginInterface
 
@@ -32,6 +32,8 @@ class CodeStylePlugin(PluginInterface):
         """
         self.config = config
         self.rules = config.get("rules", self._get_default_rules())
+        # Checks of the rules that apply to each language, see _get_checks
+        self._checks_by_language: Dict[str, Tuple[List[tuple], List[tuple], List[tuple], int]] = {}
         logger.info(f"Initialized CodeStylePlugin with {len(self.rules)} rules")
 
     def _get_default_rules(self) -> List[Dict[str, Any]]:
@@ -69,6 +71,12 @@ class CodeStylePlugin(PluginInterface):
         """
         Execute the plugin with the provided context.
 
+        The files are checked one at a time as they are iterated, so "files"
+        may be a generator that reads each file only when it is checked. When
+        a "file_results_sink" callable is given, the full results of each file
+        are passed to it and only their summary is kept in the returned
+        results, so memory does not grow with the issues of every file.
+
         Args:
             context: Contains code files to check and other metadata
 
@@ -81,15 +89,15 @@ class CodeStylePlugin(PluginInterface):
             raise ValueError("No files provided for style check")
 
         files = context["files"]
+        sink = context.get("file_results_sink")
 
         # Results will contain style issues for each file
-        results = {
-            "summary": {"files_checked": len(files), "issues_found": 0, "warnings": 0, "infos": 0},
-            "files": [],
-        }
+        summary = {"files_checked": 0, "issues_found": 0, "warnings": 0, "infos": 0}
+        results = {"summary": summary, "files": []}
 
         # Process each file
         for file_info in files:
+            summary["files_checked"] += 1
             file_path = file_info.get("path")
             file_content = file_info.get("content")
 
@@ -104,20 +112,26 @@ class CodeStylePlugin(PluginInterface):
             file_results = self._check_file(file_path, file_content, language)
 
             # Update summary statistics
-            results["summary"]["issues_found"] += len(file_results["issues"])
+            summary["issues_found"] += len(file_results["issues"])
             for issue in file_results["issues"]:
                 severity = issue.get("severity", "info")
                 if severity == "warning":
-                    results["summary"]["warnings"] += 1
+                    summary["warnings"] += 1
                 else:
-                    results["summary"]["infos"] += 1
+                    summary["infos"] += 1
+
+            if sink is not None:
+                sink(file_results)
+                file_results = {
+                    "path": file_path,
+                    "language": language,
+                    "summary": file_results["summary"],
+                }
 
             # Add file results to overall results
             results["files"].append(file_results)
 
-        logger.info(
-            f"Code style check completed. Found {results['summary']['issues_found']} issues"
-        )
+        logger.info(f"Code style check completed. Found {summary['issues_found']} issues")
         return results
 
     def _get_file_language(self, file_path: str) -> str:
@@ -145,14 +159,26 @@ class CodeStylePlugin(PluginInterface):
         else:
             return "text"
 
-    def _check_file(self, file_path: str, file_content: str, language: str) -> Dict[str, Any]:
-        """
-        Check a file against applicable style rules.
+    def _get_checks(self, language: str) -> Tuple[List[tuple], List[tuple], List[tuple], int]:
         """
-        issues = []
-        lines = file_content.splitlines()
+        Get the line checks of the rules that apply to a language.
+
+        The rules are dispatched once per language rather than once per file.
+        Each check carries the position of its rule among the applicable
+        rules, which is where its issues are collected.
 
-        # Apply each rule that's applicable to this language
+        Returns:
+            The line length, trailing whitespace and indentation checks, and the
+            number of applicable rules
+        """
+        checks = self._checks_by_language.get(language)
+        if checks is not None:
+            return checks
+
+        length_checks = []
+        trailing_checks = []
+        indent_checks = []
+        rule_count = 0
         for rule in self.rules:
             rule_language = rule.get("language", "*")
 
@@ -163,67 +189,87 @@ class CodeStylePlugin(PluginInterface):
             rule_id = rule.get("id")
             severity = rule.get("severity", "info")
 
-            # Apply specific rules
             if rule_id == "line_length":
                 max_length = rule.get("max_length", 100)
-                for i, line in enumerate(lines):
-                    if len(line) > max_length:
-                        issues.append(
+                message = f"Line exceeds maximum length of {max_length} characters"
+                length_checks.append((max_length, message, rule_id, severity, rule_count))
+            elif rule_id == "trailing_whitespace":
+                trailing_checks.append((rule_id, severity, rule_count))
+            elif rule_id == "py_indent" and language == "python":
+                message = "Python indentation should be 4 spaces"
+                indent_checks.append(("    ", message, rule_id, severity, rule_count))
+            elif rule_id == "js_indent" and language in ["javascript", "typescript"]:
+                message = "JavaScript/TypeScript indentation should be 2 spaces"
+                indent_checks.append(("  ", message, rule_id, severity, rule_count))
+            else:
+                continue
+
+            rule_count += 1
+
+        checks = (length_checks, trailing_checks, indent_checks, rule_count)
+        self._checks_by_language[language] = checks
+        return checks
+
+    def _check_file(self, file_path: str, file_content: str, language: str) -> Dict[str, Any]:
+        """
+        Check a file against applicable style rules.
+        """
+        lines = file_content.splitlines()
+
+        # The lines are scanned once for all rules; each rule keeps its own issues,
+        # in rule order
+        length_checks, trailing_checks, indent_checks, rule_count = self._get_checks(language)
+        rule_issues = [[] for _ in range(rule_count)]
+
+        if rule_issues:
+            # Lines within every length limit, or indented by the widest indentation, skip
+            # the length or indentation checks with a single test
+            shortest_max_length = min(check[0] for check in length_checks) if length_checks else -1
+            widest_indent = max((check[0] for check in indent_checks), key=len, default="")
+            for line_number, line in enumerate(lines, 1):
+                line_length = len(line)
+
+                if length_checks and line_length > shortest_max_length:
+                    for max_length, message, rule_id, severity, rule_index in length_checks:
+                        if line_length <= max_length:
+                            continue
+                        rule_issues[rule_index].append(
                             {
-                                "line": i + 1,
+                                "line": line_number,
                                 "column": max_length + 1,
-                                "message": f"Line exceeds maximum length of {max_length} characters",
+                                "message": message,
                                 "rule_id": rule_id,
                                 "severity": severity,
                             }
                         )
 
-            elif rule_id == "trailing_whitespace":
-                for i, line in enumerate(lines):
-                    if line and line[-1].isspace():
-                        issues.append(
+                if trailing_checks and line and line[-1].isspace():
+                    for rule_id, severity, rule_index in trailing_checks:
+                        rule_issues[rule_index].append(
                             {
-                                "line": i + 1,
-                                "column": len(line),
+                                "line": line_number,
+                                "column": line_length,
                                 "message": "Line has trailing whitespace",
                                 "rule_id": rule_id,
                                 "severity": severity,
                             }
                         )
 
-            elif rule_id == "py_indent" and language == "python":
-                for i, line in enumerate(lines):
-                    if (
-                        line.startswith(" ")
-                        and not line.startswith("    ")
-                        and not re.match(r"^ *$", line)
-                    ):
-                        issues.append(
-                            {
-                                "line": i + 1,
-                                "column": 1,
-                                "message": "Python indentation should be 4 spaces",
-                                "rule_id": rule_id,
-                                "severity": severity,
-                            }
-                        )
-
-            elif rule_id == "js_indent" and language in ["javascript", "typescript"]:
-                for i, line in enumerate(lines):
-                    if (
-                        line.startswith(" ")
-                        and not line.startswith("  ")
-                        and not re.match(r"^ *$", line)
-                    ):
-                        issues.append(
-                            {
-                                "line": i + 1,
-                                "column": 1,
-                                "message": "JavaScript/TypeScript indentation should be 2 spaces",
-                                "rule_id": rule_id,
-                                "severity": severity,
-                            }
-                        )
+                if indent_checks and line[:1] == " " and not line.startswith(widest_indent):
+                    for indent, message, rule_id, severity, rule_index in indent_checks:
+                        # Lines of only spaces are blank, not indented
+                        if not line.startswith(indent) and line.lstrip(" "):
+                            rule_issues[rule_index].append(
+                                {
+                                    "line": line_number,
+                                    "column": 1,
+                                    "message": message,
+                                    "rule_id": rule_id,
+                                    "severity": severity,
+                                }
+                            )
+
+        issues = list(chain.from_iterable(rule_issues))
 
         return {
             "path": file_path,
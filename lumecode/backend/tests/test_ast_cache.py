@@ -0,0 +1,173 @@
+import os
+import re
+import unittest
+import tempfile
+from pathlib import Path
+
+from backend.analysis.cache import FileHashCache
+from backend.analysis.core import _evaluate_rules_cached
+from backend.analysis.rules import PatternRule, RuleCategory, RuleEngine, RuleSeverity
+
+
+class TestFileHashCache(unittest.TestCase):
+    """Test cases for the FileHashCache class."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.file_path = os.path.join(self.temp_dir.name, "sample.py")
+        Path(self.file_path).write_text("x = 1\n")
+        self.cache = FileHashCache(self.cache_dir, "1.0")
+
+    def tearDown(self):
+        """Clean up after each test."""
+        self.temp_dir.cleanup()
+
+    def test_file_digest(self):
+        """Test content hashes follow the file content"""
+        digest = self.cache.file_digest(self.file_path)
+        self.assertEqual(self.cache.file_digest(self.file_path), digest)
+
+        Path(self.file_path).write_text("x = 2\n")
+        os.utime(self.file_path, ns=(0, 0))
+        self.assertNotEqual(self.cache.file_digest(self.file_path), digest)
+
+    def test_scan_file(self):
+        """Test files are screened for a pattern in the buffer that is hashed"""
+        pattern = re.compile(rb"\bx\b")
+        digest, matched = self.cache.scan_file(self.file_path, pattern)
+        self.assertEqual(digest, self.cache.file_digest(self.file_path))
+        self.assertTrue(matched)
+
+        # Unchanged files are not read again, so the match is unknown
+        self.assertEqual(self.cache.scan_file(self.file_path, pattern), (digest, None))
+
+        Path(self.file_path).write_text("")
+        self.assertFalse(self.cache.scan_file(self.file_path, pattern)[1])
+
+    def test_empty_file_digest(self):
+        """Test empty files, which cannot be memory-mapped, are hashed too"""
+        Path(self.file_path).write_text("")
+        self.assertEqual(len(self.cache.file_digest(self.file_path)), 32)
+
+    def test_ast_and_issues_round_trip(self):
+        """Test cached parse results and issues are persisted per content hash"""
+        digest = self.cache.file_digest(self.file_path)
+        self.assertIsNone(self.cache.get_ast(digest))
+
+        ast_result = {"language": "python", "ast": {"type": "module", "children": []}}
+        self.cache.set_ast(digest, ast_result)
+        self.cache.set_issues(digest, "rules-v1", [{"rule_id": "QUAL001"}])
+        self.cache.save()
+
+        # A new cache instance reads the persisted entries and stat index
+        cache = FileHashCache(self.cache_dir, "1.0")
+        self.assertEqual(cache.file_digest(self.file_path), digest)
+        self.assertEqual(cache.get_ast(digest), ast_result)
+        self.assertEqual(cache.get_issues(digest, "rules-v1"), [{"rule_id": "QUAL001"}])
+        self.assertIsNone(cache.get_issues(digest, "rules-v2"))
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_issues_kept_apart_from_ast(self):
+        """Test issues are cached without an AST entry and reused without loading it"""
+        digest = self.cache.file_digest(self.file_path)
+        self.cache.set_issues(digest, "rules-v1", [{"rule_id": "QUAL001"}])
+        self.cache.set_issues(digest, "rules-v2", [])
+
+        self.assertIsNone(self.cache.get_ast(digest))
+        self.assertEqual(self.cache.get_issues(digest, "rules-v1"), [{"rule_id": "QUAL001"}])
+        self.assertEqual(self.cache.get_issues(digest, "rules-v2"), [])
+
+    def test_prune_evicts_least_recently_used(self):
+        """Test entries beyond the maximum size are evicted, least recently used first"""
+        cache = FileHashCache(self.cache_dir, "1.0", max_size=0)
+        digests = ["a" * 32, "b" * 32, "c" * 32]
+        for age, digest in enumerate(digests):
+            cache.set_ast(digest, {"language": "python"})
+            os.utime(cache._entry_path(digest), ns=(age, age))
+        size = cache._entry_path(digests[0]).stat().st_size
+
+        # Reading the oldest entry makes it the most recently used
+        self.assertIsNotNone(cache.get_ast(digests[0]))
+        self.assertEqual(cache.prune(2 * size), 1)
+        self.assertIsNone(cache.get_ast(digests[1]))
+        self.assertIsNotNone(cache.get_ast(digests[2]))
+
+        # save() prunes to the maximum size once entries were written
+        cache.save()
+        self.assertIsNone(cache.get_ast(digests[0]))
+        self.assertIsNone(cache.get_ast(digests[2]))
+
+    def test_save_drops_stale_index_entries(self):
+        """Test deleted files and evicted content are dropped from the stat index"""
+        cache = FileHashCache(self.cache_dir, "1.0", max_size=0)
+        other_path = os.path.join(self.temp_dir.name, "other.py")
+        Path(other_path).write_text("y = 2\n")
+        cache.file_digest(self.file_path)
+        # The other file still exists, but its only entry is evicted
+        cache.set_ast(cache.file_digest(other_path), {"language": "python"})
+        os.remove(self.file_path)
+
+        cache.save()
+        self.assertEqual(cache._stat_index, {})
+
+        # The saved index no longer has either file
+        self.assertEqual(FileHashCache(self.cache_dir, "1.0")._stat_index, {})
+
+    def test_merge_index_updates(self):
+        """Test stat index entries computed by another instance are saved by this one"""
+        worker_cache = FileHashCache(self.cache_dir, "1.0")
+        digest = worker_cache.file_digest(self.file_path)
+        updates = worker_cache.take_index_updates()
+        self.assertEqual(list(updates), [os.path.abspath(self.file_path)])
+        self.assertEqual(worker_cache.take_index_updates(), {})
+
+        self.cache.merge_index(updates)
+        self.cache.save()
+
+        cache = FileHashCache(self.cache_dir, "1.0")
+        self.assertEqual(cache._stat_index[os.path.abspath(self.file_path)][2], digest)
+
+    def test_version_mismatch(self):
+        """Test entries written by another version are ignored"""
+        digest = self.cache.file_digest(self.file_path)
+        self.cache.set_ast(digest, {"language": "python"})
+
+        cache = FileHashCache(self.cache_dir, "2.0")
+        self.assertIsNone(cache.get_ast(digest))
+
+    def test_changed_rule_invalidates_cached_issues(self):
+        """Test issues cached for a rule are not reused once its pattern changes"""
+        digest = self.cache.file_digest(self.file_path)
+        root = {
+            "type": "module",
+            "children": [{"type": "assignment", "target": {"name": "password"}}],
+        }
+        self.cache.set_ast(digest, {"language": "python", "ast": root})
+        context = {"file_path": self.file_path, "language": "python"}
+
+        def engine_with(name):
+            engine = RuleEngine()
+            engine.add_rule(
+                PatternRule(
+                    rule_id="SEC001",
+                    name="Hardcoded Secret",
+                    description="Avoid hardcoding secrets",
+                    category=RuleCategory.SECURITY,
+                    severity=RuleSeverity.ERROR,
+                    node_type="assignment",
+                    pattern={"type": "assignment", "target": {"name": name}},
+                )
+            )
+            return engine
+
+        issues = _evaluate_rules_cached(engine_with("password"), root, context, self.cache, digest)
+        self.assertEqual(len(issues), 1)
+
+        issues = _evaluate_rules_cached(engine_with("token"), root, context, self.cache, digest)
+        self.assertEqual(issues, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
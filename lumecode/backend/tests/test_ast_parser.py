@@ -1,10 +1,84 @@
 import os
 import shutil
+import threading
+import time
 import asyncio
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from lumecode.backend.analysis import ASTParser, AnalysisEngine
+from lumecode.backend.analysis import (
+    ASTParser,
+    AnalysisEngine,
+    AnalysisType,
+    PatternRule,
+    RuleCategory,
+    RuleEngine,
+    RuleSeverity,
+    find_nodes_by_text,
+    find_nodes_by_text_batch,
+    iter_nodes_by_type,
+)
+from lumecode.backend.analysis.cache import FileHashCache
+from lumecode.backend.analysis.parser import PARSE_CODE_CACHE_SIZE, _read_file
+from lumecode.backend.analysis import core
+from lumecode.backend.analysis.core import (
+    _analyze_performance_file,
+    _analyze_quality_file,
+    _analyze_security_file,
+    _collect_ast_counts,
+    _parse_file_cached,
+    _map_performance_type_to_category,
+    _perform_performance_ast_analysis,
+    _perform_security_ast_analysis,
+    _project_relpath,
+    _tally_issues,
+)
+
+
+def _file_name_worker(file_path, ast_parser, rule_engine, ast_cache, session_cache=None):
+    """Per-file analysis function used to exercise the worker pool"""
+    if file_path.endswith(".skip"):
+        return None
+    return {"file_path": file_path, "pid": os.getpid()}
+
+
+def _file_size_worker(file_path, ast_parser, rule_engine, ast_cache, session_cache=None):
+    """Second per-file analysis function, run alongside _file_name_worker in a session"""
+    return {"file_path": file_path, "size": len(file_path), "pid": os.getpid()}
+
+
+def _digest_worker(file_path, ast_parser, rule_engine, ast_cache, session_cache=None):
+    """Per-file analysis function that only hashes the file"""
+    return {"file_path": file_path, "digest": ast_cache.file_digest(file_path)}
+
+
+class _CountingParser:
+    """Parser double that records how often files are parsed"""
+
+    SUPPORTED_LANGUAGES = {"python": ".py"}
+
+    def __init__(self):
+        self.calls = 0
+        self.contents = []
+        self.grammar = "1"
+
+    def grammar_version(self, language):
+        return self.grammar
+
+    def has_language(self, language):
+        return language in self.SUPPORTED_LANGUAGES
+
+    def parse_file(self, file_path, content=None):
+        self.calls += 1
+        self.contents.append(content)
+        return {
+            "language": "python",
+            "file_path": file_path,
+            "ast": {"type": "module"},
+            "metadata": {"grammar_version": self.grammar},
+        }
 
 
 class TestASTParser(unittest.TestCase):
@@ -63,6 +137,199 @@ hello_world()
         self.assertEqual(result["ast"]["type"], "module")
         self.assertEqual(result["file_path"], self.test_file_path)
 
+    def test_read_file(self):
+        """Test files are read whole, including empty files"""
+        with open(self.test_file_path, "rb") as f:
+            self.assertEqual(_read_file(self.test_file_path), f.read())
+
+        empty_path = os.path.join(self.test_dir, "empty.py")
+        Path(empty_path).write_bytes(b"")
+        self.addCleanup(os.remove, empty_path)
+        self.assertEqual(_read_file(empty_path), b"")
+
+    def test_grammar_version(self):
+        """Test language libraries are versioned by their modification time and size"""
+        parser = ASTParser(os.path.join(self.test_dir, "languages"))
+        self.assertEqual(parser.grammar_version("python"), "")
+
+        lib_path = os.path.join(parser.languages_dir, "go.so")
+        with open(lib_path, "wb") as f:
+            f.write(b"grammar")
+        os.utime(lib_path, ns=(0, 1000))
+        self.assertEqual(parser.grammar_version("go"), "1000-7")
+
+        shutil.rmtree(parser.languages_dir)
+
+    def test_grammar_version_per_parser(self):
+        """Test a rebuilt language library is versioned anew by a new parser only"""
+        parser = ASTParser(os.path.join(self.test_dir, "languages"))
+        lib_path = os.path.join(parser.languages_dir, "go.so")
+        with open(lib_path, "wb") as f:
+            f.write(b"grammar")
+        os.utime(lib_path, ns=(0, 1000))
+        self.assertEqual(parser.grammar_version("go"), "1000-7")
+
+        with open(lib_path, "wb") as f:
+            f.write(b"rebuilt grammar")
+        os.utime(lib_path, ns=(0, 2000))
+        # The existing parser keeps the version of the library it looked up
+        self.assertEqual(parser.grammar_version("go"), "1000-7")
+        self.assertEqual(ASTParser(parser.languages_dir).grammar_version("go"), "2000-15")
+
+        shutil.rmtree(parser.languages_dir)
+
+    def test_parse_files(self):
+        """Test files are parsed in worker processes, keeping their order and errors"""
+        missing_path = os.path.join(self.test_dir, "missing.py")
+        file_paths = [self.test_file_path, missing_path, self.test_file_path]
+
+        for workers in (1, 2):
+            results = self.parser.parse_files(file_paths, workers=workers)
+            self.assertEqual([result["file_path"] for result in results], file_paths)
+            self.assertIn("File not found", results[1]["error"])
+
+    def test_parse_file_reuses_previous_tree(self):
+        """Test unchanged files reuse their result and edited files are re-parsed incrementally"""
+        parsed = []
+        edits = []
+
+        tree_cache = self.parser._tree_cache
+        file_path = os.path.abspath(self.test_file_path)
+
+        class _Tree:
+            root_node = None
+
+            def edit(self, **edit):
+                # The edited tree is no longer shared with other threads
+                edits.append((edit, tree_cache.get(file_path)))
+
+        class _TreeSitterParser:
+            def set_language(self, lang):
+                pass
+
+            def parse(self, content, old_tree=None):
+                parsed.append(old_tree)
+                return _Tree()
+
+        self.parser.languages["python"] = object()
+        self.parser._tls.parser = _TreeSitterParser()
+        self.parser._tls.language = None
+        self.parser._tree_to_dict = lambda node, content: {"type": "module", "children": []}
+        self.parser._count_node_types = lambda tree, language: None
+
+        Path(self.test_file_path).write_bytes(b"a = 1\nb = 2\n")
+        first = self.parser.parse_file(self.test_file_path)
+        second = self.parser.parse_file(self.test_file_path)
+        self.assertEqual(len(parsed), 1)
+        self.assertIs(second["ast"], first["ast"])
+
+        Path(self.test_file_path).write_bytes(b"a = 1\nb = 22\n")
+        self.parser.parse_file(self.test_file_path)
+        self.assertIsInstance(parsed[1], _Tree)
+        self.assertEqual(
+            edits,
+            [
+                (
+                    {
+                        "start_byte": 11,
+                        "old_end_byte": 11,
+                        "new_end_byte": 12,
+                        "start_point": (1, 5),
+                        "old_end_point": (1, 5),
+                        "new_end_point": (1, 6),
+                    },
+                    None,
+                )
+            ],
+        )
+        self.assertIn(file_path, self.parser._tree_cache)
+
+    def test_parser_per_thread(self):
+        """Test each thread reuses its own tree-sitter parser"""
+        thread_parsers = []
+        thread = threading.Thread(target=lambda: thread_parsers.append(self.parser.parser))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.parser.parser, self.parser.parser)
+        self.assertIsNot(thread_parsers[0], self.parser.parser)
+
+    def test_parse_code_cache(self):
+        """Test identical snippets are parsed once, within the cache size"""
+        parsed = []
+
+        class _TreeSitterParser:
+            def set_language(self, lang):
+                pass
+
+            def parse(self, content):
+                parsed.append(content)
+                return SimpleNamespace(root_node=None)
+
+        self.parser.languages["python"] = object()
+        self.parser._tls.parser = _TreeSitterParser()
+        self.parser._tls.language = None
+        self.parser._tree_to_dict = lambda node, content: {"type": "module", "children": []}
+
+        first = self.parser.parse_code("x = 1", "python")
+        first["analysis_metadata"] = {}
+        second = self.parser.parse_code("x = 1", "python")
+        self.assertEqual(parsed, [b"x = 1"])
+        self.assertIs(second["ast"], first["ast"])
+        # Callers get their own copy of the result around the shared AST
+        self.assertNotIn("analysis_metadata", second)
+
+        self.parser._code_cache_size = 1
+        self.parser.parse_code("y = 2", "python")
+        self.parser.parse_code("x = 1", "python")
+        self.assertEqual(parsed, [b"x = 1", b"y = 2", b"x = 1"])
+
+        # Bytes are parsed as they are
+        content = b"z = 3"
+        self.parser.parse_code(content, "python")
+        self.assertIs(parsed[-1], content)
+
+
+    def test_parse_code_cache_threads(self):
+        """Test threads sharing a parser can fill and evict the snippet cache concurrently"""
+
+        class _TreeSitterParser:
+            def set_language(self, lang):
+                pass
+
+            def parse(self, content):
+                return SimpleNamespace(root_node=None)
+
+        self.parser.languages["python"] = object()
+        self.parser._get_parser = lambda language, lang: _TreeSitterParser()
+        self.parser._tree_to_dict = lambda node, content: {"type": "module", "children": []}
+        self.parser._code_cache_size = 4
+
+        errors = []
+
+        def parse_snippets():
+            try:
+                for i in range(500):
+                    self.parser.parse_code(f"x = {i % 8}", "python")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=parse_snippets) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.parser._code_cache), 4)
+
+    def test_invalid_parse_cache_size(self):
+        """Test an invalid LUMECODE_PARSE_CACHE value falls back to the default size"""
+        with patch.dict(os.environ, {"LUMECODE_PARSE_CACHE": "lots"}):
+            with self.assertLogs("lumecode.backend.analysis.parser", "WARNING"):
+                parser = ASTParser()
+        self.assertEqual(parser._code_cache_size, PARSE_CODE_CACHE_SIZE)
+
 
 class TestAnalysisEngine(unittest.TestCase):
     def setUp(self):
@@ -97,12 +364,27 @@ hello_world()
 
     def tearDown(self):
         """Clean up test files and directories"""
+        self.engine.close()
         if os.path.exists(self.test_file_path):
             os.remove(self.test_file_path)
         if os.path.exists(self.test_dir):
             # Remove directory even if not empty
             shutil.rmtree(self.test_dir)
 
+    def test_default_cache_dir(self):
+        """Test the AST cache defaults to the user's cache directory"""
+        cache_home = os.path.join(self.test_dir, "cache_home")
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": cache_home}):
+            engine = AnalysisEngine()
+        self.assertEqual(engine.ast_cache.cache_dir, Path(cache_home, "lumecode", "ast"))
+
+        with patch.dict(os.environ):
+            os.environ.pop("XDG_CACHE_HOME", None)
+            self.assertEqual(
+                core._default_cache_dir(),
+                os.path.join(os.path.expanduser("~"), ".cache", "lumecode", "ast"),
+            )
+
     def test_parse_file(self):
         """Test parsing a file using the analysis engine"""
         result = asyncio.run(self.engine.parse_file(self.test_file_path))
@@ -121,6 +403,680 @@ hello_world()
         self.assertIn("ast", result)
         self.assertEqual(result["ast"]["type"], "module")
 
+    def test_run_file_analysis(self):
+        """Test per-file analysis keeps file order in-process and across workers"""
+        files = [f"file_{i}.py" for i in range(10)] + ["ignored.skip"]
+        expected = files[:-1]
+
+        for workers in (1, 2):
+            results = asyncio.run(
+                self.engine._run_file_analysis(
+                    _file_name_worker, files, {"workers": workers}, time.perf_counter()
+                )
+            )
+            self.assertEqual([result["file_path"] for result in results], expected)
+
+        # Batches run in separate worker processes
+        self.assertNotIn(os.getpid(), {result["pid"] for result in results})
+
+    def test_run_file_analysis_reuses_workers(self):
+        """Test analyses run in the same worker pool until the engine is closed"""
+        files = [f"file_{i}.py" for i in range(8)]
+        options = {"workers": 2}
+
+        def worker_pids():
+            results = asyncio.run(
+                self.engine._run_file_analysis(
+                    _file_name_worker, files, options, time.perf_counter()
+                )
+            )
+            return {result["pid"] for result in results}
+
+        first_pids = worker_pids()
+        executor = self.engine._executor
+        self.assertLessEqual(worker_pids(), set(executor._processes))
+        self.assertIs(self.engine._executor, executor)
+        self.assertLessEqual(first_pids, set(executor._processes))
+
+        manager_thread = executor._executor_manager_thread
+        self.engine.close()
+        self.assertIsNone(self.engine._executor)
+        # The pool's management thread is joined rather than left to fail at exit
+        self.assertFalse(manager_thread.is_alive())
+        self.assertTrue(worker_pids().isdisjoint(first_pids))
+
+    def test_run_file_analysis_custom_rules_in_process(self):
+        """Test files are analyzed in-process when the workers would lack the engine's rules"""
+        files = [f"file_{i}.py" for i in range(4)]
+        self.engine.rule_engine.add_rule(
+            PatternRule(
+                "SEC100",
+                "Eval call",
+                "Eval call",
+                RuleCategory.SECURITY,
+                RuleSeverity.ERROR,
+                "call",
+                {"text": "eval"},
+            )
+        )
+
+        results = asyncio.run(
+            self.engine._run_file_analysis(
+                _file_name_worker, files, {"workers": 2}, time.perf_counter()
+            )
+        )
+        self.assertEqual([result["file_path"] for result in results], files)
+        self.assertEqual({result["pid"] for result in results}, {os.getpid()})
+
+    def test_run_file_analysis_saves_worker_digests(self):
+        """Test content hashes computed in the workers are saved in the parent's index"""
+        cache_dir = os.path.join(self.test_dir, "cache")
+        self.engine.config["cache_dir"] = cache_dir
+        self.engine.ast_cache = FileHashCache(cache_dir, "test")
+        files = []
+        for i in range(4):
+            files.append(os.path.join(self.test_dir, f"module_{i}.py"))
+            with open(files[-1], "w") as f:
+                f.write(f"x = {i}\n")
+
+        results = asyncio.run(
+            self.engine._run_file_analysis(
+                _digest_worker, files, {"workers": 2}, time.perf_counter()
+            )
+        )
+
+        index = FileHashCache(cache_dir, "test")._stat_index
+        self.assertEqual(
+            {file_path: index[file_path][2] for file_path in files},
+            {result["file_path"]: result["digest"] for result in results},
+        )
+
+    def test_find_files_to_analyze(self):
+        """Test project discovery skips excluded paths and unsupported files"""
+        for rel_path in ["src/app.py", "src/notes.txt", "node_modules/lib/dep.js", "src/.git/x.py"]:
+            path = os.path.join(self.test_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("x = 1\n")
+
+        files = self.engine._find_files_to_analyze(self.test_dir, {})
+
+        self.assertEqual(
+            sorted(os.path.relpath(f, self.test_dir) for f in files),
+            ["sample.py", os.path.join("src", "app.py")],
+        )
+
+    def test_collect_ast_counts(self):
+        """Test function, class and branch counting in one traversal"""
+        ast = {
+            "type": "module",
+            "children": [
+                {
+                    "type": "class_definition",
+                    "children": [
+                        {
+                            "type": "function_definition",
+                            "children": [{"type": "if_statement"}, {"type": "for_statement"}],
+                        }
+                    ],
+                },
+                {"type": "function_definition", "children": [{"type": "try_statement"}]},
+            ],
+        }
+
+        self.assertEqual(_collect_ast_counts(ast), (2, 1, 3))
+
+    def test_nested_loop_hotspots(self):
+        """Test each loop containing other loops is reported once at its own position"""
+
+        def loop(start, end, children=()):
+            return {
+                "type": "for_statement",
+                "start_pos": (start, 0),
+                "end_pos": (end, 0),
+                "children": list(children),
+            }
+
+        ast = {
+            "type": "module",
+            "children": [
+                loop(1, 10, [loop(2, 5, [loop(3, 4)]), loop(6, 9)]),
+                loop(12, 14),
+            ],
+        }
+
+        hotspots = _perform_performance_ast_analysis(ast, "sample.go", "go")
+        lines = [hotspot["line"] for hotspot in hotspots if hotspot["type"] == "nested_loops"]
+        self.assertEqual(lines, [1, 2])
+
+    def test_n_plus_one_hotspots(self):
+        """Test loops are reported once when a database call lies within their bytes"""
+        ast = {
+            "type": "module",
+            "text": "",
+            "start_byte": 0,
+            "end_byte": 200,
+            "children": [
+                {
+                    "type": "for_statement",
+                    "text": "",
+                    "start_pos": (1, 0),
+                    "end_pos": (4, 0),
+                    "start_byte": 10,
+                    "end_byte": 80,
+                    "children": [
+                        {
+                            "type": "call",
+                            "text": "db.query(user)",
+                            "start_pos": (2, 0),
+                            "start_byte": 30,
+                            "end_byte": 44,
+                        },
+                        {
+                            "type": "call",
+                            "text": "cursor.execute(sql)",
+                            "start_pos": (3, 0),
+                            "start_byte": 50,
+                            "end_byte": 69,
+                        },
+                    ],
+                },
+                {
+                    "type": "call",
+                    "text": "session.fetch()",
+                    "start_pos": (6, 0),
+                    "start_byte": 90,
+                    "end_byte": 105,
+                },
+                {
+                    "type": "while_statement",
+                    "text": "",
+                    "start_pos": (8, 4),
+                    "end_pos": (9, 0),
+                    "start_byte": 120,
+                    "end_byte": 150,
+                    "children": [
+                        {
+                            "type": "call",
+                            "text": "print(x)",
+                            "start_pos": (9, 0),
+                            "start_byte": 140,
+                            "end_byte": 148,
+                        }
+                    ],
+                },
+            ],
+        }
+
+        hotspots = _perform_performance_ast_analysis(ast, "sample.py", "python")
+        lines = [hotspot["line"] for hotspot in hotspots if hotspot["type"] == "n_plus_one_query"]
+        self.assertEqual(lines, [1])
+
+    def test_n_plus_one_ignores_call_after_loop(self):
+        """Test a database call after a loop is not reported, even from the loop's block"""
+        code = "def f(items):\n    for a in items:\n        print(a)\n    return db.get(1)\n"
+        ast = {
+            "type": "module",
+            "text": code,
+            "start_byte": 0,
+            "end_byte": len(code),
+            "start_pos": (0, 0),
+            "end_pos": (4, 0),
+            "children": [
+                {
+                    "type": "function_definition",
+                    "text": code.rstrip(),
+                    "start_pos": (0, 0),
+                    "end_pos": (3, 20),
+                    "start_byte": 0,
+                    "end_byte": len(code) - 1,
+                    "children": [
+                        {
+                            "type": "block",
+                            "text": code[18:-1],
+                            "start_pos": (1, 4),
+                            "end_pos": (3, 20),
+                            "start_byte": 18,
+                            "end_byte": len(code) - 1,
+                            "children": [
+                                {
+                                    "type": "for_statement",
+                                    "text": code[18:50],
+                                    "start_pos": (1, 4),
+                                    "end_pos": (2, 16),
+                                    "start_byte": 18,
+                                    "end_byte": 50,
+                                    "children": [
+                                        {
+                                            "type": "call",
+                                            "text": "print(a)",
+                                            "start_pos": (2, 8),
+                                            "start_byte": 42,
+                                            "end_byte": 50,
+                                        }
+                                    ],
+                                },
+                                {
+                                    "type": "call",
+                                    "text": "db.get(1)",
+                                    "start_pos": (3, 11),
+                                    "start_byte": 62,
+                                    "end_byte": 71,
+                                },
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+
+        hotspots = _perform_performance_ast_analysis(ast, "sample.py", "python")
+        self.assertEqual(
+            [hotspot for hotspot in hotspots if hotspot["type"] == "n_plus_one_query"], []
+        )
+
+    def test_string_concatenation_hotspots(self):
+        """Test string concatenations are reported only inside a loop's row range"""
+
+        def concat(row):
+            return {
+                "type": "binary_expression",
+                "operator": "+",
+                "left": {"type": "string_literal"},
+                "start_pos": (row, 4),
+            }
+
+        ast = {
+            "type": "program",
+            "children": [
+                {
+                    "type": "for_statement",
+                    "start_pos": (1, 0),
+                    "end_pos": (10, 0),
+                    "children": [
+                        {
+                            "type": "while_statement",
+                            "start_pos": (2, 0),
+                            "end_pos": (3, 0),
+                        },
+                        concat(8),
+                    ],
+                },
+                concat(12),
+                {
+                    "type": "while_statement",
+                    "start_pos": (14, 0),
+                    "end_pos": (16, 0),
+                    "children": [concat(16)],
+                },
+            ],
+        }
+
+        hotspots = _perform_performance_ast_analysis(ast, "sample.js", "javascript")
+        lines = [
+            hotspot["line"]
+            for hotspot in hotspots
+            if hotspot["type"] == "string_concatenation_in_loop"
+        ]
+        self.assertEqual(lines, [8, 16])
+
+        # The string concatenation check only runs for JavaScript
+        hotspots = _perform_performance_ast_analysis(ast, "sample.py", "python")
+        self.assertEqual([hotspot["type"] for hotspot in hotspots], ["nested_loops"])
+
+    def test_credential_findings(self):
+        """Test credential patterns are reported per pattern, matching case-insensitively"""
+        ast = {
+            "type": "module",
+            "children": [
+                {"type": "assignment", "text": "PASSWORD='x'", "start_pos": (1, 0)},
+                {"type": "assignment", "text": "token=get_token()", "start_pos": (2, 0)},
+                {"type": "assignment", "text": "password=token", "start_pos": (3, 0)},
+            ],
+        }
+
+        findings = _perform_security_ast_analysis(ast, "sample.go", "go")
+        self.assertEqual(
+            [(finding["line"], finding["message"].split("'")[1]) for finding in findings],
+            [(1, "password="), (3, "password="), (2, "token=")],
+        )
+
+    def test_map_performance_type_to_category(self):
+        """Test issue types map to the first category with a matching keyword"""
+        self.assertEqual(_map_performance_type_to_category("n_plus_one_query"), "database")
+        self.assertEqual(_map_performance_type_to_category("nested_loops"), "general_performance")
+        self.assertEqual(_map_performance_type_to_category("Memory_Leak"), "memory")
+        # Database keywords take priority over later categories
+        self.assertEqual(_map_performance_type_to_category("io_query"), "database")
+
+    def test_count_nodes(self):
+        """Test node counting on a deeply nested AST"""
+        ast = {"type": "leaf"}
+        for _ in range(5000):
+            ast = {"type": "block", "children": [ast, {"type": "leaf"}]}
+
+        self.assertEqual(self.engine._count_nodes(ast), 10001)
+
+    def test_analysis_session_reuses_parse_results(self):
+        """Test files are parsed once per analysis session"""
+        parser = _CountingParser()
+        self.engine.ast_parser = parser
+        self.engine.ast_cache = None
+
+        with self.engine.analysis_session():
+            first = asyncio.run(self.engine.parse_file(self.test_file_path))
+            second = asyncio.run(self.engine.parse_file(self.test_file_path))
+        self.assertIs(first, second)
+        self.assertEqual(parser.calls, 1)
+
+        # Outside a session every call parses again
+        asyncio.run(self.engine.parse_file(self.test_file_path))
+        self.assertEqual(parser.calls, 2)
+
+    def test_analysis_session_shares_parses_between_analyses(self):
+        """Test in-process analyses of one session parse each file once"""
+        parser = _CountingParser()
+        self.engine.ast_parser = parser
+        self.engine.ast_cache = None
+        files = [self.test_file_path]
+        options = {"workers": 1}
+
+        with self.engine.analysis_session():
+            for analyze_fn in (_analyze_quality_file, _analyze_security_file):
+                results = asyncio.run(
+                    self.engine._run_file_analysis(analyze_fn, files, options, time.perf_counter())
+                )
+                self.assertEqual([result["file_path"] for result in results], files)
+        self.assertEqual(parser.calls, 1)
+
+    def test_analysis_session_runs_analyses_in_one_worker_pass(self):
+        """Test pool workers run all the analyses of a session on a file at once"""
+        files = [f"file_{i}.py" for i in range(4)]
+        options = {"workers": 2}
+
+        with self.engine.analysis_session():
+            self.engine._session_analyzers = {
+                AnalysisType.CODE_QUALITY: _file_name_worker,
+                AnalysisType.SECURITY: _file_size_worker,
+            }
+            names = asyncio.run(
+                self.engine._run_file_analysis(
+                    _file_name_worker, files, options, time.perf_counter()
+                )
+            )
+            # The sizes were computed in the same pass, so no batch is dispatched again
+            with patch.object(core, "_analyze_file_batch") as analyze_file_batch:
+                sizes = asyncio.run(
+                    self.engine._run_file_analysis(
+                        _file_size_worker, files, options, time.perf_counter()
+                    )
+                )
+            analyze_file_batch.assert_not_called()
+
+        self.assertEqual([result["file_path"] for result in names], files)
+        self.assertEqual([result["size"] for result in sizes], [len(path) for path in files])
+        self.assertEqual([result["pid"] for result in sizes], [result["pid"] for result in names])
+
+    def test_performance_results_reused_for_unchanged_files(self):
+        """Test cached performance results skip parsing and rule evaluation"""
+        parser = _CountingParser()
+        cache = FileHashCache(os.path.join(self.test_dir, "cache"), "test")
+        with open(self.test_file_path, "a") as f:
+            f.write("for name in names:\n    hello_world()\n")
+
+        first = _analyze_performance_file(self.test_file_path, parser, None, cache)
+        second = _analyze_performance_file(self.test_file_path, parser, None, cache)
+        self.assertEqual(first, second)
+        self.assertEqual(parser.calls, 1)
+        # The second call did not even load the cached AST
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_grammar_upgrade_invalidates_cached_ast(self):
+        """Test cached parse results are only reused with the same language library"""
+        parser = _CountingParser()
+        cache = FileHashCache(os.path.join(self.test_dir, "cache"), "test")
+
+        _parse_file_cached(self.test_file_path, parser, cache)
+        _parse_file_cached(self.test_file_path, parser, cache)
+        self.assertEqual(parser.calls, 1)
+
+        parser.grammar = "2"
+        _parse_file_cached(self.test_file_path, parser, cache)
+        self.assertEqual(parser.calls, 2)
+
+    def test_performance_skips_files_without_loops(self):
+        """Test files without loop keywords are not parsed for the performance analysis"""
+        parser = _CountingParser()
+        file_path = os.path.join(self.test_dir, "constants.py")
+        with open(file_path, "w") as f:
+            f.write("GREETING = 'Hello'\nprint(GREETING)\n")
+
+        result = _analyze_performance_file(file_path, parser, None, None)
+        self.assertEqual(result["hotspots"], [])
+        self.assertEqual(parser.calls, 0)
+
+        # Performance rules need the AST even without loops
+        rule_engine = RuleEngine()
+        rule_engine.add_rule(
+            PatternRule(
+                "PERF001",
+                "Print call",
+                "Print call",
+                RuleCategory.PERFORMANCE,
+                RuleSeverity.INFO,
+                "call",
+                {"text": "print"},
+            )
+        )
+        _analyze_performance_file(file_path, parser, rule_engine, None)
+        self.assertEqual(parser.calls, 1)
+
+    def test_performance_screen_needs_loaded_language(self):
+        """Test files whose language library is missing are not counted as loop-free"""
+        languages_dir = os.path.join(self.test_dir, "no_languages")
+        parser = ASTParser(languages_dir)
+        cache = FileHashCache(os.path.join(self.test_dir, "cache"), "test")
+        file_path = os.path.join(self.test_dir, "constants.py")
+        with open(file_path, "w") as f:
+            f.write("GREETING = 'Hello'\nprint(GREETING)\n")
+
+        self.assertFalse(parser.has_language("python"))
+        self.assertIsNone(
+            _analyze_performance_file(file_path, parser, None, cache, skip_loopless=True)
+        )
+        # No loop-free result was cached for the file either
+        results_key = f"performance::{parser.grammar_version('python')}"
+        self.assertIsNone(cache.get_results(cache.file_digest(file_path), results_key))
+        shutil.rmtree(languages_dir)
+
+    def test_performance_screen_reuses_read_content(self):
+        """Test the loop keyword screen shares its read with hashing or parsing"""
+        parser = _CountingParser()
+        with open(self.test_file_path, "a") as f:
+            f.write("for name in names:\n    hello_world()\n")
+        with open(self.test_file_path, "rb") as f:
+            content = f.read()
+
+        # Without a cache, the screened content is handed to the parser
+        _analyze_performance_file(self.test_file_path, parser, None, None, skip_loopless=True)
+        self.assertEqual(parser.contents, [content])
+
+        # With a cache, the content hashed on a stat miss is screened, and the parser reads it
+        cache = FileHashCache(os.path.join(self.test_dir, "cache"), "test")
+        _analyze_performance_file(self.test_file_path, parser, None, cache, skip_loopless=True)
+        self.assertEqual(parser.contents, [content, None])
+
+        # Without the screen, the file is parsed as usual
+        _analyze_performance_file(self.test_file_path, parser, None, None, skip_loopless=False)
+        self.assertEqual(parser.contents, [content, None, None])
+
+    def test_file_analyzer_binds_performance_screen(self):
+        """Test the performance screen setting is computed once per engine, not per file"""
+        analyze_fn = self.engine._file_analyzer(AnalysisType.PERFORMANCE)
+        self.assertIs(analyze_fn.func, _analyze_performance_file)
+        self.assertEqual(analyze_fn.keywords, {"skip_loopless": True})
+
+        self.engine.rule_engine.add_rule(
+            PatternRule(
+                "PERF001",
+                "Print call",
+                "Print call",
+                RuleCategory.PERFORMANCE,
+                RuleSeverity.INFO,
+                "call",
+                {"text": "print"},
+            )
+        )
+        analyze_fn = self.engine._file_analyzer(AnalysisType.PERFORMANCE)
+        self.assertEqual(analyze_fn.keywords, {"skip_loopless": False})
+
+        # Sessions keep one function per analysis type
+        with self.engine.analysis_session([AnalysisType.PERFORMANCE]):
+            analyze_fn = self.engine._file_analyzer(AnalysisType.PERFORMANCE)
+            self.assertIs(self.engine._file_analyzer(AnalysisType.PERFORMANCE), analyze_fn)
+
+    def test_performance_hotspot_paths_relative_to_project(self):
+        """Test hotspots are reported relative to the project, not the working directory"""
+        parser = _CountingParser()
+        loop = {
+            "type": "for_statement",
+            "start_pos": (1, 0),
+            "end_pos": (4, 0),
+        }
+        parser.parse_file = lambda file_path, content=None: {
+            "language": "python",
+            "ast": {
+                "type": "module",
+                "children": [dict(loop, children=[dict(loop, start_pos=(2, 4))])],
+            },
+        }
+        self.engine.ast_parser = parser
+        self.engine.ast_cache = None
+
+        result = asyncio.run(self.engine._analyze_performance(self.test_dir, {"workers": 1}))
+
+        self.assertEqual(
+            [(hotspot["type"], hotspot["file_path"]) for hotspot in result["hotspots"]],
+            [("nested_loops", "sample.py")],
+        )
+
+    def test_project_relpath(self):
+        """Test paths are made relative to the project by slicing off its prefix"""
+        relpath = _project_relpath("project/")
+        self.assertEqual(
+            relpath(os.path.join("project", "src", "a.py")), os.path.join("src", "a.py")
+        )
+        # Paths outside the project fall back to os.path.relpath
+        self.assertEqual(
+            relpath(os.path.join("other", "b.py")), os.path.join("..", "other", "b.py")
+        )
+
+    def test_tally_issues(self):
+        """Test issues are counted per known severity and category"""
+        issues = [
+            {"severity": "error", "category": "security"},
+            {"severity": "error", "category": "quality"},
+            {"severity": "fatal"},
+        ]
+
+        severity_counts, category_counts = _tally_issues(issues)
+
+        self.assertEqual(severity_counts, {"info": 0, "warning": 0, "error": 2})
+        self.assertEqual(category_counts["security"], 1)
+        self.assertEqual(sum(category_counts.values()), 2)
+
+
+class TestNodeSearch(unittest.TestCase):
+    def setUp(self):
+        self.ast = {
+            "type": "module",
+            "text": "API_KEY = load()",
+            "children": [
+                {"type": "assignment", "text": "password='x'", "children": []},
+                {"type": "comment", "text": "", "children": []},
+                {"type": "call", "text": "get_key(name)", "children": []},
+            ],
+        }
+
+    def test_iter_nodes_by_type(self):
+        """Test nodes are yielded lazily in document order"""
+        self.ast["children"][0]["children"].append({"type": "call", "text": "x()", "children": []})
+
+        nodes = iter_nodes_by_type({"ast": self.ast}, {"call", "comment"})
+
+        self.assertEqual(next(nodes)["text"], "x()")
+        self.assertEqual([node["type"] for node in nodes], ["comment", "call"])
+
+    def test_find_nodes_by_text(self):
+        """Test literal text patterns are matched as plain text"""
+        self.ast["children"][2]["text"] = "get_key(name).*"
+
+        self.assertEqual(find_nodes_by_text(self.ast, ".*"), [self.ast["children"][2]])
+        self.assertEqual(
+            [node["type"] for node in find_nodes_by_text(self.ast, "KEY", case_sensitive=False)],
+            ["module", "call"],
+        )
+
+    def test_find_nodes_by_text_batch(self):
+        """Test searching for several text patterns in one pass"""
+        result = find_nodes_by_text_batch(self.ast, ["password", "key", "missing"])
+
+        self.assertEqual([node["type"] for node in result["password"]], ["assignment"])
+        self.assertEqual([node["type"] for node in result["key"]], ["call"])
+        self.assertEqual(result["missing"], [])
+
+    def test_find_nodes_by_text_batch_case_insensitive(self):
+        """Test case-insensitive batch search over a parse result"""
+        result = find_nodes_by_text_batch({"ast": self.ast}, ["KEY"], case_sensitive=False)
+
+        self.assertEqual([node["type"] for node in result["KEY"]], ["module", "call"])
+
+    def test_find_nodes_by_text_batch_by_offsets(self):
+        """Test nodes with byte offsets are matched against one scan of the source"""
+        source = "token = 'abc'\nget_token(TOKEN)\n"
+        ast = {
+            "type": "module",
+            "text": source,
+            "start_byte": 0,
+            "end_byte": len(source),
+            "children": [
+                {"type": "assignment", "text": "token = 'abc'", "start_byte": 0, "end_byte": 13},
+                {
+                    "type": "call",
+                    "text": "get_token(TOKEN)",
+                    "start_byte": 14,
+                    "end_byte": 30,
+                    "children": [
+                        {
+                            "type": "identifier",
+                            "text": "get_token",
+                            "start_byte": 14,
+                            "end_byte": 23,
+                        },
+                        {"type": "identifier", "text": "TOKEN", "start_byte": 24, "end_byte": 29},
+                    ],
+                },
+            ],
+        }
+
+        # Matches are the same as those of the per-node scan, in document order
+        without_offsets = {"type": "module", "text": source, "children": ast["children"]}
+        patterns = ["token", "TOKEN", "t(", "none"]
+        for case_sensitive in (True, False):
+            by_offsets = find_nodes_by_text_batch(ast, patterns, case_sensitive)
+            by_text = find_nodes_by_text_batch(without_offsets, patterns, case_sensitive)
+            for pattern in patterns:
+                self.assertEqual(
+                    [node["text"] for node in by_offsets[pattern]],
+                    [node["text"] for node in by_text[pattern]],
+                )
+
+        result = find_nodes_by_text_batch(ast, ["TOKEN"], case_sensitive=False)
+        self.assertEqual(
+            [node["text"] for node in result["TOKEN"]],
+            [source, "token = 'abc'", "get_token(TOKEN)", "get_token", "TOKEN"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
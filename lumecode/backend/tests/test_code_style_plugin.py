@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plugins.installed.code_style import CodeStylePlugin
+
+
+class TestCodeStylePlugin(unittest.TestCase):
+    def setUp(self):
+        self.plugin = CodeStylePlugin()
+        self.plugin.initialize({})
+
+    def _issues(self, file_path, content):
+        result = self.plugin._check_file(
+            file_path, content, self.plugin._get_file_language(file_path)
+        )
+        return [(issue["rule_id"], issue["line"], issue["column"]) for issue in result["issues"]]
+
+    def test_python_rules(self):
+        """Test the line length, trailing whitespace and indentation rules on Python"""
+        content = "\n".join(
+            [
+                "def f():",
+                "  return 1",
+                "   ",
+                "    x = 1 ",
+                " \tpass",
+                "y = '" + "a" * 100 + "'",
+            ]
+        )
+
+        self.assertEqual(
+            sorted(self._issues("module.py", content)),
+            [
+                ("line_length", 6, 101),
+                ("py_indent", 2, 1),
+                ("py_indent", 5, 1),
+                ("trailing_whitespace", 3, 3),
+                ("trailing_whitespace", 4, 10),
+            ],
+        )
+
+    def test_rules_apply_per_language(self):
+        """Test indentation rules only apply to their language"""
+        content = " let x = 1;\n  let y = 2;\n"
+
+        self.assertEqual(self._issues("app.js", content), [("js_indent", 1, 1)])
+        self.assertEqual(self._issues("app.ts", content), [])
+        self.assertEqual(self._issues("notes.txt", content), [])
+
+    def test_custom_rules_keep_rule_order(self):
+        """Test the issues of several rules checked in one scan are grouped by rule"""
+        self.plugin.initialize(
+            {
+                "rules": [
+                    {"id": "line_length", "max_length": 10},
+                    {"id": "trailing_whitespace"},
+                    {"id": "line_length", "max_length": 5},
+                ]
+            }
+        )
+
+        self.assertEqual(
+            self._issues("notes.txt", "123456 \n12345678901\n"),
+            [
+                ("line_length", 2, 11),
+                ("trailing_whitespace", 1, 7),
+                ("line_length", 1, 6),
+                ("line_length", 2, 6),
+            ],
+        )
+
+    def test_execute_summary(self):
+        """Test execute counts issues by severity and skips files without content"""
+        context = {
+            "files": [
+                {"path": "a.py", "content": "x = 1 \n  y = 2\n"},
+                {"path": "b.py", "content": ""},
+            ]
+        }
+
+        result = asyncio.run(self.plugin.execute(context))
+
+        self.assertEqual(
+            result["summary"], {"files_checked": 2, "issues_found": 2, "warnings": 1, "infos": 1}
+        )
+        self.assertEqual([file_result["path"] for file_result in result["files"]], ["a.py"])
+
+    def test_execute_streams_files_to_sink(self):
+        """Test files can be generated lazily and their full results sent to a sink"""
+        contents = {"a.py": "x = 1 \n", "b.js": " y();\n"}
+        checked = []
+
+        def files():
+            for path, content in contents.items():
+                yield {"path": path, "content": content}
+
+        result = asyncio.run(
+            self.plugin.execute({"files": files(), "file_results_sink": checked.append})
+        )
+
+        self.assertEqual(result["summary"]["files_checked"], 2)
+        self.assertEqual(result["summary"]["issues_found"], 2)
+        self.assertEqual(
+            [(file_result["path"], len(file_result["issues"])) for file_result in checked],
+            [("a.py", 1), ("b.js", 1)],
+        )
+        self.assertEqual(
+            result["files"][1],
+            {"path": "b.js", "language": "javascript", "summary": checked[1]["summary"]},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
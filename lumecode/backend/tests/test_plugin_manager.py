@@ -0,0 +1,162 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plugins.base import PluginManager
+
+PLUGIN_SOURCE = """
+from plugins.base import PluginInterface
+
+
+class EchoPlugin(PluginInterface):
+    name = "echo"
+    version = "1.0"
+    description = "Echoes its context"
+
+    def initialize(self, config):
+        self.config = config
+
+    async def execute(self, context):
+        return {"context": context, "config": self.config}
+"""
+
+
+class TestPluginManager(unittest.TestCase):
+    """Test cases for loading plugins from a plugin directory."""
+
+    def setUp(self):
+        """Set up a plugin directory with a module and a package plugin"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.plugin_dir = Path(self.temp_dir.name)
+        (self.plugin_dir / "echo_module.py").write_text(PLUGIN_SOURCE)
+        (self.plugin_dir / "echo_package").mkdir()
+        (self.plugin_dir / "echo_package" / "__init__.py").write_text(PLUGIN_SOURCE)
+        (self.plugin_dir / "echo_package" / "config.json").write_text(json.dumps({"level": 2}))
+        (self.plugin_dir / "notes").mkdir()
+        (self.plugin_dir / "README.md").write_text("")
+        self.manager = PluginManager(str(self.plugin_dir))
+
+    def tearDown(self):
+        """Clean up the plugin directory and the loaded plugin modules"""
+        self.temp_dir.cleanup()
+        for module_name in ("echo_module", "echo_package", "late_plugin"):
+            sys.modules.pop(module_name, None)
+
+    def test_discover_plugins(self):
+        """Test modules and packages are discovered, and the result is cached"""
+        self.assertEqual(sorted(self.manager.discover_plugins()), ["echo_module", "echo_package"])
+
+        (self.plugin_dir / "late_plugin.py").write_text(PLUGIN_SOURCE)
+        self.assertNotIn("late_plugin", self.manager.discover_plugins())
+        self.assertIn("late_plugin", self.manager.discover_plugins(refresh=True))
+
+        (self.plugin_dir / "late_plugin.py").unlink()
+        self.manager.invalidate_cache()
+        self.assertNotIn("late_plugin", self.manager.discover_plugins())
+
+    def test_discover_missing_plugin_dir(self):
+        """Test a missing plugin directory has no plugins"""
+        manager = PluginManager(str(self.plugin_dir / "missing"))
+        self.assertEqual(manager.discover_plugins(), [])
+
+    def test_load_plugin_config(self):
+        """Test plugins are initialized with the config.json next to them"""
+        package_plugin = self.manager.load_plugin("echo_package")
+        module_plugin = self.manager.load_plugin("echo_module")
+
+        self.assertEqual(package_plugin.config, {"level": 2})
+        self.assertEqual(module_plugin.config, {})
+        self.assertIs(self.manager.load_plugin("echo_package"), package_plugin)
+
+        # Config files are parsed once until the cache is invalidated
+        (self.plugin_dir / "echo_package" / "config.json").write_text(json.dumps({"level": 3}))
+        self.assertEqual(
+            self.manager._load_config(str(self.plugin_dir / "echo_package" / "config.json")),
+            {"level": 2},
+        )
+        self.manager.invalidate_cache()
+        self.assertEqual(
+            self.manager._load_config(str(self.plugin_dir / "echo_package" / "config.json")),
+            {"level": 3},
+        )
+
+    def test_plugin_config_changes_stay_private(self):
+        """Test plugins sharing a config.json cannot change each other's config"""
+        (self.plugin_dir / "config.json").write_text(json.dumps({"rules": ["a"]}))
+        (self.plugin_dir / "echo_other.py").write_text(PLUGIN_SOURCE)
+        self.addCleanup(sys.modules.pop, "echo_other", None)
+
+        plugin = self.manager.load_plugin("echo_module")
+        plugin.config["rules"].append("b")
+        other_plugin = self.manager.load_plugin("echo_other")
+
+        self.assertEqual(other_plugin.config, {"rules": ["a"]})
+        self.assertIs(self.manager.plugin_configs["echo_module"], plugin.config)
+        self.assertEqual(
+            self.manager._load_config(str(self.plugin_dir / "config.json")), {"rules": ["a"]}
+        )
+
+    def test_load_plugin_reuses_imported_module(self):
+        """Test another manager reuses the imported plugin module instead of executing it again"""
+        plugin = self.manager.load_plugin("echo_module")
+        other_plugin = PluginManager(str(self.plugin_dir)).load_plugin("echo_module")
+
+        self.assertIsNot(other_plugin, plugin)
+        self.assertIs(type(other_plugin), type(plugin))
+
+        # A module of the same name from elsewhere is not mistaken for the plugin
+        sys.modules["echo_module"] = unittest
+        self.assertEqual(
+            type(PluginManager(str(self.plugin_dir)).load_plugin("echo_module")).__name__,
+            "EchoPlugin",
+        )
+
+    def test_failed_import_is_not_reused(self):
+        """Test a plugin module that failed to import is imported again once fixed"""
+        (self.plugin_dir / "late_plugin.py").write_text(
+            PLUGIN_SOURCE + "\nraise RuntimeError('broken')\n"
+        )
+        self.assertIsNone(self.manager.load_plugin("late_plugin"))
+        self.assertNotIn("late_plugin", sys.modules)
+
+        # A module left behind without its plugin class is not reused either
+        sys.modules["late_plugin"] = type(sys)("late_plugin")
+        sys.modules["late_plugin"].__file__ = str(self.plugin_dir / "late_plugin.py")
+
+        (self.plugin_dir / "late_plugin.py").write_text(PLUGIN_SOURCE)
+        plugin = PluginManager(str(self.plugin_dir)).load_plugin("late_plugin")
+        self.assertEqual(type(plugin).__name__, "EchoPlugin")
+
+    def test_load_all_plugins(self):
+        """Test every discovered plugin is loaded with its config"""
+        (self.plugin_dir / "broken.py").write_text("raise RuntimeError('broken')")
+        self.addCleanup(sys.modules.pop, "broken", None)
+
+        plugins = self.manager.load_all_plugins()
+
+        self.assertEqual(sorted(plugins), ["echo_module", "echo_package"])
+        self.assertEqual(self.manager.plugin_configs["echo_package"], {"level": 2})
+        self.assertIs(self.manager.load_all_plugins()["echo_module"], plugins["echo_module"])
+
+    def test_lazy_loading(self):
+        """Test plugins discovered without eager loading are loaded on first use"""
+        self.assertEqual(self.manager.load_all_plugins(eager=False), {})
+
+        plugin = self.manager.get_plugin("echo_package")
+
+        self.assertEqual(plugin.config, {"level": 2})
+        self.assertEqual(list(self.manager.plugins), ["echo_package"])
+        self.assertIsNone(self.manager.get_plugin("missing"))
+
+    def test_load_missing_plugin(self):
+        """Test loading an unknown plugin returns None"""
+        self.assertIsNone(self.manager.load_plugin("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
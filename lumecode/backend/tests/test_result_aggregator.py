@@ -1,10 +1,17 @@
+import io
 import unittest
 import tempfile
 import json
 from pathlib import Path
 from unittest.mock import patch
 
-from backend.analysis.aggregator import ResultAggregator, ResultType, ResultPriority
+from backend.analysis import aggregator as aggregator_module
+from backend.analysis.aggregator import (
+    LazyDataDict,
+    ResultAggregator,
+    ResultType,
+    ResultPriority,
+)
 
 
 class TestResultAggregator(unittest.TestCase):
@@ -50,27 +57,54 @@ class TestResultAggregator(unittest.TestCase):
             tags=["security"],
         )
 
+        # Unknown priorities are rejected
+        with self.assertRaises(ValueError):
+            self.aggregator.add_result(
+                result_type="security", source="test_plugin", data={}, priority="urgent"
+            )
+
         # Verify results were added
         self.assertEqual(len(self.aggregator.results), 2)
         self.assertEqual(self.aggregator.result_count, 2)
 
         # Verify result content
         result1 = self.aggregator.get_result(result_id1)
-        self.assertEqual(result1["type"], "code_quality")
-        self.assertEqual(result1["source"], "test_agent")
-        self.assertEqual(result1["data"]["message"], "Test issue")
-        self.assertEqual(result1["file_path"], "test.py")
-        self.assertEqual(result1["priority"], "high")
-        self.assertEqual(result1["tags"], ["test", "quality"])
+        self.assertEqual(result1.type, "code_quality")
+        self.assertEqual(result1.source, "test_agent")
+        self.assertEqual(result1.data["message"], "Test issue")
+        self.assertEqual(result1.file_path, "test.py")
+        self.assertEqual(result1.priority, "high")
+        self.assertEqual(result1.tags, frozenset({"test", "quality"}))
 
         # Verify indexing
         code_quality_results = self.aggregator.get_results_by_type(ResultType.CODE_QUALITY)
         self.assertEqual(len(code_quality_results), 1)
-        self.assertEqual(code_quality_results[0]["id"], result_id1)
+        self.assertEqual(code_quality_results[0].id, result_id1)
 
         security_results = self.aggregator.get_results_by_type("security")
         self.assertEqual(len(security_results), 1)
-        self.assertEqual(security_results[0]["id"], result_id2)
+        self.assertEqual(security_results[0].id, result_id2)
+
+    def test_add_results_bulk(self):
+        """Test adding a batch of results with a shared timestamp."""
+        result_ids = self.aggregator.add_results_bulk(
+            [
+                (ResultType.CODE_QUALITY, "test_agent", {"message": "Issue 1"}),
+                ("security", "test_plugin", {"message": "Issue 2"}, "test.py", "high", ["sec"]),
+            ]
+        )
+
+        self.assertEqual(len(result_ids), 2)
+        self.assertEqual(self.aggregator.result_count, 2)
+
+        result1 = self.aggregator.get_result(result_ids[0])
+        result2 = self.aggregator.get_result(result_ids[1])
+        self.assertEqual(result1.priority, "medium")
+        self.assertEqual(result2.file_path, "test.py")
+        self.assertEqual(result2.tags, frozenset({"sec"}))
+        self.assertEqual(result1.timestamp, result2.timestamp)
+        self.assertEqual(self.aggregator.last_updated, result1.timestamp)
+        self.assertEqual(len(self.aggregator.get_results_by_priority("high")), 1)
 
     def test_get_results_by_file(self):
         """Test getting results by file path."""
@@ -103,7 +137,7 @@ class TestResultAggregator(unittest.TestCase):
         # Get results for file2.py
         file2_results = self.aggregator.get_results_by_file(Path("file2.py"))
         self.assertEqual(len(file2_results), 1)
-        self.assertEqual(file2_results[0]["data"]["message"], "Test issue 3")
+        self.assertEqual(file2_results[0].data["message"], "Test issue 3")
 
         # Get results for non-existent file
         file3_results = self.aggregator.get_results_by_file("file3.py")
@@ -136,7 +170,7 @@ class TestResultAggregator(unittest.TestCase):
         # Get critical results
         critical_results = self.aggregator.get_results_by_priority(ResultPriority.CRITICAL)
         self.assertEqual(len(critical_results), 1)
-        self.assertEqual(critical_results[0]["data"]["message"], "Critical issue")
+        self.assertEqual(critical_results[0].data["message"], "Critical issue")
 
         # Get high priority results
         high_results = self.aggregator.get_results_by_priority("high")
@@ -160,7 +194,7 @@ class TestResultAggregator(unittest.TestCase):
         # Get results from agent1
         agent1_results = self.aggregator.get_results_by_source("agent1")
         self.assertEqual(len(agent1_results), 1)
-        self.assertEqual(agent1_results[0]["data"]["message"], "Agent 1 issue")
+        self.assertEqual(agent1_results[0].data["message"], "Agent 1 issue")
 
         # Get results from agent2
         agent2_results = self.aggregator.get_results_by_source("agent2")
@@ -199,7 +233,61 @@ class TestResultAggregator(unittest.TestCase):
             ["security", "performance"], match_all=True
         )
         self.assertEqual(len(security_perf_results), 1)
-        self.assertEqual(security_perf_results[0]["data"]["message"], "Issue 2")
+        self.assertEqual(security_perf_results[0].data["message"], "Issue 2")
+
+    def test_top_k_by_priority(self):
+        """Test retrieving the most urgent results first."""
+        low_id = self.aggregator.add_result(
+            result_type=ResultType.CODE_QUALITY,
+            source="test_agent",
+            data={"message": "Low issue"},
+            priority=ResultPriority.LOW,
+        )
+        critical_id = self.aggregator.add_result(
+            result_type=ResultType.SECURITY,
+            source="test_agent",
+            data={"message": "Critical issue"},
+            priority=ResultPriority.CRITICAL,
+        )
+        high_id = self.aggregator.add_result(
+            result_type=ResultType.PERFORMANCE,
+            source="test_agent",
+            data={"message": "High issue"},
+            priority=ResultPriority.HIGH,
+        )
+
+        expected = [critical_id, high_id, low_id]
+        top = self.aggregator.top_k_by_priority(2)
+        self.assertEqual([result.id for result in top], expected[:2])
+
+        # Same ordering from the heap fallback without sortedcontainers
+        self.aggregator._priority_order = None
+        top = self.aggregator.top_k_by_priority(5)
+        self.assertEqual([result.id for result in top], expected)
+
+        self.assertEqual(self.aggregator.top_k_by_priority(0), [])
+
+    def test_top_k_by_priority_bulk_order(self):
+        """Test results of one bulk add with the same priority come back in insertion order."""
+        specs = [
+            (ResultType.CODE_QUALITY, "test_agent", {"index": i}, None, ResultPriority.HIGH)
+            for i in range(12)
+        ]
+        result_ids = self.aggregator.add_results_bulk(specs)
+
+        top = self.aggregator.top_k_by_priority(12)
+        self.assertEqual([result.id for result in top], result_ids)
+
+        # Imported results keep their shared timestamps and the same order
+        new_aggregator = ResultAggregator(self.workspace_path)
+        new_aggregator.import_results(self.aggregator.export_results())
+        top = new_aggregator.top_k_by_priority(12)
+        self.assertEqual([result.id for result in top], result_ids)
+
+        # Same ordering from the heap fallback without sortedcontainers
+        new_aggregator._priority_order = None
+        top = new_aggregator.top_k_by_priority(12)
+        self.assertEqual([result.id for result in top], result_ids)
 
     def test_update_result(self):
         """Test updating a result."""
@@ -220,9 +308,9 @@ class TestResultAggregator(unittest.TestCase):
 
         # Verify result was updated
         updated_result = self.aggregator.get_result(result_id)
-        self.assertEqual(updated_result["data"]["message"], "Updated message")
-        self.assertEqual(updated_result["data"]["count"], 1)  # Original field preserved
-        self.assertEqual(updated_result["data"]["new_field"], "new value")  # New field added
+        self.assertEqual(updated_result.data["message"], "Updated message")
+        self.assertEqual(updated_result.data["count"], 1)  # Original field preserved
+        self.assertEqual(updated_result.data["new_field"], "new value")  # New field added
 
         # Try updating non-existent result
         success = self.aggregator.update_result(
@@ -247,7 +335,10 @@ class TestResultAggregator(unittest.TestCase):
 
         # Verify result was removed
         self.assertIsNone(self.aggregator.get_result(result_id1))
+        self.assertEqual([r.id for r in self.aggregator.top_k_by_priority(5)], [result_id2])
         self.assertEqual(len(self.aggregator.get_results_by_type(ResultType.CODE_QUALITY)), 1)
+        source_results = self.aggregator.get_results_by_source("test_agent")
+        self.assertEqual([r.id for r in source_results], [result_id2])
 
         # Try removing non-existent result
         success = self.aggregator.remove_result("non_existent_id")
@@ -354,6 +445,14 @@ class TestResultAggregator(unittest.TestCase):
         # Verify import was successful
         self.assertEqual(count, 2)
         self.assertEqual(len(new_aggregator.results), 2)
+
+        # New IDs continue after the imported ones
+        new_id = new_aggregator.add_result(
+            result_type=ResultType.CUSTOM, source="test_agent", data={"message": "Issue 3"}
+        )
+        self.assertNotIn(new_id, self.aggregator.results)
+        self.assertEqual(len(new_aggregator.results), 3)
+        new_aggregator.remove_result(new_id)
         self.assertEqual(len(new_aggregator.get_results_by_type(ResultType.CODE_QUALITY)), 1)
         self.assertEqual(len(new_aggregator.get_results_by_type(ResultType.SECURITY)), 1)
 
@@ -371,6 +470,187 @@ class TestResultAggregator(unittest.TestCase):
         exported_data = self.aggregator.export_results(format_type="xml")
         self.assertEqual(exported_data, "")
 
+    def test_import_results_duplicates_and_priorities(self):
+        """Test imports fill the indexes in place, replace duplicate IDs and skip bad priorities."""
+        by_priority = self.aggregator._by_priority
+        priority_order = self.aggregator._priority_order
+
+        def record(result_id, priority, message):
+            return {
+                "id": result_id,
+                "type": "code_quality",
+                "source": "test_agent",
+                "data": {"message": message},
+                "file_path": "test.py",
+                "priority": priority,
+                "tags": ["quality"],
+                "timestamp": 1.0,
+            }
+
+        document = {
+            "results": [
+                record("0", "low", "first"),
+                record("1", "urgent", "invalid"),
+                record("0", "critical", "replaced"),
+                record("2", "high", "second"),
+            ]
+        }
+        with self.assertLogs(aggregator_module.logger, "WARNING"):
+            count = self.aggregator.import_results(json.dumps(document))
+
+        self.assertEqual(count, 2)
+        self.assertIs(self.aggregator._by_priority, by_priority)
+        self.assertIs(self.aggregator._priority_order, priority_order)
+        self.assertEqual(self.aggregator.get_result("0").data, {"message": "replaced"})
+        self.assertIsNone(self.aggregator.get_result("1"))
+        self.assertEqual(self.aggregator.get_results_by_priority(ResultPriority.LOW), [])
+        self.assertEqual(len(self.aggregator.get_results_by_file("test.py")), 2)
+        self.assertEqual(len(self.aggregator.get_results_by_tags(["quality"])), 2)
+        self.assertEqual(
+            [result.id for result in self.aggregator.top_k_by_priority(5)], ["0", "2"]
+        )
+        self.assertEqual(self.aggregator.get_summary()["total_results"], 2)
+
+    @unittest.skipIf(aggregator_module.msgspec is None, "msgspec is not installed")
+    def test_import_results_lazy_data(self):
+        """Test that imported data payloads are decoded on first access."""
+        result_id = self.aggregator.add_result(
+            result_type=ResultType.CODE_QUALITY,
+            source="test_agent",
+            data={"message": "Issue 1", "lines": [1, 2]},
+        )
+
+        new_aggregator = ResultAggregator(self.workspace_path)
+        self.assertEqual(new_aggregator.import_results(self.aggregator.export_results()), 1)
+
+        data = new_aggregator.get_result(result_id).data
+        self.assertIsInstance(data, LazyDataDict)
+        self.assertIsNone(data._data)
+        self.assertEqual(data["lines"], [1, 2])
+        self.assertEqual(data, {"message": "Issue 1", "lines": [1, 2]})
+
+        # Untouched payloads are still exported, and updates decode first
+        self.assertIn('"Issue 1"', new_aggregator.export_results())
+        self.assertTrue(new_aggregator.update_result(result_id, {"fixed": True}))
+        self.assertEqual(new_aggregator.get_result(result_id).data["fixed"], True)
+
+    def test_import_results_non_object_data(self):
+        """Test that payloads which are not JSON objects are decoded on import."""
+        document = {
+            "results": [
+                {
+                    "id": "0",
+                    "type": "custom",
+                    "source": "test_agent",
+                    "data": None,
+                    "file_path": None,
+                    "priority": "medium",
+                    "tags": [],
+                    "timestamp": 1.0,
+                },
+                {
+                    "id": "1",
+                    "type": "custom",
+                    "source": "test_agent",
+                    "data": [1, 2],
+                    "file_path": None,
+                    "priority": "medium",
+                    "tags": [],
+                    "timestamp": 2.0,
+                },
+            ],
+            "summary": {},
+        }
+
+        new_aggregator = ResultAggregator(self.workspace_path)
+        self.assertEqual(new_aggregator.import_results(json.dumps(document)), 2)
+        # Missing payloads import as empty dicts, like Result.from_dict builds them
+        self.assertEqual(new_aggregator.get_result("0").data, {})
+        self.assertEqual(new_aggregator.get_result("1").data, [1, 2])
+
+        exported = json.loads(new_aggregator.export_results())
+        self.assertEqual([result["data"] for result in exported["results"]], [{}, [1, 2]])
+
+    def test_export_import_results_stream(self):
+        """Test streaming export and import of results."""
+        self.aggregator.add_result(
+            result_type=ResultType.CODE_QUALITY,
+            source="test_agent",
+            data={"message": "Issue 1", "line": 3},
+            file_path="test.py",
+            tags=["quality"],
+        )
+        self.aggregator.add_result(
+            result_type=ResultType.SECURITY,
+            source="test_agent",
+            data={"message": "Issue 2"},
+            priority=ResultPriority.CRITICAL,
+        )
+
+        buffer = io.StringIO()
+        written = self.aggregator.export_results_stream(buffer)
+        self.assertEqual(written, 2)
+
+        # The streamed document is valid JSON matching the string export
+        exported = json.loads(buffer.getvalue())
+        self.assertEqual(len(exported["results"]), 2)
+        self.assertEqual(exported["summary"]["total_results"], 2)
+        self.assertEqual(json.loads(self.aggregator.export_results()), exported)
+
+        new_aggregator = ResultAggregator(self.workspace_path)
+        count = new_aggregator.import_results_stream(io.BytesIO(buffer.getvalue().encode("utf-8")))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(new_aggregator.get_results_by_type(ResultType.SECURITY)), 1)
+        imported = new_aggregator.get_results_by_file("test.py")[0]
+        self.assertEqual(imported.data, {"message": "Issue 1", "line": 3})
+
+        # Malformed input is reported as zero imported results
+        count = new_aggregator.import_results_stream(io.BytesIO(b'{"results": [{"id": '))
+        self.assertEqual(count, 0)
+
+    def _assert_binary_round_trip(self, format_type):
+        """Export results in a binary format and import them into a new aggregator."""
+        self.aggregator.add_result(
+            result_type=ResultType.CODE_QUALITY,
+            source="test_agent",
+            data={"message": "Issue 1", "line": 3},
+            file_path="test.py",
+            tags=["quality", "style"],
+        )
+        self.aggregator.add_result(
+            result_type=ResultType.SECURITY,
+            source="test_agent",
+            data={"message": "Issue 2"},
+            priority=ResultPriority.CRITICAL,
+        )
+
+        exported = self.aggregator.export_results(format_type)
+        self.assertIsInstance(exported, bytes)
+
+        new_aggregator = ResultAggregator(self.workspace_path)
+        self.assertEqual(new_aggregator.import_results(exported, format_type), 2)
+        self.assertEqual(len(new_aggregator.get_results_by_type(ResultType.SECURITY)), 1)
+
+        imported = new_aggregator.get_results_by_file("test.py")[0]
+        original = self.aggregator.get_results_by_file("test.py")[0]
+        self.assertEqual(imported.data, {"message": "Issue 1", "line": 3})
+        self.assertEqual(imported.tags, frozenset(["quality", "style"]))
+        self.assertEqual(imported.timestamp, original.timestamp)
+
+        # Malformed input is reported as zero imported results
+        self.assertEqual(new_aggregator.import_results(b"\xc1garbage", format_type), 0)
+
+    @unittest.skipIf(aggregator_module.msgpack is None, "msgpack is not installed")
+    def test_export_import_results_msgpack(self):
+        """Test MessagePack export and import of results."""
+        self._assert_binary_round_trip("msgpack")
+
+    @unittest.skipIf(aggregator_module.pa is None, "pyarrow is not installed")
+    def test_export_import_results_arrow(self):
+        """Test Arrow IPC export and import of results."""
+        self._assert_binary_round_trip("arrow")
+
 
 if __name__ == "__main__":
     unittest.main()
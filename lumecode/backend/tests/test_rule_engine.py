@@ -1,5 +1,6 @@
 import os
 import sys
+import re
 import unittest
 from pathlib import Path
 
@@ -67,6 +68,35 @@ class TestRuleEngine(unittest.TestCase):
         self.assertEqual(issues[0]["file"], "test_file.py")
         self.assertEqual(issues[0]["line"], 6)
 
+    def test_pattern_rule_values(self):
+        """Test regex, nested dict and list pattern values"""
+        rule = PatternRule(
+            rule_id="TEST005",
+            name="Test Pattern Values",
+            description="Test pattern values",
+            category=RuleCategory.SECURITY,
+            severity=RuleSeverity.ERROR,
+            node_type="assignment",
+            pattern={
+                "type": "assignment",
+                "target": {"name": re.compile(r"pass", re.IGNORECASE)},
+                "flags": [1, {"kind": "const"}],
+            },
+        )
+        matching = {
+            "type": "assignment",
+            "target": {"name": "db_PASSWORD"},
+            "flags": [1, {"kind": "const", "extra": True}],
+        }
+
+        self.assertTrue(rule._match_node(matching))
+        self.assertFalse(rule._match_node({**matching, "type": "call"}))
+        self.assertFalse(rule._match_node({**matching, "target": {"name": "user"}}))
+        self.assertFalse(rule._match_node({**matching, "target": "db_password"}))
+        self.assertFalse(rule._match_node({**matching, "flags": [1]}))
+        self.assertFalse(rule._match_node({**matching, "flags": [1, "const"]}))
+        self.assertFalse(rule._match_node({"type": "assignment", "target": {"name": "pass"}}))
+
     def test_function_rule(self):
         # Create a function to check if a function is too short
         def check_function_length(node, context):
@@ -140,6 +170,193 @@ class TestRuleEngine(unittest.TestCase):
         self.assertIn("TEST001", rule_ids)
         self.assertIn("TEST002", rule_ids)
 
+    def test_rules_for_language(self):
+        # Create a rule restricted to JavaScript and one that applies everywhere
+        js_rule = PatternRule(
+            rule_id="TEST003",
+            name="JavaScript Pattern Rule",
+            description="Test language-specific rule",
+            category=RuleCategory.SECURITY,
+            severity=RuleSeverity.ERROR,
+            node_type="assignment",
+            pattern={"type": "assignment", "target": {"name": "password"}},
+            languages=["javascript"],
+        )
+        any_rule = PatternRule(
+            rule_id="TEST001",
+            name="Test Pattern Rule",
+            description="Test pattern rule",
+            category=RuleCategory.SECURITY,
+            severity=RuleSeverity.ERROR,
+            node_type="assignment",
+            pattern={"type": "assignment", "target": {"name": "password"}},
+        )
+
+        self.rule_engine.add_rule(js_rule)
+        self.assertEqual(self.rule_engine.rules_for_language("python"), ())
+        self.assertEqual(self.rule_engine.evaluate(self.test_ast, self.context), [])
+
+        # Adding a rule rebuilds the language index
+        self.rule_engine.add_rule(any_rule)
+        self.assertEqual(self.rule_engine.rules_for_language("python"), (any_rule,))
+        self.assertEqual(self.rule_engine.rules_for_language("javascript"), (js_rule, any_rule))
+
+        issues = self.rule_engine.evaluate(self.test_ast, self.context)
+        self.assertEqual([issue["rule_id"] for issue in issues], ["TEST001"])
+
+    def test_indexed_evaluation_matches_direct_evaluation(self):
+        """Test rules evaluated through the engine's type index report nodes in document order"""
+        rule = FunctionRule(
+            rule_id="TEST002",
+            name="Test Function Rule",
+            description="Test function rule",
+            category=RuleCategory.QUALITY,
+            severity=RuleSeverity.INFO,
+            node_types=["expression_statement", "assignment"],
+            evaluation_fn=lambda node, context: node["type"],
+        )
+
+        class WalkingRule(Rule):
+            def evaluate(self, ast_node, context):
+                return [self.format_issue(ast_node, "root", context)]
+
+        walking_rule = WalkingRule(
+            "TEST003",
+            "Walking Rule",
+            "Rule without the index",
+            RuleCategory.STYLE,
+            RuleSeverity.INFO,
+        )
+        self.rule_engine.add_rules([rule, walking_rule])
+        ast = {
+            "type": "module",
+            "children": [
+                {"type": "expression_statement", "start_line": 1},
+                {
+                    "type": "assignment",
+                    "start_line": 2,
+                    "children": [{"type": "expression_statement", "start_line": 3}],
+                },
+                {"type": "expression_statement", "start_line": 4},
+            ],
+        }
+
+        issues = self.rule_engine.evaluate(ast, self.context)
+
+        self.assertEqual(issues[:-1], rule.evaluate(ast, self.context))
+        self.assertEqual([issue["line"] for issue in issues], [1, 2, 3, 4, 0])
+        self.assertEqual(issues[-1]["message"], "root")
+
+    def test_version_follows_rule_content(self):
+        """Test the rule set version changes when a rule changes without changing its ID"""
+
+        def make_rule(pattern, severity=RuleSeverity.ERROR, languages=None):
+            return PatternRule(
+                rule_id="TEST001",
+                name="Test Pattern Rule",
+                description="Test pattern rule",
+                category=RuleCategory.SECURITY,
+                severity=severity,
+                node_type="assignment",
+                pattern=pattern,
+                languages=languages,
+            )
+
+        def version_of(*rules):
+            engine = RuleEngine()
+            engine.add_rules(list(rules))
+            return engine.version
+
+        pattern = {"type": "assignment", "target": {"name": "password"}}
+        version = version_of(make_rule(pattern))
+        self.assertEqual(version_of(make_rule(dict(pattern))), version)
+        self.assertNotEqual(
+            version_of(make_rule({"type": "assignment", "target": {"name": "token"}})), version
+        )
+        self.assertNotEqual(
+            version_of(make_rule({"type": "assignment", "name": re.compile("password")})),
+            version_of(make_rule({"type": "assignment", "name": re.compile("password", re.I)})),
+        )
+        self.assertNotEqual(version_of(make_rule(pattern, RuleSeverity.WARNING)), version)
+        self.assertNotEqual(version_of(make_rule(pattern, languages=["python"])), version)
+
+        def function_rule(evaluation_fn):
+            return FunctionRule(
+                rule_id="TEST002",
+                name="Test Function Rule",
+                description="Test function rule",
+                category=RuleCategory.QUALITY,
+                severity=RuleSeverity.WARNING,
+                node_types=["function_definition"],
+                evaluation_fn=evaluation_fn,
+            )
+
+        def too_long(node, context):
+            return "too long" if len(node.get("children", ())) > 50 else None
+
+        def too_short(node, context):
+            return "too short" if len(node.get("children", ())) < 2 else None
+
+        self.assertNotEqual(
+            version_of(function_rule(too_long)), version_of(function_rule(too_short))
+        )
+
+
+    def test_version_follows_captured_values(self):
+        """Test function rules built by one factory differ by the values they capture"""
+
+        def function_rule(max_children, default=False):
+            if default:
+
+                def too_long(node, context, limit=max_children):
+                    return "too long" if len(node.get("children", ())) > limit else None
+
+            else:
+
+                def too_long(node, context):
+                    return "too long" if len(node.get("children", ())) > max_children else None
+
+            engine = RuleEngine()
+            engine.add_rule(
+                FunctionRule(
+                    rule_id="TEST002",
+                    name="Test Function Rule",
+                    description="Test function rule",
+                    category=RuleCategory.QUALITY,
+                    severity=RuleSeverity.WARNING,
+                    node_types=["function_definition"],
+                    evaluation_fn=too_long,
+                )
+            )
+            return engine.version
+
+        self.assertEqual(function_rule(50), function_rule(50))
+        self.assertNotEqual(function_rule(50), function_rule(10))
+        self.assertNotEqual(function_rule(50, True), function_rule(10, True))
+
+    def test_version_updates_with_rule_set(self):
+        """Test the memoized version changes when rules are added, enabled or disabled"""
+        engine = RuleEngine()
+        empty = engine.version
+
+        rule = PatternRule(
+            rule_id="TEST001",
+            name="Test Pattern Rule",
+            description="Test pattern rule",
+            category=RuleCategory.SECURITY,
+            severity=RuleSeverity.ERROR,
+            node_type="assignment",
+            pattern={"type": "assignment"},
+        )
+        engine.add_rule(rule)
+        version = engine.version
+        self.assertNotEqual(version, empty)
+
+        rule.enabled = False
+        self.assertEqual(engine.version, empty)
+        rule.enabled = True
+        self.assertEqual(engine.version, version)
+
 
 if __name__ == "__main__":
     unittest.main()